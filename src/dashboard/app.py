@@ -67,9 +67,16 @@ except Exception:
         def inject_css():
             st.markdown("<!-- Styling unavailable -->", unsafe_allow_html=True)
 
+# On-demand downloads for the Export page
+try:
+    from dashboard.utils.downloads import build_bundle, render_lazy_download
+except Exception:
+    build_bundle = None
+    render_lazy_download = None
+
 # Patient creator
 try:
-    from patient_creator import PatientCreator
+    from patient_creator import PatientCreator, resolve_pending_photo
 except Exception:
     import importlib.util as _ilu
     _p = _DASHBOARD_DIR / "patient_creator.py"
@@ -78,8 +85,19 @@ except Exception:
         _m = _ilu.module_from_spec(_s)
         _s.loader.exec_module(_m)  # type: ignore
         PatientCreator = getattr(_m, "PatientCreator", None)
+        resolve_pending_photo = getattr(_m, "resolve_pending_photo", None)
     else:
         PatientCreator = None
+        resolve_pending_photo = None
+
+
+def show_photo_status(profile, key):
+    """Swap in a finished background AI photo; while it is pending, offer to check again"""
+    status = resolve_pending_photo(profile) if resolve_pending_photo else None
+    if status == "pending":
+        st.caption("⏳ AI photo is being generated in the background")
+        st.button("🔄 Check photo", key=key)
+    return status
 
 # Note: ui_profile imports removed - profile creation UI should not appear on Run Test page
 
@@ -241,6 +259,11 @@ try:
         jsonld_to_hierarchy,
         render_d3_visualization,
         get_node_details,
+        load_hierarchy_model,
+        hierarchy_from_model,
+        render_expansion_controls,
+        load_node_index,
+        lookup_node,
     )
 except Exception:
     try:
@@ -253,6 +276,11 @@ except Exception:
         jsonld_to_hierarchy = None
         render_d3_visualization = None
         get_node_details = None
+    load_hierarchy_model = None
+    hierarchy_from_model = None
+    render_expansion_controls = None
+    load_node_index = None
+    lookup_node = None
 
 # For handling clicks from the D3 component
 import streamlit.components.v1 as components
@@ -407,9 +435,15 @@ elif page == "👤 Create Patient":
                             st.image(profile['photo'], width=200, caption="✨ AI-Generated Patient Photo")
                         elif profile.get('photo'):
                             st.image(profile['photo'], width=200, caption="👤 Placeholder Avatar")
-                            if profile.get('photo_format') == 'avatar':
+                            if profile.get('photo_format') == 'avatar' and not st.session_state.get('photo_jobs'):
                                 st.caption("ℹ️ Check warnings above for AI photo generation status")
 
+        # Swap in the AI photo once background generation has finished
+        if st.session_state.get('patient_created'):
+            created_profile = st.session_state.get('patient_profile') or {}
+            if show_photo_status(created_profile, key="check_photo_create") == "ready":
+                st.image(created_profile['photo'], width=200, caption="✨ AI-Generated Patient Photo")
+
         # Show success message if profile was created
         if st.session_state.get('patient_created'):
             st.success("✅ Patient profile created and ready!")
@@ -518,6 +552,7 @@ elif page == "🔬 Run Test":
 
             # Display patient photo
             with photo_col:
+                show_photo_status(profile, key="check_photo_run")
                 if profile.get('photo'):
                     st.image(profile['photo'], width=150, caption="Patient Photo")
                 else:
@@ -579,15 +614,17 @@ elif page == "🔬 Run Test":
                 substep_text = None  # Deprecated: storyboard handles sub-steps
 
                 # ==============================================
-                # THREAD-SAFE QUEUE-BASED EVENT HANDLING
+                # THREAD-SAFE EVENT HANDLING
                 # ==============================================
-                # Use queue to avoid ScriptRunContext errors when
-                # worker threads emit events
+                # Worker threads never touch the UI (avoids ScriptRunContext
+                # errors): events go to a progress channel that coalesces them
+                # per stage, and the main thread blocks on it until they arrive
                 import queue
                 import threading
                 import time
+                from utils.event_bus import ProgressChannel
 
-                event_queue = queue.Queue()
+                event_queue = ProgressChannel(max_events=256)
                 result_queue = queue.Queue()
                 cancel_event = threading.Event()
 
@@ -753,40 +790,50 @@ elif page == "🔬 Run Test":
                 def run_pipeline_worker():
                     """Run pipeline in background thread and put result in queue"""
                     try:
-                        # Ensure we use the latest PGxPipeline definition (avoid stale module)
-                        FreshPG = None
+                        # Optionally hand the run to the persistent job queue's worker pool
                         try:
-                            import importlib, sys as _sys
-                            if "src.main" in _sys.modules:
-                                importlib.reload(_sys.modules["src.main"])  # type: ignore
-                                from src.main import PGxPipeline as _Fresh
-                                FreshPG = _Fresh
-                            elif "main" in _sys.modules:
-                                importlib.reload(_sys.modules["main"])  # type: ignore
-                                from main import PGxPipeline as _Fresh
-                                FreshPG = _Fresh
-                            else:
-                                try:
-                                    from src.main import PGxPipeline as _Fresh
-                                    FreshPG = _Fresh
-                                except Exception:
-                                    from main import PGxPipeline as _Fresh
-                                    FreshPG = _Fresh
+                            from utils.config import get_config as _get_config
+                            jobs_enabled = bool(_get_config(config_path).config.get("jobs", {}).get("enabled", False))
                         except Exception:
-                            pass
-
-                        PGClass = FreshPG or PGxPipeline
-                        if not callable(PGClass):
-                            raise RuntimeError("PGxPipeline class is not callable (import failed or stale module)")
-
-                        # Create pipeline with event queue (thread-safe)
-                        pipeline = PGClass(config_path=config_path, event_queue=event_queue)
-
-                        # Run multi-gene analysis
-                        result = pipeline.run_multi_gene(
-                            gene_symbols=selected_genes_snapshot,
-                            patient_profile=profile
-                        )
+                            jobs_enabled = False
+
+                        if jobs_enabled:
+                            from utils.job_queue import get_job_scheduler
+                            scheduler = get_job_scheduler(config_path)
+                            job_id = scheduler.submit(selected_genes_snapshot, patient_profile=profile)
+                            job = scheduler.wait(job_id, cancel_event=cancel_event, event_queue=event_queue)
+                            if job is None or job["status"] != "succeeded":
+                                status = job["status"] if job else "missing"
+                                error = (job or {}).get("error") or f"Job {job_id} {status}"
+                                raise RuntimeError(error)
+                            result_queue.put({"success": True, "data": job["result"]})
+                            return
+
+                        # Reuse the long-lived pipeline for this process (created on first run)
+                        get_warm = None
+                        try:
+                            from src.main import get_warm_pipeline as get_warm
+                        except Exception:
+                            try:
+                                from main import get_warm_pipeline as get_warm
+                            except Exception:
+                                get_warm = None
+
+                        if get_warm is not None:
+                            pipeline = get_warm(config_path)
+                        elif callable(PGxPipeline):
+                            pipeline = PGxPipeline(config_path=config_path)
+                        else:
+                            raise RuntimeError("PGxPipeline class is not callable (import failed)")
+
+                        # Run in our own session (events to our queue) over the warm pipeline's shared
+                        # modules; other users' runs may overlap, so it gets an isolated workspace
+                        with pipeline.session(event_queue=event_queue, cancel_event=cancel_event,
+                                              workspace=pipeline.new_workspace(isolated=True)) as run:
+                            result = run.run_multi_gene(
+                                gene_symbols=selected_genes_snapshot,
+                                patient_profile=profile
+                            )
                         result_queue.put({"success": True, "data": result})
                     except Exception as e:
                         import traceback
@@ -795,6 +842,9 @@ elif page == "🔬 Run Test":
                             "error": str(e),
                             "traceback": traceback.format_exc()
                         })
+                    finally:
+                        # Wake the main thread as soon as the result is available
+                        event_queue.close()
 
                 # Start worker thread
                 worker = threading.Thread(target=run_pipeline_worker, daemon=True)
@@ -803,72 +853,62 @@ elif page == "🔬 Run Test":
                 # Event consumption loop - RUNS IN MAIN THREAD
                 # This is safe for Streamlit as all UI updates happen in main thread
                 results = None
-                worker_done = False
-                last_update = time.time()
-                update_interval = 0.1  # Update UI every 100ms max
+                wait_timeout = 0.5  # Upper bound between storyboard checks while idle
 
                 # Post-storyboard sections rendered flag
                 extra_sections_shown = False
                 
-                while not worker_done:
-                    # Process all available events (batch processing for performance)
-                    events_processed = 0
-                    while not event_queue.empty() and events_processed < 10:
-                        try:
-                            event = event_queue.get_nowait()
-                            # Only update UI if enough time passed (throttling)
-                            if time.time() - last_update > update_interval:
+                try:
+                    while True:
+                        # Block until the pipeline reports progress or finishes; bursts
+                        # arrive coalesced per stage, and stage transitions are never dropped
+                        for event in event_queue.drain(timeout=wait_timeout):
+                            process_event(event)
+
+                        if event_queue.closed or not worker.is_alive():
+                            # Worker finished (or died without reporting a result)
+                            for event in event_queue.drain(timeout=0):
                                 process_event(event)
-                                last_update = time.time()
-                            events_processed += 1
-                        except queue.Empty:
                             break
 
-                    # Check if worker is done
-                    if not result_queue.empty():
-                        result_data = result_queue.get()
-                        if result_data["success"]:
-                            results = result_data["data"]
-                        else:
-                            # Re-raise exception from worker
-                            tb = result_data.get("traceback")
-                            if tb:
-                                # Also print full worker traceback to console for debugging
-                                print("Worker traceback:\n" + tb)
-                                raise RuntimeError(result_data["error"] + "\n" + tb)
-                            raise RuntimeError(result_data["error"])
-                        worker_done = True
-                    elif not worker.is_alive():
-                        # Worker died without putting result
-                        worker_done = True
-
-                    # If storyboard has completed but backend still running, show extra sections once
-                    if not extra_sections_shown and time.time() > storyboard_finish_time[0] and results is None:
-                        # Update storyboard with a small post-processing plan for visual continuity
-                        try:
-                            if sb and hasattr(sb, 'set_demo_plan') and hasattr(sb, 'render'):
-                                post_plan = [
-                                    {"stage": "report", "substage": "finalize_graphs", "message": "Assembling knowledge graphs...", "progress": 0.98},
-                                    {"stage": "report", "substage": "export_reports", "message": "Exporting reports...", "progress": 0.99},
-                                    {"stage": "report", "substage": "quality_checks", "message": "Quality checks...", "progress": 0.995}
-                                ]
-                                # Reuse the same speed to keep feel consistent
-                                sb.set_demo_plan(post_plan, storyboard_speed[0])
-                                sb.render("Finalizing outputs...")
-                        except Exception:
-                            pass
-                        extra_sections_shown = True
+                        # If storyboard has completed but backend still running, show extra sections once
+                        if not extra_sections_shown and time.time() > storyboard_finish_time[0]:
+                            # Update storyboard with a small post-processing plan for visual continuity
+                            try:
+                                if sb and hasattr(sb, 'set_demo_plan') and hasattr(sb, 'render'):
+                                    post_plan = [
+                                        {"stage": "report", "substage": "finalize_graphs", "message": "Assembling knowledge graphs...", "progress": 0.98},
+                                        {"stage": "report", "substage": "export_reports", "message": "Exporting reports...", "progress": 0.99},
+                                        {"stage": "report", "substage": "quality_checks", "message": "Quality checks...", "progress": 0.995}
+                                    ]
+                                    # Reuse the same speed to keep feel consistent
+                                    sb.set_demo_plan(post_plan, storyboard_speed[0])
+                                    sb.render("Finalizing outputs...")
+                            except Exception:
+                                pass
+                            extra_sections_shown = True
+                except BaseException:
+                    # The page was stopped or rerun mid-run (e.g. Streamlit's Stop
+                    # button): cancel the run, including a job still waiting in the queue
+                    cancel_event.set()
+                    raise
 
-                    # Small sleep to prevent busy waiting
-                    time.sleep(0.05)
+                try:
+                    result_data = result_queue.get_nowait()
+                except queue.Empty:
+                    result_data = None
 
-                # Process any remaining events
-                while not event_queue.empty():
-                    try:
-                        event = event_queue.get_nowait()
-                        process_event(event)
-                    except queue.Empty:
-                        break
+                if result_data is not None:
+                    if result_data["success"]:
+                        results = result_data["data"]
+                    else:
+                        # Re-raise exception from worker
+                        tb = result_data.get("traceback")
+                        if tb:
+                            # Also print full worker traceback to console for debugging
+                            print("Worker traceback:\n" + tb)
+                            raise RuntimeError(result_data["error"] + "\n" + tb)
+                        raise RuntimeError(result_data["error"])
 
                 # Sections under storyboard have been removed per request; storyboard continues to show progress
 
@@ -972,6 +1012,7 @@ elif page == "📊 View Results":
         # Display patient photo and information
         photo_col, info_col = st.columns([1, 3])
         with photo_col:
+            show_photo_status(profile, key="check_photo_results")
             if profile.get('photo'):
                 st.image(profile['photo'], width=150, caption="Patient Photo")
             else:
@@ -1091,20 +1132,41 @@ elif page == "📊 View Results":
             
             if jsonld_path_str and Path(jsonld_path_str).exists():
                 try:
-                    with open(jsonld_path_str, 'r', encoding='utf-8') as f:
-                        jsonld_data = json.load(f)
-
-                        # Info about the visualization
-                        st.info("💡 **Tip:** Click on nodes to see details, use mouse wheel to zoom, drag to pan. Use the controls to reset zoom or expand/collapse all nodes.")
+                    # Info about the visualization
+                    st.info("💡 **Tip:** Click on nodes to see details, use mouse wheel to zoom, drag to pan. Use the controls to reset zoom or expand/collapse all nodes.")
+
+                    if load_hierarchy_model is not None:
+                        # Memoised on the file's mtime: reruns skip reading and parsing
+                        model = load_hierarchy_model(jsonld_path_str)
+                        expanded_genes, expanded_variants = render_expansion_controls(model)
+                        hierarchy_data = hierarchy_from_model(model, expanded_genes, expanded_variants)
+                    else:
+                        with open(jsonld_path_str, 'r', encoding='utf-8') as f:
+                            hierarchy_data = jsonld_to_hierarchy(json.load(f))
 
                     with st.spinner("Generating interactive graph..."):
-                        hierarchy_data = jsonld_to_hierarchy(jsonld_data)
                         if hierarchy_data:
                             # Render full-width visualization (no separate node details panel)
                             _ = render_d3_visualization(hierarchy_data)
                         else:
                             st.warning("Could not generate hierarchy from JSON-LD data.")
 
+                    if load_node_index is not None:
+                        with st.expander("🔎 Node Details", expanded=False):
+                            node_name = st.text_input(
+                                "Node name (gene, rsID, drug, condition):",
+                                key="jsonld_node_lookup"
+                            )
+                            if node_name:
+                                # Index is built once per file (mtime-keyed), so lookups are instant
+                                with st.spinner("Indexing knowledge graph..."):
+                                    node_index = load_node_index(jsonld_path_str)
+                                details = lookup_node(node_index, node_name)
+                                if details:
+                                    st.json(details)
+                                else:
+                                    st.caption(f"No details found for '{node_name}'.")
+
                 except Exception as e:
                     st.error(f"Error loading visualization: {e}")
                     with st.expander("Debug Info"):
@@ -1165,20 +1227,38 @@ elif page == "💾 Export Data":
                                 continue
                             if path and _P(path).exists():
                                 try:
-                                    with open(path, 'rb') as f:
-                                        file_content = f.read()
-                                        st.download_button(
-                                            f"📄 {key}",
-                                            file_content,
-                                            file_name=_P(path).name,
-                                            key=f"download_{key}",
-                                            use_container_width=False
-                                        )
+                                    if render_lazy_download is not None:
+                                        # Content is read only after the user asks for this file
+                                        render_lazy_download(key, path, key=key)
+                                    else:
+                                        with open(path, 'rb') as f:
+                                            st.download_button(
+                                                f"📄 {key}",
+                                                f,
+                                                file_name=_P(path).name,
+                                                key=f"download_{key}"
+                                            )
                                 except Exception as e:
                                     st.error(f"Error reading {key}: {e}")
                             else:
                                 st.caption(f"⚠️ {key} - File not found")
                         st.divider()
+
+                if build_bundle is not None:
+                    st.markdown("**All Files**")
+                    run_files = tuple(sorted(p for p in outputs.values() if isinstance(p, str)))
+                    bundle = st.session_state.get('export_bundle') or {}
+                    bundle_path = bundle.get('path') if bundle.get('files') == run_files else None
+                    if st.button("📦 Build ZIP bundle", key="build_export_bundle"):
+                        with st.spinner("Compressing outputs..."):
+                            # Re-uses an existing bundle only for the same unchanged files
+                            bundle_path = build_bundle(outputs)
+                        st.session_state['export_bundle'] = {
+                            'files': run_files,
+                            'path': str(bundle_path) if bundle_path else None
+                        }
+                    if bundle_path and _P(bundle_path).exists():
+                        render_lazy_download("All outputs (ZIP)", bundle_path, key="export_bundle")
             
             with col2:
                 st.subheader("📂 File Paths")
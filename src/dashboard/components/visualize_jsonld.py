@@ -4,91 +4,286 @@ Creates a color-coded, zoomable, clickable radial tree visualization
 """
 import streamlit as st
 import json
+import os
+import threading
 from rdflib import Graph
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
 
+from utils.json_writer import load_json
 
-def jsonld_to_hierarchy(jsonld_data):
+# Display caps (a radial tree stays readable up to roughly this size)
+MAX_GENES = 15
+MAX_VARIANTS_PER_GENE = 5
+MAX_DRUGS_PER_VARIANT = 5
+# Panels up to this many genes / variants start fully expanded
+LAZY_EXPAND_GENES = 5
+LAZY_EXPAND_VARIANTS = 25
+# Hierarchy models / node indexes kept in memory (one of each per JSON-LD file)
+_MODEL_CACHE_SIZE = 16
+# Predicates whose literal values also name their subject in the node index
+_LABEL_PREDICATES = {"label", "prefLabel", "name"}
+
+_model_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+def _variant_label(var: Dict, position: int) -> str:
+    """Display label for a variant node (rsID, else variant ID)"""
+    rsid = var.get('rsid') or var.get('variant_id', '')
+    if not rsid.startswith('rs') and var.get('variant_id'):
+        rsid = var.get('variant_id')
+    label = rsid if rsid else f"Variant {position}"
+    if var.get('clinical_significance'):
+        label = f"{label} ({var.get('clinical_significance')})"
+    return label
+
+
+def _drug_nodes(var: Dict) -> List[Dict]:
+    """Drug (and recommendation) nodes for a variant"""
+    drug_children = []
+    for d in var.get('drugs', [])[:MAX_DRUGS_PER_VARIANT]:
+        dn = d.get('name', 'Unknown Drug')
+        drug_node = {"name": dn}
+        # Add recommendation as child node if present
+        if d.get('recommendation'):
+            rec_text = d.get('recommendation', '')[:80]
+            if len(d.get('recommendation', '')) > 80:
+                rec_text += "..."
+            drug_node["children"] = [{"name": rec_text}]
+        drug_children.append(drug_node)
+    return drug_children
+
+
+def _group_variants_by_gene(variants: Iterable[Dict], gene_symbols: Iterable[str]) -> Dict[str, List[Dict]]:
+    """
+    Group variants by gene in a single pass
+
+    Args:
+        variants: Variant records (each with a 'gene' field)
+        gene_symbols: Genes to keep
+
+    Returns:
+        Mapping of gene symbol -> its first MAX_VARIANTS_PER_GENE variants
+    """
+    grouped = {gene: [] for gene in gene_symbols}
+    for var in variants:
+        bucket = grouped.get(var.get('gene'))
+        if bucket is not None and len(bucket) < MAX_VARIANTS_PER_GENE:
+            bucket.append(var)
+    return grouped
+
+
+def build_hierarchy_model(jsonld_data: Dict) -> Dict:
+    """
+    Extract everything the visualization needs from a JSON-LD document
+
+    The model holds fully built subtrees; ``hierarchy_from_model`` only decides
+    which of them are sent to the browser.
+
+    Args:
+        jsonld_data: Comprehensive JSON-LD document
+
+    Returns:
+        Model with root name, leading/trailing sections and per-gene variant subtrees
+    """
+    # Direct extraction from structured JSON-LD fields (not RDF triples)
+    name = jsonld_data.get('name') or jsonld_data.get('identifier') or 'Patient'
+    model = {"name": name, "sections_before": [], "genes": [], "sections_after": []}
+
+    # Demographics
+    demo_children = []
+    clin_info = jsonld_data.get('clinical_information', {})
+    demo = clin_info.get('demographics', {}) if isinstance(clin_info, dict) else {}
+    if jsonld_data.get('identifier'):
+        demo_children.append({"name": f"ID: {jsonld_data.get('identifier')}"})
+    if jsonld_data.get('dateCreated'):
+        demo_children.append({"name": f"Created: {jsonld_data.get('dateCreated')}"})
+    if demo.get('age'):
+        demo_children.append({"name": f"Age: {demo.get('age')}"})
+    if demo_children:
+        model["sections_before"].append({"name": "Demographics", "children": demo_children})
+
+    # Genes -> Variants -> Drugs
+    pgx_profile = jsonld_data.get('pharmacogenomics_profile', {})
+    if isinstance(pgx_profile, dict):
+        genes = pgx_profile.get('genes_analyzed', [])[:MAX_GENES]
+        grouped = _group_variants_by_gene(jsonld_data.get('variants', []), genes)
+        for gene_symbol in genes:
+            variant_entries = []
+            for position, var in enumerate(grouped.get(gene_symbol, []), start=1):
+                label = _variant_label(var, position)
+                variant_entries.append({
+                    "key": f"{gene_symbol}: {label}",
+                    "name": label,
+                    "drugs": _drug_nodes(var)
+                })
+            model["genes"].append({"name": gene_symbol, "variants": variant_entries})
+
+    # Clinical: Conditions & Medications
+    if isinstance(clin_info, dict):
+        conds = clin_info.get('current_conditions', [])
+        meds = clin_info.get('current_medications', [])
+        cond_children = []
+        for c in conds[:5]:
+            label = c.get('rdfs:label') or c.get('skos:prefLabel') or c.get('name') or 'Condition'
+            if c.get('snomed:code'):
+                label = f"{label} ({c.get('snomed:code')})"
+            cond_children.append({"name": label})
+        if cond_children:
+            model["sections_after"].append({"name": "Conditions", "children": cond_children})
+        med_children = []
+        for m in meds[:5]:
+            label = m.get('rdfs:label') or m.get('name') or 'Medication'
+            med_children.append({"name": label})
+        if med_children:
+            model["sections_after"].append({"name": "Medications", "children": med_children})
+
+    return model
+
+
+def hierarchy_from_model(model: Dict, expanded_genes: Optional[Iterable[str]] = None,
+                         expanded_variants: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Assemble the D3 hierarchy, including only the expanded subtrees
+
+    Collapsed genes and variants are sent as single nodes carrying
+    ``collapsed`` and ``child_count`` so the browser can label them.
+
+    Args:
+        model: Model from ``build_hierarchy_model``
+        expanded_genes: Gene symbols whose variants are included (None = all)
+        expanded_variants: Variant keys whose drugs are included (None = all)
+
+    Returns:
+        Hierarchy dict for ``render_d3_visualization``
+    """
+    expanded_genes = None if expanded_genes is None else set(expanded_genes)
+    expanded_variants = None if expanded_variants is None else set(expanded_variants)
+
+    root = {"name": model["name"], "children": list(model["sections_before"])}
+
+    gene_children = []
+    for gene in model["genes"]:
+        variants = gene["variants"]
+        if expanded_genes is not None and gene["name"] not in expanded_genes and variants:
+            gene_children.append({"name": gene["name"], "collapsed": True, "child_count": len(variants)})
+            continue
+        v_children = []
+        for variant in variants:
+            if not variant["drugs"]:
+                v_children.append({"name": variant["name"]})
+            elif expanded_variants is not None and variant["key"] not in expanded_variants:
+                v_children.append({"name": variant["name"], "collapsed": True,
+                                   "child_count": len(variant["drugs"])})
+            else:
+                v_children.append({"name": variant["name"], "children": variant["drugs"]})
+        gene_children.append({"name": gene["name"], "children": v_children or [{"name": "No variants"}]})
+    if gene_children:
+        root["children"].append({"name": "Genes", "children": gene_children})
+
+    root["children"].extend(model["sections_after"])
+    return root
+
+
+def jsonld_to_hierarchy(jsonld_data, expanded_genes=None, expanded_variants=None):
     """Convert JSON-LD to a clinically-relevant hierarchy for D3.js (direct field extraction)."""
     try:
-        # Direct extraction from structured JSON-LD fields (not RDF triples)
-        name = jsonld_data.get('name') or jsonld_data.get('identifier') or 'Patient'
-        root = {"name": name, "children": []}
-
-        # Demographics
-        demo_children = []
-        clin_info = jsonld_data.get('clinical_information', {})
-        demo = clin_info.get('demographics', {}) if isinstance(clin_info, dict) else {}
-        if jsonld_data.get('identifier'):
-            demo_children.append({"name": f"ID: {jsonld_data.get('identifier')}"})
-        if jsonld_data.get('dateCreated'):
-            demo_children.append({"name": f"Created: {jsonld_data.get('dateCreated')}"})
-        if demo.get('age'):
-            demo_children.append({"name": f"Age: {demo.get('age')}"})
-        if demo_children:
-            root["children"].append({"name": "Demographics", "children": demo_children})
-
-        # Genes -> Variants -> Drugs
-        pgx_profile = jsonld_data.get('pharmacogenomics_profile', {})
-        if isinstance(pgx_profile, dict):
-            genes = pgx_profile.get('genes_analyzed', [])
-            variants = jsonld_data.get('variants', [])
-            gene_children = []
-            for gene_symbol in genes[:15]:  # Cap to 15 genes
-                vlist = [v for v in variants if v.get('gene') == gene_symbol][:5]  # Top 5 variants per gene
-                v_children = []
-                for var in vlist:
-                    rsid = var.get('rsid') or var.get('variant_id', '')
-                    if not rsid.startswith('rs') and var.get('variant_id'):
-                        rsid = var.get('variant_id')
-                    label = rsid if rsid else f"Variant {len(v_children) + 1}"
-                    if var.get('clinical_significance'):
-                        label = f"{label} ({var.get('clinical_significance')})"
-                    drug_children = []
-                    for d in var.get('drugs', [])[:5]:
-                        dn = d.get('name', 'Unknown Drug')
-                        drug_node = {"name": dn}
-                        # Add recommendation as child node if present
-                        if d.get('recommendation'):
-                            rec_text = d.get('recommendation', '')[:80]
-                            if len(d.get('recommendation', '')) > 80:
-                                rec_text += "..."
-                            drug_node["children"] = [{"name": rec_text}]
-                        drug_children.append(drug_node)
-                    if drug_children:
-                        variant_node = {"name": label, "children": drug_children}
-                    else:
-                        variant_node = {"name": label}
-                    v_children.append(variant_node)
-                gene_children.append({"name": gene_symbol, "children": v_children or [{"name": "No variants"}]})
-            if gene_children:
-                root["children"].append({"name": "Genes", "children": gene_children})
-
-        # Clinical: Conditions & Medications
-        if isinstance(clin_info, dict):
-            conds = clin_info.get('current_conditions', [])
-            meds = clin_info.get('current_medications', [])
-            cond_children = []
-            for c in conds[:5]:
-                label = c.get('rdfs:label') or c.get('skos:prefLabel') or c.get('name') or 'Condition'
-                if c.get('snomed:code'):
-                    label = f"{label} ({c.get('snomed:code')})"
-                cond_children.append({"name": label})
-            if cond_children:
-                root["children"].append({"name": "Conditions", "children": cond_children})
-            med_children = []
-            for m in meds[:5]:
-                label = m.get('rdfs:label') or m.get('name') or 'Medication'
-                med_children.append({"name": label})
-            if med_children:
-                root["children"].append({"name": "Medications", "children": med_children})
-
-        return root
+        return hierarchy_from_model(build_hierarchy_model(jsonld_data), expanded_genes, expanded_variants)
     except Exception as e:
         st.error(f"Error converting JSON-LD to hierarchy: {e}")
         return {"name": "root", "children": []}
 
 
+def _load_memoised(jsonld_path: Union[str, Path], kind: str, build):
+    """
+    Build something from a JSON-LD file, memoised on the file's mtime
+
+    Args:
+        jsonld_path: Path to the JSON-LD file
+        kind: Name of what is built (part of the cache key)
+        build: Callable taking the decoded JSON-LD document
+
+    Returns:
+        Cached or freshly built result
+    """
+    path = str(Path(jsonld_path).resolve())
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (path, kind)
+
+    with _model_cache_lock:
+        cached = _model_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _model_cache.move_to_end(key)
+            return cached[1]
+
+    result = build(load_json(path))
+
+    with _model_cache_lock:
+        _model_cache[key] = (stamp, result)
+        _model_cache.move_to_end(key)
+        while len(_model_cache) > _MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return result
+
+
+def load_hierarchy_model(jsonld_path: Union[str, Path]) -> Dict:
+    """
+    Load the hierarchy model for a JSON-LD file, memoised on the file's mtime
+
+    Streamlit reruns the page on every interaction; the file is only re-read
+    and re-parsed when it has been rewritten since the last call.
+
+    Args:
+        jsonld_path: Path to the JSON-LD file
+
+    Returns:
+        Model from ``build_hierarchy_model``
+    """
+    return _load_memoised(jsonld_path, "hierarchy", build_hierarchy_model)
+
+
+def render_expansion_controls(model: Dict):
+    """
+    Let the user choose which gene and variant subtrees to expand
+
+    Small panels start fully expanded; larger ones start collapsed to gene level.
+
+    Args:
+        model: Model from ``load_hierarchy_model``
+
+    Returns:
+        Tuple of (expanded gene symbols, expanded variant keys)
+    """
+    gene_names = [gene["name"] for gene in model["genes"] if gene["variants"]]
+    if not gene_names:
+        return [], []
+
+    # No widget keys: a different file (new options) starts from its own defaults
+    expanded_genes = st.multiselect(
+        "Expand genes:",
+        gene_names,
+        default=gene_names if len(gene_names) <= LAZY_EXPAND_GENES else [],
+        help="Only expanded genes are sent to the graph, so large panels stay fast."
+    )
+
+    variant_keys = [
+        variant["key"]
+        for gene in model["genes"] if gene["name"] in expanded_genes
+        for variant in gene["variants"] if variant["drugs"]
+    ]
+    expanded_variants = []
+    if variant_keys:
+        expanded_variants = st.multiselect(
+            "Show drugs for variants:",
+            variant_keys,
+            default=variant_keys if len(variant_keys) <= LAZY_EXPAND_VARIANTS else []
+        )
+    return expanded_genes, expanded_variants
+
+
 def render_d3_visualization(hierarchy_data):
     """Render interactive D3.js radial tree visualization"""
     d3_data = json.dumps(hierarchy_data)
@@ -284,7 +479,7 @@ def render_d3_visualization(hierarchy_data):
             tooltip.html(`
               <strong>${{d.data.name}}</strong><br/>
               Depth: ${{d.depth}}<br/>
-              ${{d.children ? `Children: ${{d.children.length}}` : 'Leaf node'}}
+              ${{d.children ? `Children: ${{d.children.length}}` : d.data.collapsed ? `Collapsed: ${{d.data.child_count}} children (expand above the graph)` : 'Leaf node'}}
             `)
               .style("left", (event.pageX + 10) + "px")
               .style("top", (event.pageY - 20) + "px");
@@ -318,7 +513,7 @@ def render_d3_visualization(hierarchy_data):
           .attr("x", d => d.x < Math.PI === !d.children ? 15 : -15)
           .attr("text-anchor", d => d.x < Math.PI === !d.children ? "start" : "end")
           .attr("transform", d => d.x >= Math.PI ? "rotate(180)" : null)
-          .text(d => d.data.name)
+          .text(d => d.data.collapsed ? `${{d.data.name}} (+${{d.data.child_count}})` : d.data.name)
           .style("font-size", "13px")
           .style("font-weight", "500")
           .clone(true).lower()
@@ -381,20 +576,83 @@ def render_d3_visualization(hierarchy_data):
     st.components.v1.html(html, height=950, scrolling=True)
 
 
+def _local_name(term) -> str:
+    """Last path/fragment segment of an RDF term"""
+    return str(term).split("/")[-1].split("#")[-1]
+
+
+def build_node_index(jsonld_data: Dict) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Index every node of a JSON-LD document by IRI, local name and label
+
+    The document is parsed into RDF once; each triple is filed under the keys
+    of its subject and object, so details for a node are a dictionary lookup.
+
+    Args:
+        jsonld_data: JSON-LD document
+
+    Returns:
+        Mapping of case-folded key -> {predicate: [object values]}
+    """
+    g = Graph().parse(data=json.dumps(jsonld_data), format="json-ld")
+
+    labels = defaultdict(set)
+    for s, p, o in g:
+        if _local_name(p) in _LABEL_PREDICATES:
+            labels[s].add(str(o))
+
+    def keys_for(term) -> set:
+        keys = {str(term), _local_name(term)} | labels.get(term, set())
+        return {key.casefold() for key in keys if key}
+
+    index = defaultdict(lambda: defaultdict(list))
+    for s, p, o in g:
+        predicate = _local_name(p)
+        obj_value = _local_name(o)
+        for key in keys_for(s) | keys_for(o):
+            index[key][predicate].append(obj_value)
+
+    return {key: dict(details) for key, details in index.items()}
+
+
+def load_node_index(jsonld_path: Union[str, Path]) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Load the node index for a JSON-LD file, memoised on the file's mtime
+
+    Args:
+        jsonld_path: Path to the JSON-LD file
+
+    Returns:
+        Index from ``build_node_index``
+    """
+    return _load_memoised(jsonld_path, "node_index", build_node_index)
+
+
+def lookup_node(node_index: Dict[str, Dict[str, List[str]]], node_name: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Look up a node's details in a prebuilt index
+
+    Hierarchy labels such as "rs4149056 (Pathogenic)" also match their rsID.
+
+    Args:
+        node_index: Index from ``build_node_index`` / ``load_node_index``
+        node_name: Node IRI, local name or label (case-insensitive)
+
+    Returns:
+        Mapping of predicate -> object values, or None if the node is unknown
+    """
+    node_name = node_name.strip()
+    for key in (node_name, node_name.split(" (")[0]):
+        details = node_index.get(key.casefold())
+        if details:
+            return details
+    return None
+
+
 def get_node_details(jsonld_data, node_name):
     """Get detailed information about a specific node from JSON-LD"""
     try:
-        g = Graph().parse(data=json.dumps(jsonld_data), format="json-ld")
-        details = defaultdict(list)
-        
-        for s, p, o in g:
-            if node_name in str(s) or node_name in str(o):
-                predicate = str(p).split("/")[-1].split("#")[-1]
-                obj_value = str(o).split("/")[-1].split("#")[-1]
-                details[predicate].append(obj_value)
-        
-        return dict(details) if details else None
+        return lookup_node(build_node_index(jsonld_data), node_name)
     except Exception as e:
         st.error(f"Error getting node details: {e}")
         return None
-
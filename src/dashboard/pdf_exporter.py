@@ -1,6 +1,14 @@
 """
 PDF exporter using ReportLab
 Creates professional medical reports with patient photos
+
+The style sheet and the UGent logo are prepared once per process, and patient
+photos are thumbnailed once per photo, so repeated exports only build the
+story. ``submit_pdf_export`` renders a report on a background thread and
+reports progress through the pipeline event queue; ``render_cohort_pdfs``
+renders a whole cohort in a process pool:
+
+    python src/dashboard/pdf_exporter.py --cohort cohort.jsonl --output-dir output/pdf --workers 4
 """
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
@@ -9,10 +17,99 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from PIL import Image as PILImage
+import argparse
+import hashlib
 import io
 import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# src/ on the path so utils resolves to the shared utilities, not dashboard/utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.event_bus import emit
+
+LOGO_PATH = Path(__file__).parent.parent.parent / "assets" / "ugent_main_logo.png"
+_LOGO_BOX = 2.5 * inch
+_PHOTO_CACHE_SIZE = 32
+
+_styles = None
+_styles_lock = threading.Lock()
+
+# (png bytes, width, height) of the logo scaled to its box, or None if unavailable
+_logo = None
+_logo_loaded = False
+_logo_lock = threading.Lock()
+
+# Photo hash -> thumbnail png bytes (most recently used last)
+_photo_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_photo_cache_lock = threading.Lock()
+
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+
+def get_report_styles():
+    """Get the process-wide report style sheet (built on first use)"""
+    global _styles
+    if _styles is None:
+        with _styles_lock:
+            if _styles is None:
+                styles = getSampleStyleSheet()
+                PDFExporter._setup_custom_styles(styles)
+                _styles = styles
+    return _styles
+
+
+def _logo_image() -> Optional[Tuple[bytes, float, float]]:
+    """UGent logo as PNG bytes sized for the cover page (decoded once per process)"""
+    global _logo, _logo_loaded
+    if not _logo_loaded:
+        with _logo_lock:
+            if not _logo_loaded:
+                try:
+                    with PILImage.open(LOGO_PATH) as img:
+                        # Same proportional fit as Image(..., kind='proportional'),
+                        # downsampled to 300 dpi so every PDF embeds a small copy
+                        scale = min(_LOGO_BOX / img.width, _LOGO_BOX / img.height)
+                        width, height = img.width * scale, img.height * scale
+                        img.thumbnail((int(width / 72 * 300), int(height / 72 * 300)))
+                        buffer = io.BytesIO()
+                        img.save(buffer, format='PNG')
+                    _logo = (buffer.getvalue(), width, height)
+                except Exception:
+                    # If logo loading fails, reports are rendered without it
+                    _logo = None
+                _logo_loaded = True
+    return _logo
+
+
+def _photo_thumbnail(photo: bytes) -> bytes:
+    """200x200 PNG thumbnail of a patient photo (cached per photo)"""
+    key = hashlib.sha1(photo).hexdigest()
+    with _photo_cache_lock:
+        thumbnail = _photo_cache.get(key)
+        if thumbnail is not None:
+            _photo_cache.move_to_end(key)
+            return thumbnail
+
+    img = PILImage.open(io.BytesIO(photo))
+    img.thumbnail((200, 200))
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='PNG')
+    thumbnail = img_buffer.getvalue()
+
+    with _photo_cache_lock:
+        _photo_cache[key] = thumbnail
+        while len(_photo_cache) > _PHOTO_CACHE_SIZE:
+            _photo_cache.popitem(last=False)
+    return thumbnail
 
 
 class PDFExporter:
@@ -25,41 +122,42 @@ class PDFExporter:
     ALERT_GREEN = colors.HexColor('#28A745')
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        # Shared, read-only after setup
+        self.styles = get_report_styles()
     
-    def _setup_custom_styles(self):
+    @classmethod
+    def _setup_custom_styles(cls, styles):
         """Setup custom paragraph styles"""
         # Title style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='UGentTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=24,
-            textColor=self.UGENT_BLUE,
+            textColor=cls.UGENT_BLUE,
             spaceAfter=12,
             alignment=TA_CENTER
         ))
         
         # Patient name style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='PatientName',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=20,
-            textColor=self.UGENT_BLUE,
+            textColor=cls.UGENT_BLUE,
             spaceAfter=6
         ))
         
         # Alert styles
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='AlertCritical',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=12,
             textColor=colors.white,
-            backColor=self.ALERT_RED,
+            backColor=cls.ALERT_RED,
             spaceAfter=6
         ))
     
-    def create_pdf(self, patient_profile: dict, test_results: dict, output_path: str):
+    def create_pdf(self, patient_profile: dict, test_results: dict, output_path: str, event_queue=None):
         """
         Create PDF report
         
@@ -67,8 +165,9 @@ class PDFExporter:
             patient_profile: Patient demographics and information
             test_results: Test results from pipeline
             output_path: Path to save PDF file
+            event_queue: Optional Queue for progress events (stage "report", substage "pdf")
         """
-        doc = SimpleDocTemplate(output_path, pagesize=letter)
+        emit(event_queue, "report", "pdf", "Building PDF report...", progress=0.0)
         story = []
         
         # Cover page
@@ -82,8 +181,14 @@ class PDFExporter:
         # Gene results
         story.extend(self._create_gene_results(test_results))
         
-        # Build PDF
+        # Build PDF (to a temporary file first, then renamed into place)
+        emit(event_queue, "report", "pdf", "Rendering PDF pages...", progress=0.5)
+        tmp_path = f"{output_path}.partial"
+        doc = SimpleDocTemplate(tmp_path, pagesize=letter)
         doc.build(story)
+        os.replace(tmp_path, output_path)
+        emit(event_queue, "report", "pdf", f"PDF report saved: {output_path}", progress=1.0,
+             payload={"output_path": str(output_path)})
         return output_path
     
     def _create_cover_page(self, patient_profile: dict, test_results: dict):
@@ -91,27 +196,19 @@ class PDFExporter:
         elements = []
 
         # Add UGent logo at the top
-        try:
-            # Get project root (go up from src/dashboard to project root)
-            dashboard_dir = Path(__file__).parent
-            project_root = dashboard_dir.parent.parent
-            logo_path = project_root / "assets" / "ugent_main_logo.png"
-
-            if logo_path.exists():
-                logo_img = Image(str(logo_path), width=2.5*inch, height=2.5*inch, kind='proportional')
-                elements.append(logo_img)
-                elements.append(Spacer(1, 0.2*inch))
-
-                # Add institution text
-                institution = Paragraph(
-                    "<para align='center'><b>Ghent University</b></para>",
-                    self.styles['Normal']
-                )
-                elements.append(institution)
-                elements.append(Spacer(1, 0.3*inch))
-        except Exception as e:
-            # If logo loading fails, continue without it
-            pass
+        logo = _logo_image()
+        if logo:
+            logo_bytes, logo_width, logo_height = logo
+            elements.append(Image(io.BytesIO(logo_bytes), width=logo_width, height=logo_height))
+            elements.append(Spacer(1, 0.2*inch))
+
+            # Add institution text
+            institution = Paragraph(
+                "<para align='center'><b>Ghent University</b></para>",
+                self.styles['Normal']
+            )
+            elements.append(institution)
+            elements.append(Spacer(1, 0.3*inch))
 
         # Title
         title = Paragraph("Pharmacogenomics Test Report", self.styles['UGentTitle'])
@@ -121,12 +218,7 @@ class PDFExporter:
         # Patient photo
         if patient_profile.get('photo'):
             try:
-                img = PILImage.open(io.BytesIO(patient_profile['photo']))
-                img.thumbnail((200, 200))
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='PNG')
-                img_buffer.seek(0)
-                patient_img = Image(img_buffer, width=2*inch, height=2*inch)
+                patient_img = Image(io.BytesIO(_photo_thumbnail(patient_profile['photo'])), width=2*inch, height=2*inch)
                 elements.append(patient_img)
                 elements.append(Spacer(1, 0.3*inch))
             except:
@@ -207,3 +299,146 @@ class PDFExporter:
         
         return elements
 
+
+def get_pdf_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread that renders PDF reports in the background"""
+    global _pdf_executor
+    if _pdf_executor is None:
+        with _pdf_executor_lock:
+            if _pdf_executor is None:
+                _pdf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+    return _pdf_executor
+
+
+def submit_pdf_export(patient_profile: dict, test_results: dict, output_path: str, event_queue=None) -> Future:
+    """
+    Render a PDF report in the background
+
+    Progress and completion are emitted to the event queue (stage "report",
+    substage "pdf"); failures are emitted with level "error".
+
+    Args:
+        patient_profile: Patient demographics and information
+        test_results: Test results from pipeline
+        output_path: Path to save PDF file
+        event_queue: Optional Queue (or ProgressChannel) for progress events
+
+    Returns:
+        Future resolving to the output path
+    """
+    def run():
+        try:
+            return PDFExporter().create_pdf(patient_profile, test_results, output_path, event_queue=event_queue)
+        except Exception as e:
+            emit(event_queue, "report", "pdf", f"PDF export failed: {e}", level="error")
+            raise
+
+    return get_pdf_executor().submit(run)
+
+
+def report_inputs(profile: Dict) -> Tuple[Dict, Dict]:
+    """
+    Map a dashboard or comprehensive profile to create_pdf's inputs
+
+    Args:
+        profile: Dashboard profile (with "demographics") or comprehensive
+            profile (as written by the pipeline or utils/synthetic_cohort.py)
+
+    Returns:
+        Tuple of (patient_profile, test_results)
+    """
+    pgx = profile.get('pharmacogenomics_profile') or {}
+    test_results = {
+        'genes': pgx.get('genes_analyzed', []),
+        'total_variants': pgx.get('total_variants', len(profile.get('variants', []))),
+        'comprehensive_outputs': {},
+    }
+    if profile.get('demographics'):
+        return profile, test_results
+
+    demo = (profile.get('clinical_information') or {}).get('demographics') or {}
+    patient_profile = {
+        'photo': profile.get('photo'),
+        'demographics': {
+            'first_name': demo.get('foaf:firstName', ''),
+            'last_name': demo.get('foaf:familyName', ''),
+            'mrn': demo.get('mrn') or profile.get('identifier', 'N/A'),
+            'date_of_birth': demo.get('schema:birthDate', 'N/A'),
+            'age': demo.get('age', 'N/A'),
+        }
+    }
+    return patient_profile, test_results
+
+
+def _render_profile(job: Tuple[Dict, str]) -> str:
+    """Process pool task: render one profile's report"""
+    profile, output_path = job
+    patient_profile, test_results = report_inputs(profile)
+    return PDFExporter().create_pdf(patient_profile, test_results, output_path)
+
+
+def _warm_worker():
+    """Process pool initializer: prepare styles and logo once per worker"""
+    get_report_styles()
+    _logo_image()
+
+
+def render_cohort_pdfs(source: str, output_dir: str, workers: int = None, event_queue=None) -> List[str]:
+    """
+    Render a PDF report for every profile of a cohort in a process pool
+
+    Args:
+        source: Cohort as accepted by main.py --cohort (directory of JSON
+            files, JSONL file or JSON list)
+        output_dir: Directory for the reports (<MRN>_report.pdf)
+        workers: Worker processes (default: CPU count)
+        event_queue: Optional Queue for progress events
+
+    Returns:
+        Paths of the rendered reports, in cohort order (failed reports are skipped)
+    """
+    from main import load_patient_profiles
+
+    profiles = load_patient_profiles(source)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = []
+    for index, (label, profile) in enumerate(profiles):
+        mrn = report_inputs(profile)[0]['demographics'].get('mrn') or f"patient_{index}"
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(mrn))
+        jobs.append((profile, str(output_dir / f"{name}_report.pdf")))
+
+    total = len(jobs)
+    paths = [None] * total
+    emit(event_queue, "report", "pdf", f"Rendering {total} PDF reports...", progress=0.0)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_warm_worker) as pool:
+        futures = {pool.submit(_render_profile, job): index for index, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                paths[index] = future.result()
+            except Exception as e:
+                print(f"❌ PDF for {profiles[index][0]} failed: {e}")
+                emit(event_queue, "report", "pdf", f"PDF for {profiles[index][0]} failed: {e}", level="error")
+            emit(event_queue, "report", "pdf", f"Rendered {done}/{total} PDF reports", progress=done / total)
+
+    return [path for path in paths if path]
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Render PDF reports for a cohort of patient profiles")
+    parser.add_argument("--cohort", required=True, help="Directory of JSON profiles, JSONL file or JSON list")
+    parser.add_argument("--output-dir", default="output/pdf", help="Output directory (default: output/pdf)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    started = datetime.now()
+    paths = render_cohort_pdfs(args.cohort, args.output_dir, workers=args.workers)
+    seconds = (datetime.now() - started).total_seconds()
+    print(f"✅ Rendered {len(paths)} PDF reports to {args.output_dir} in {seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+On-demand downloads for the Export Data page
+
+Output files are only read when the user asks for them, and the bytes are
+kept in a small size-bounded cache keyed on the file's mtime, so later reruns
+re-use them instead of re-reading the disk. All outputs of a run can also be
+packed into one zip bundle named after a digest of the files it holds, so a
+bundle is only ever re-used for exactly the same, unchanged set of outputs.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import streamlit as st
+
+# Total bytes of file contents kept in memory across sessions
+_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+BUNDLE_PREFIX = "pgx_outputs"
+
+_content_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _stamp(path: Union[str, Path]) -> tuple:
+    """(mtime_ns, size) of a file"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _manifest_digest(paths) -> str:
+    """Digest of the sorted (path, size, mtime_ns) of the files going into a bundle"""
+    manifest = "\n".join(f"{p}\t{os.stat(p).st_size}\t{os.stat(p).st_mtime_ns}" for p in sorted(paths))
+    return hashlib.sha256(manifest.encode("utf-8")).hexdigest()
+
+
+def _bundle_digest(bundle_path: Path) -> Optional[str]:
+    """Manifest digest recorded in an existing bundle's zip comment"""
+    try:
+        with zipfile.ZipFile(bundle_path) as zf:
+            return zf.comment.decode("ascii")
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError):
+        return None
+
+
+def format_size(num_bytes: int) -> str:
+    """Human-readable file size"""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def read_file_cached(path: Union[str, Path]) -> bytes:
+    """
+    Read a file, re-using cached bytes while the file is unchanged
+
+    Args:
+        path: File path
+
+    Returns:
+        File contents
+    """
+    global _cache_bytes
+    key = str(Path(path).resolve())
+    stamp = _stamp(key)
+
+    with _cache_lock:
+        cached = _content_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _content_cache.move_to_end(key)
+            return cached[1]
+
+    with open(key, 'rb') as f:
+        content = f.read()
+
+    with _cache_lock:
+        previous = _content_cache.pop(key, None)
+        if previous is not None:
+            _cache_bytes -= len(previous[1])
+        # Files larger than the whole budget are served but never cached
+        if len(content) <= _CACHE_BUDGET_BYTES:
+            _content_cache[key] = (stamp, content)
+            _cache_bytes += len(content)
+            while _cache_bytes > _CACHE_BUDGET_BYTES:
+                _, (_, evicted) = _content_cache.popitem(last=False)
+                _cache_bytes -= len(evicted)
+    return content
+
+
+def build_bundle(outputs: Dict[str, str], bundle_path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """
+    Pack the run's output files into one zip, re-using an up-to-date bundle
+
+    Files are streamed into the archive one at a time, so the bundle is never
+    assembled in memory. The digest of the files' paths, sizes and mtimes is
+    stored as the zip comment, and an existing bundle is only re-used when it
+    matches, so a bundle built for another file set is never served.
+
+    Args:
+        outputs: Mapping of output name -> file path (non-path values are ignored)
+        bundle_path: Where to write the bundle (default: next to the outputs,
+            named after the manifest digest)
+
+    Returns:
+        Path to the bundle, or None if there are no output files
+    """
+    paths = sorted({
+        str(Path(p).resolve()) for p in outputs.values()
+        if isinstance(p, str) and p and Path(p).is_file()
+    })
+    if not paths:
+        return None
+
+    base_dir = Path(os.path.commonpath([str(Path(p).parent) for p in paths]))
+    bundle_path = Path(bundle_path) if bundle_path else None
+    # Never pack a bundle into another one
+    paths = [
+        p for p in paths
+        if not (Path(p).name.startswith(BUNDLE_PREFIX) and p.endswith(".zip"))
+        and not (bundle_path and Path(p) == bundle_path.resolve())
+    ]
+    if not paths:
+        return None
+
+    digest = _manifest_digest(paths)
+    if not bundle_path:
+        bundle_path = base_dir / f"{BUNDLE_PREFIX}-{digest[:16]}.zip"
+
+    if bundle_path.exists() and _bundle_digest(bundle_path) == digest:
+        return bundle_path
+
+    # Unique temp file, so concurrent builds of the same bundle never share one
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(
+        dir=bundle_path.parent, prefix=f".{bundle_path.name}.", suffix=".partial", delete=False
+    )
+    try:
+        with tmp, zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for p in paths:
+                zf.write(p, arcname=str(Path(p).relative_to(base_dir)))
+            zf.comment = digest.encode("ascii")
+        os.replace(tmp.name, bundle_path)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        raise
+    return bundle_path
+
+
+def render_lazy_download(label: str, path: Union[str, Path], key: str):
+    """
+    Download button whose content is only read once the user asks for it
+
+    The first click prepares the file; from then on this session shows a
+    regular download button for it, served from the content cache.
+
+    Args:
+        label: Button label
+        path: File to offer
+        key: Unique widget key
+    """
+    path = Path(path)
+    # Tracked per file, so a new run's outputs start unprepared again
+    prepared = st.session_state.setdefault("prepared_downloads", set())
+    prepared_key = str(path.resolve())
+
+    if prepared_key in prepared or st.button(f"📄 {label}", key=f"prepare_{key}"):
+        prepared.add(prepared_key)
+        st.download_button(
+            f"⬇️ Save {path.name} ({format_size(path.stat().st_size)})",
+            read_file_cached(path),
+            file_name=path.name,
+            key=f"download_{key}"
+        )
@@ -3,27 +3,28 @@ Orchestrates all 5 phases to build pharmacogenomics knowledge graphs
 Now includes proper patient profile handling and comprehensive output generation
 """
 import argparse
+import copy
+import multiprocessing
 import sys
 import json
 import random
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import threading
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent))
 
-from utils.config import Config
-from utils.dynamic_clinical_generator import DynamicClinicalGenerator
-from utils.variant_phenotype_linker import VariantPhenotypeLinker
-from phase1_discovery.variant_discoverer import VariantDiscoverer
-from phase2_clinical.clinical_validator import ClinicalValidator
-from phase3_context.drug_disease_linker import DrugDiseaseLinker
-from phase4_rdf.graph_builder import RDFGraphBuilder
-from phase5_export.json_exporter import JSONLDExporter
-from phase5_export.html_reporter import HTMLReporter
+from utils.config import get_config
+from utils.json_writer import write_json, write_json_streaming
+from utils.run_workspace import DEFAULT_WORKSPACE, RunWorkspace
+# Phase modules and clinical generators are imported lazily (see the
+# component properties on PGxPipeline) so importing this module stays cheap
+# and heavy dependencies such as rdflib load only when first needed.
 
 # Try to import EventBus for dashboard integration
 try:
@@ -97,18 +98,78 @@ except ImportError:
                     print(f"Full traceback:\n{traceback.format_exc()}")
 
 
+# JSON-LD context of comprehensive patient profiles
+PROFILE_CONTEXT = {
+    "foaf": "http://xmlns.com/foaf/0.1/",
+    "schema": "http://schema.org/",
+    "pgx": "http://pgx-kg.org/",
+    "sdisco": "http://ugent.be/sdisco/",
+    "snomed": "http://snomed.info/id/",
+    "drugbank": "https://go.drugbank.com/drugs/",
+    "ugent": "http://ugent.be/person/",
+    "dbsnp": "https://identifiers.org/dbsnp/",
+    "ncbigene": "https://identifiers.org/ncbigene/",
+    "clinpgx": "https://www.clinpgx.org/haplotype/",
+    "gn": "http://www.geonames.org/ontology#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    # JSON-LD terms for new patient-specific properties
+    "population_frequencies": "pgx:populationFrequencies",
+    "patient_population_frequency": "pgx:patientPopulationFrequency",
+    "population_significance": "pgx:populationSignificance",
+    "population_frequency_source": "pgx:populationFrequencySource",
+    "ethnicity_context": "pgx:ethnicityContext",
+    "ethnicity_medication_adjustments": "pgx:ethnicityMedicationAdjustments",
+    "ethnicity_snomed": "pgx:ethnicitySnomed"
+}
+
+
+class PipelineCancelled(RuntimeError):
+    """Raised inside a run when its session's cancel_event is set"""
+
+
 class PGxPipeline:
     """Enhanced Pipeline for Dashboard Integration"""
 
     def __init__(self, config_path: str = "config.yaml", event_bus=None, event_queue=None):
         """Initialize pipeline with optional event bus or event queue for dashboard integration
 
+        Phase modules are created on first use, so construction is cheap. For
+        repeated runs in one process use get_warm_pipeline() together with
+        session(), which gives each run its own pipeline over the shared
+        phase modules and caches.
+
         Args:
             config_path: Path to config.yaml
             event_bus: Optional EventBus instance (callback-based, not thread-safe for Streamlit)
             event_queue: Optional Queue instance (thread-safe, recommended for Streamlit)
         """
-        self.config = Config(config_path)
+        started = time.perf_counter()
+        # Shared, pre-resolved configuration injected into every phase
+        self.config = get_config(config_path)
+        self.bind_events(event_bus=event_bus, event_queue=event_queue)
+        # Per-run state, set by session(): cancel_event is checked between
+        # phases and genes, workspace holds the run's files
+        self.cancel_event = None
+        self.workspace = None
+
+        # Lazily created phase modules (see _component), shared with every session
+        self._components = {}
+        self._components_lock = threading.Lock()
+        # Shared run statistics (guarded by _components_lock): completed runs and
+        # startup cost (construction + lazy component creation) not yet reported in timing data
+        self._warm_stats = {
+            "runs_completed": 0,
+            "unreported_startup": time.perf_counter() - started,
+        }
+
+    def bind_events(self, event_bus=None, event_queue=None):
+        """Route pipeline events to an event queue or event bus
+
+        Args:
+            event_bus: Optional EventBus instance
+            event_queue: Optional Queue instance (takes precedence over event_bus)
+        """
         self.event_queue = event_queue
 
         # Create EventBus with queue support if queue provided
@@ -118,37 +179,177 @@ class PGxPipeline:
             self.event_bus = event_bus
         else:
             self.event_bus = EventBus()
-        
-        # Initialize phase modules
-        self.phase1 = VariantDiscoverer()
-        self.phase2 = ClinicalValidator(
+
+    @contextmanager
+    def session(self, event_bus=None, event_queue=None, cancel_event=None, workspace=None):
+        """Start one run on this (warm) pipeline
+
+        Yields a pipeline for the run that shares this instance's config,
+        phase modules and caches but has its own events, cancel_event and
+        workspace, so sessions on one warm pipeline can run concurrently.
+        When the session ends the workspace's intermediate files are removed
+        (its outputs are kept for the caller).
+
+        Args:
+            event_bus: Optional EventBus for this run's events
+            event_queue: Optional Queue for this run's events
+            cancel_event: Optional threading.Event; once set the run stops at
+                the next phase or gene boundary and reports cancelled=True
+            workspace: RunWorkspace for the run (default: new_workspace())
+        """
+        run = copy.copy(self)
+        run.bind_events(event_bus=event_bus, event_queue=event_queue)
+        run.cancel_event = cancel_event
+        run.workspace = workspace or self.new_workspace()
+        try:
+            yield run
+        finally:
+            run.workspace.cleanup(keep_outputs=True)
+
+    def _check_cancelled(self):
+        """Raise PipelineCancelled if the current session was cancelled"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise PipelineCancelled("Run cancelled")
+
+    def _component(self, name: str, factory):
+        """Create a phase module on first use (thread-safe) and account its startup time"""
+        component = self._components.get(name)
+        if component is None:
+            with self._components_lock:
+                component = self._components.get(name)
+                if component is None:
+                    started = time.perf_counter()
+                    component = factory()
+                    self._components[name] = component
+                    self._warm_stats["unreported_startup"] += time.perf_counter() - started
+        return component
+
+    @property
+    def phase1(self):
+        from phase1_discovery.variant_discoverer import VariantDiscoverer
+        return self._component("phase1", lambda: VariantDiscoverer(
+            max_variants=self.config.max_variants
+        ))
+
+    @property
+    def phase2(self):
+        from phase2_clinical.clinical_validator import ClinicalValidator
+        return self._component("phase2", lambda: ClinicalValidator(
             ncbi_email=self.config.ncbi_email,
             ncbi_api_key=self.config.ncbi_api_key,
             bioportal_api_key=self.config.bioportal_api_key
-        )
-        self.phase3 = DrugDiseaseLinker(
-            bioportal_api_key=self.config.bioportal_api_key
-        )
-        self.phase4 = RDFGraphBuilder()
-        self.phase5_jsonld = JSONLDExporter()
-        self.phase5_html = HTMLReporter()
-        
-        # Dynamic clinical data generator
-        self.dynamic_clinical = DynamicClinicalGenerator(
+        ))
+
+    @property
+    def phase3(self):
+        from phase3_context.drug_disease_linker import DrugDiseaseLinker
+        return self._component("phase3", lambda: DrugDiseaseLinker(
+            bioportal_api_key=self.config.bioportal_api_key,
+            config=self.config
+        ))
+
+    @property
+    def phase4(self):
+        from phase4_rdf.graph_builder import RDFGraphBuilder
+        return self._component("phase4", RDFGraphBuilder)
+
+    @property
+    def phase5_jsonld(self):
+        from phase5_export.json_exporter import JSONLDExporter
+        return self._component("phase5_jsonld", JSONLDExporter)
+
+    @property
+    def phase5_html(self):
+        from phase5_export.html_reporter import HTMLReporter
+        return self._component("phase5_html", HTMLReporter)
+
+    @property
+    def dynamic_clinical(self):
+        """Dynamic clinical data generator"""
+        from utils.dynamic_clinical_generator import DynamicClinicalGenerator
+        return self._component("dynamic_clinical", lambda: DynamicClinicalGenerator(
             bioportal_api_key=self.config.bioportal_api_key
-        )
-        
-        # Variant-phenotype-drug linker with conflict detection
-        self.variant_linker = VariantPhenotypeLinker(
+        ))
+
+    @property
+    def variant_linker(self):
+        """Variant-phenotype-drug linker with conflict detection"""
+        from utils.variant_phenotype_linker import VariantPhenotypeLinker
+        return self._component("variant_linker", lambda: VariantPhenotypeLinker(
             bioportal_api_key=self.config.bioportal_api_key
-        )
+        ))
+
+    @property
+    def gene_store(self):
+        """Per-gene result store (None when disabled via cache.gene_results)"""
+        cache_settings = self.config.config.get('cache', {})
+        if not (cache_settings.get('enabled', True) and cache_settings.get('gene_results', True)):
+            return None
+        from utils.gene_result_store import GeneResultStore
+        return self._component("gene_store", lambda: GeneResultStore(
+            ttl_days=self.config.cache_ttl_days
+        ))
+
+    def _gene_cache_key(self, gene_symbol: str) -> str:
+        """Content address for a gene's patient-independent results"""
+        from utils.gene_result_store import GeneResultStore, DEFAULT_SOURCE_VERSIONS
+        source_versions = dict(DEFAULT_SOURCE_VERSIONS)
+        source_versions.update(self.config.get('cache.source_versions', {}))
+        config_flags = {
+            "features": dict(self.config.features),
+            "max_variants_per_gene": self.config.max_variants,
+            # SNOMED mapping in phases 2-3 only runs with a BioPortal key
+            "bioportal": bool(self.config.bioportal_api_key),
+        }
+        return GeneResultStore.cache_key(gene_symbol, source_versions, config_flags)
+
+    def new_workspace(self, isolated: bool = None):
+        """Workspace for a new run: isolated under output.runs_dir when
+        requested (default: output.isolated_runs), otherwise the shared default paths"""
+        output_settings = self.config.config.get('output', {})
+        if isolated is None:
+            isolated = output_settings.get('isolated_runs', False)
+        if isolated:
+            return RunWorkspace.create(output_settings.get('runs_dir', 'runs'))
+        return DEFAULT_WORKSPACE
+
+    def warm_up(self) -> float:
+        """Create every phase module now instead of on first use
+
+        Returns:
+            Seconds spent creating components in this call
+        """
+        started = time.perf_counter()
+        for name in ("phase1", "phase2", "phase3", "phase4", "phase5_jsonld",
+                     "phase5_html", "dynamic_clinical", "variant_linker"):
+            getattr(self, name)
+        return time.perf_counter() - started
+
+    def _take_startup_timing(self) -> dict:
+        """Return startup timing for the current run and reset the unreported counter"""
+        with self._components_lock:
+            startup_seconds = self._warm_stats["unreported_startup"]
+            self._warm_stats["unreported_startup"] = 0.0
+            warm_start = self._warm_stats["runs_completed"] > 0
+        return {
+            "startup_seconds": round(startup_seconds, 3),
+            "warm_start": warm_start,
+        }
     
     def run_single_gene(self, gene_symbol: str, protein_id: str = None, patient_profile: dict = None):
         """Run pipeline for a single gene with optional patient profile"""
         return self.run(gene_symbol, protein_id, patient_profile)
     
-    def run(self, gene_symbol: str, protein_id: str = None, patient_profile: dict = None):
-        """Run complete pipeline for a gene with patient profile support"""
+    def run(self, gene_symbol: str, protein_id: str = None, patient_profile: dict = None,
+            workspace=None):
+        """Run complete pipeline for a gene with patient profile support
+        
+        Args:
+            gene_symbol: Gene symbol
+            protein_id: Optional UniProt accession
+            patient_profile: Optional patient profile
+            workspace: RunWorkspace for phase files (defaults to data/ and output/)
+        """
         start_time = datetime.now()
         
         self.event_bus.emit(PipelineEvent(
@@ -169,6 +370,7 @@ class PGxPipeline:
         
         try:
             # Phase 1: Variant Discovery
+            self._check_cancelled()
             self.event_bus.emit(PipelineEvent(
                 stage="lab_prep",
                 substage="variant_discovery",
@@ -178,10 +380,12 @@ class PGxPipeline:
             
             print("PHASE 1: Variant Discovery")
             print("-" * 70)
-            phase1_result = self.phase1.run_pipeline(gene_symbol, protein_id)
+            phase1_result = self.phase1.run_pipeline(gene_symbol, protein_id, workspace=workspace,
+                                                     event_bus=self.event_bus)
             protein_id = phase1_result["protein_id"]
             
             # Phase 2: Clinical Validation
+            self._check_cancelled()
             self.event_bus.emit(PipelineEvent(
                 stage="ngs",
                 substage="clinical_validation",
@@ -192,9 +396,10 @@ class PGxPipeline:
             print(f"\n{'='*70}")
             print("PHASE 2: Clinical Validation")
             print("-" * 70)
-            self.phase2.run_pipeline(gene_symbol)
+            self.phase2.run_pipeline(gene_symbol, workspace=workspace)
             
             # Phase 3: Drug & Disease Context
+            self._check_cancelled()
             self.event_bus.emit(PipelineEvent(
                 stage="annotation",
                 substage="drug_disease_context",
@@ -205,9 +410,10 @@ class PGxPipeline:
             print(f"\n{'='*70}")
             print("PHASE 3: Drug & Disease Context")
             print("-" * 70)
-            self.phase3.run_pipeline(gene_symbol)
+            enriched_data = self.phase3.run_pipeline(gene_symbol, workspace=workspace)
             
             # Phase 4: RDF Graph Assembly
+            self._check_cancelled()
             self.event_bus.emit(PipelineEvent(
                 stage="enrichment",
                 substage="rdf_assembly",
@@ -218,9 +424,10 @@ class PGxPipeline:
             print(f"\n{'='*70}")
             print("PHASE 4: RDF Knowledge Graph Assembly")
             print("-" * 70)
-            rdf_output = self.phase4.run_pipeline(gene_symbol)
+            rdf_output = self.phase4.run_pipeline(gene_symbol, workspace=workspace)
             
             # Phase 5: Export & Visualization
+            self._check_cancelled()
             self.event_bus.emit(PipelineEvent(
                 stage="report",
                 substage="export",
@@ -231,8 +438,8 @@ class PGxPipeline:
             print(f"\n{'='*70}")
             print("PHASE 5: Export & Visualization")
             print("-" * 70)
-            jsonld_output = self.phase5_jsonld.run_pipeline(gene_symbol)
-            html_output = self.phase5_html.run_pipeline(gene_symbol)
+            jsonld_output = self.phase5_jsonld.run_pipeline(gene_symbol, workspace=workspace)
+            html_output = self.phase5_html.run_pipeline(gene_symbol, workspace=workspace, enriched_data=enriched_data)
             
             # Summary
             end_time = datetime.now()
@@ -294,9 +501,20 @@ class PGxPipeline:
                 "error": str(e)
             }
     
-    def run_multi_gene(self, gene_symbols: list, patient_profile: dict = None) -> dict:
-        """Enhanced multi-gene analysis with proper patient profile integration"""
+    def run_multi_gene(self, gene_symbols: list, patient_profile: dict = None, workspace=None) -> dict:
+        """Enhanced multi-gene analysis with proper patient profile integration
+        
+        Args:
+            gene_symbols: Genes to analyse
+            patient_profile: Optional patient profile
+            workspace: RunWorkspace for this run's files. When omitted, the
+                session's workspace is used; outside a session a fresh isolated
+                workspace is created if output.isolated_runs is set, otherwise
+                the shared data/ and output/ paths are used.
+        """
         start_time = datetime.now()
+        if workspace is None:
+            workspace = self.workspace or self.new_workspace()
         
         self.event_bus.emit(PipelineEvent(
             stage="lab_prep",
@@ -315,262 +533,27 @@ class PGxPipeline:
         print(f"{'='*70}\n")
         
         results = {}
-        all_variants = []
-        all_drugs = set()
-        all_diseases = set()
-        
-        # Determine patient ID and profile source
-        dashboard_source = False
-        if patient_profile:
-            # Check if this is a dashboard-created profile
-            dashboard_source = patient_profile.get("dashboard_source", False)
-            
-            # Prefer MRN as the canonical identifier for patient_id
-            patient_id = None
-            demographics = (patient_profile.get("clinical_information", {}) or {}).get("demographics", {})
-            mrn = demographics.get("mrn")
-            if isinstance(mrn, str) and mrn.strip():
-                patient_id = mrn.strip()  # keep MRN format as-is (e.g., MRN-12345)
-            else:
-                # Fallback to explicit patient_id if present
-                patient_id = patient_profile.get("patient_id")
-                
-            # If still missing, final fallback
-            
-            # Final fallback
-            if not patient_id:
-                patient_id = f"dashboard_patient_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            print(f"Using patient profile from dashboard: {patient_id}")
-        else:
-            patient_id = f"comprehensive_patient_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            print(f"Generating new patient profile: {patient_id}")
-        
-        try:
-            # Thread-safe lock for shared data structures
-            lock = threading.Lock()
-
-            # PARALLEL PROCESSING: Process genes concurrently
-            # Optimize thread pool size based on:
-            # 1. Number of genes to process
-            # 2. CPU count (for I/O-bound tasks like API calls, can be higher)
-            # 3. Maximum limit to avoid overwhelming APIs
-            import os
-            cpu_count = os.cpu_count() or 4
-            # For I/O-bound tasks, use 2x CPU count, but cap at 8
-            max_workers = min(len(gene_symbols), min(cpu_count * 2, 8))
-
-            print(f"\n{'='*70}")
-            print(f"PARALLEL PROCESSING: Running {len(gene_symbols)} genes with {max_workers} workers")
-            print(f"CPU Count: {cpu_count}, Optimized workers: {max_workers}")
-            print(f"{'='*70}\n")
-
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all gene processing tasks
-                future_to_gene = {
-                    executor.submit(self.run, gene_symbol): gene_symbol
-                    for gene_symbol in gene_symbols
-                }
+        patient_id, dashboard_source = self._resolve_patient_id(patient_profile)
 
-                # Process results as they complete
-                completed = 0
-                for future in as_completed(future_to_gene):
-                    gene_symbol = future_to_gene[future]
-                    completed += 1
-
-                    progress = 0.1 + (0.6 * completed / len(gene_symbols))  # 10-70% for gene processing
-
-                    try:
-                        gene_result = future.result()
+        try:
+            gene_stage = self._run_gene_stage(gene_symbols, workspace, results=results)
+            all_variants = gene_stage["variants"]
+            all_drugs = gene_stage["drugs"]
+            all_diseases = gene_stage["diseases"]
 
-                        # Thread-safe updates
-                        with lock:
-                            results[gene_symbol] = gene_result
-
-                        self.event_bus.emit(PipelineEvent(
-                            stage="ngs" if completed <= len(gene_symbols)/2 else "annotation",
-                            substage="processing",
-                            message=f"Completed gene {gene_symbol} ({completed}/{len(gene_symbols)})...",
-                            progress=progress
-                        ))
-
-                        print(f"\n{'='*70}")
-                        print(f"COMPLETED GENE {completed}/{len(gene_symbols)}: {gene_symbol}")
-                        print(f"{'='*70}")
-
-                        if gene_result["success"]:
-                            # Collect variants from this gene
-                            gene_variants = self._extract_gene_variants(gene_symbol)
-                            # Resolve exact rsIDs as early as possible using allele tuple
-                            try:
-                                gene_variants = self._assign_exact_rsid(gene_variants)
-                            except Exception:
-                                pass
-                            gene_drugs, gene_diseases = self._extract_drugs_diseases(gene_symbol)
-
-                            # Thread-safe updates
-                            with lock:
-                                all_variants.extend(gene_variants)
-                                all_drugs.update(gene_drugs)
-                                all_diseases.update(gene_diseases)
-                        else:
-                            print(f"WARNING: Failed to process {gene_symbol}: {gene_result.get('error', 'Unknown error')}")
+            self._check_cancelled()
 
-                    except Exception as e:
-                        print(f"ERROR: Exception processing {gene_symbol}: {str(e)}")
-                        with lock:
-                            results[gene_symbol] = {
-                                "success": False,
-                                "gene": gene_symbol,
-                                "error": str(e)
-                            }
-            
-            # Create comprehensive patient profile
-            self.event_bus.emit(PipelineEvent(
-                stage="enrichment",
-                substage="profile_generation",
-                message="Creating comprehensive patient profile...",
-                progress=0.75
-            ))
-            
-            print(f"\n{'='*70}")
-            print("CREATING COMPREHENSIVE PATIENT PROFILE")
-            print(f"{'='*70}")
-            
-            comprehensive_profile = self._create_comprehensive_profile(
-                patient_id, gene_symbols, all_variants, all_drugs, all_diseases, patient_profile, dashboard_source
-            )
-            
-            # ✅ PERFORMANCE FIX: Start database loading IMMEDIATELY in background thread
-            # This runs in parallel with variant linking and output generation (60-70% speedup)
-            db_status = {"success": False, "error": None, "completed": False}
-            db_thread = None
-            if self.config and self.config.database_enabled:
-                try:
-                    from utils.database_loader import DatabaseLoader
-                    
-                    def load_to_database():
-                        """Load profile to database in background thread - NON-BLOCKING"""
-                        try:
-                            db_loader = DatabaseLoader(config_path=self.config.config_path if hasattr(self.config, 'config_path') else None)
-                            result = db_loader.load_patient_profile(comprehensive_profile)
-                            db_status.update(result)
-                            db_status["completed"] = True
-                            db_loader.close()
-                        except Exception as e:
-                            db_status["success"] = False
-                            db_status["error"] = str(e)
-                            db_status["completed"] = True
-                            if self.config.database_non_blocking:
-                                print(f"Database loading failed (non-blocking): {e}")
-                            else:
-                                raise
-                    
-                    # Start database loading immediately - runs in parallel!
-                    db_thread = threading.Thread(target=load_to_database, daemon=True)
-                    db_thread.start()
-                    print("✓ Started database loading in parallel thread (runs in background)")
-                except Exception as e:
-                    db_status["error"] = str(e)
-                    db_status["completed"] = True
-                    if self.config.database_non_blocking:
-                        print(f"Could not start database loading (non-blocking): {e}")
-                    else:
-                        raise
-            
-            # Link patient profile to variants and detect conflicts (database loads in parallel!)
-            self.event_bus.emit(PipelineEvent(
-                stage="enrichment",
-                substage="variant_linking",
-                message="Linking patient profile to variants...",
-                progress=0.85
-            ))
-            
-            print(f"\n{'='*70}")
-            print("LINKING PATIENT PROFILE TO VARIANTS")
-            print(f"{'='*70}")
-            linking_results = self.variant_linker.link_patient_profile_to_variants(
-                patient_profile=comprehensive_profile,
-                variants=all_variants
+            comprehensive_profile, outputs, _ = self._run_patient_stages(
+                patient_id, gene_symbols, gene_stage, patient_profile, dashboard_source, workspace
             )
             
-            # Add linking results to comprehensive profile
-            comprehensive_profile["variant_linking"] = linking_results
-
-            # Enrich variants with patient-specific population frequency context
-            try:
-                from utils.population_frequencies import classify_population_significance, summarize_ethnicity_context
-                from utils.dosing_adjustments import suggest_ethnicity_adjustments
-                patient_ethnicity = None
-                patient_ethnicity_snomed_code = None
-                try:
-                    demo = comprehensive_profile.get("clinical_information", {}).get("demographics", {})
-                    eth = demo.get("ethnicity")
-                    if isinstance(eth, list) and eth:
-                        patient_ethnicity = eth[0]
-                    elif isinstance(eth, str):
-                        patient_ethnicity = eth
-                    # Attach SNOMED code for patient's ethnicity if available
-                    eth_snomed = comprehensive_profile.get("clinical_information", {}).get("ethnicity_snomed")
-                    if isinstance(eth_snomed, list) and patient_ethnicity:
-                        for ent in eth_snomed:
-                            label = ent.get("label") or ent.get("rdfs:label") or ent.get("skos:prefLabel")
-                            if label == patient_ethnicity:
-                                patient_ethnicity_snomed_code = ent.get("snomed:code")
-                                break
-                except Exception:
-                    patient_ethnicity = None
-
-                for v in all_variants:
-                    freqs = v.get("population_frequencies") or {}
-                    pf = None
-                    if patient_ethnicity:
-                        pf = freqs.get(patient_ethnicity)
-                    v["patient_population_frequency"] = pf
-                    v["population_significance"] = classify_population_significance(pf)
-                    v["ethnicity_context"] = summarize_ethnicity_context(
-                        v.get("rsid") or v.get("variant_id", ""),
-                        v.get("gene", ""),
-                        patient_ethnicity,
-                        freqs,
-                    )
-                    if patient_ethnicity_snomed_code:
-                        v["patient_ethnicity_snomed_code"] = patient_ethnicity_snomed_code
-
-                # Ethnicity-aware medication adjustment hints (non-binding)
-                adjustments = suggest_ethnicity_adjustments(all_variants, patient_ethnicity)
-                if adjustments:
-                    # Enrich with SNOMED CT codes where possible
-                    try:
-                        if hasattr(self, 'variant_linker') and self.variant_linker and hasattr(self.variant_linker, '_search_drug_snomed'):
-                            for adj in adjustments:
-                                dname = adj.get("drug")
-                                if not dname:
-                                    continue
-                                snomed = self.variant_linker._search_drug_snomed(dname)
-                                if snomed and snomed.get("code"):
-                                    adj["snomed:code"] = snomed["code"]
-                                    adj["snomed:uri"] = f"http://snomed.info/id/{snomed['code']}"
-                    except Exception:
-                        pass
-                    comprehensive_profile["ethnicity_medication_adjustments"] = adjustments
-            except Exception:
-                pass
-            
-            # Generate all output formats
-            self.event_bus.emit(PipelineEvent(
-                stage="report",
-                substage="export",
-                message="Generating all output formats...",
-                progress=0.95
-            ))
-            
-            # ✅ PERFORMANCE: Pass db_status and db_thread so outputs can check database status
-            outputs = self._generate_all_outputs(comprehensive_profile, results, db_status=db_status, db_thread=db_thread)
-            
             # Summary
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
+            timing = self._take_startup_timing()
+            timing["total_seconds"] = round(duration, 3)
+            with self._components_lock:
+                self._warm_stats["runs_completed"] += 1
             
             self.event_bus.emit(PipelineEvent(
                 stage="report",
@@ -606,7 +589,7 @@ class PGxPipeline:
                 print(f"  🧬 Variant-to-Phenotype: {links_summary.get('variant_to_phenotype', 0)}")
                 print(f"  💉 Drug-to-Variant: {links_summary.get('drug_to_variant', 0)}")
             
-            print(f"\nDuration: {duration:.1f} seconds")
+            print(f"\nDuration: {duration:.1f} seconds (startup: {timing['startup_seconds']:.2f}s, {'warm' if timing['warm_start'] else 'cold'} start)")
             print(f"\nComprehensive outputs:")
             for output_type, path in outputs.items():
                 print(f"  {output_type}: {path}")
@@ -621,10 +604,12 @@ class PGxPipeline:
                 "affected_drugs": len(all_drugs),
                 "associated_diseases": len(all_diseases),
                 "duration": duration,
+                "timing": timing,
                 "gene_results": results,
                 "comprehensive_profile": comprehensive_profile,
                 "comprehensive_outputs": outputs,  # Use "comprehensive_outputs" to avoid confusion
-                "outputs": outputs  # Keep for backward compatibility
+                "outputs": outputs,  # Keep for backward compatibility
+                "workspace": str(workspace.root) if workspace.is_isolated else None
             }
             
         except Exception as e:
@@ -646,21 +631,519 @@ class PGxPipeline:
             
             return {
                 "success": False,
+                "cancelled": isinstance(e, PipelineCancelled),
                 "genes": gene_symbols,
                 "error": str(e),
                 "partial_results": results
             }
     
-    def _extract_gene_variants(self, gene_symbol: str) -> list:
+    def run_cohort(self, gene_symbols: list, patient_profiles: list, workers: int = None,
+                   workspace=None) -> dict:
+        """Run many patients against one gene panel
+
+        Gene-level phases 1-5 run once for the panel; the patient-dependent
+        stages (comprehensive profile, variant linking, outputs, database load)
+        then run per patient across a process pool. A manifest with per-patient
+        status and timings is written to the cohort workspace.
+
+        Args:
+            gene_symbols: Gene panel
+            patient_profiles: List of (source, profile) pairs, e.g. from load_patient_profiles()
+            workers: Worker processes for the patient stages (default: CPU count;
+                1 runs every patient in this process)
+            workspace: RunWorkspace for the cohort (default: new one under output.runs_dir)
+
+        Returns:
+            Manifest dictionary (also written to <workspace>/manifest.json)
+        """
+        start_time = datetime.now()
+        if workspace is None:
+            workspace = RunWorkspace.create(self.config.config.get('output', {}).get('runs_dir', 'runs'))
+        if workers is None:
+            import os
+            workers = os.cpu_count() or 2
+        workers = max(1, min(workers, len(patient_profiles) or 1))
+
+        print(f"\n{'='*70}")
+        print("PGx-KG: Cohort Batch Run")
+        print(f"{'='*70}")
+        print(f"Genes: {', '.join(gene_symbols)}")
+        print(f"Patients: {len(patient_profiles)}")
+        print(f"Workers: {workers}")
+        print(f"Workspace: {workspace.root}")
+        print(f"{'='*70}\n")
+
+        # Gene-level phases once for the whole cohort
+        gene_started = time.perf_counter()
+        gene_stage = self._run_gene_stage(gene_symbols, workspace)
+        gene_stage_seconds = time.perf_counter() - gene_started
+
+        tasks = [
+            (index, source, profile, str(workspace.root / "patients" / f"{index:04d}"))
+            for index, (source, profile) in enumerate(patient_profiles)
+        ]
+        patients = []
+        if workers == 1:
+            for task in tasks:
+                patients.append(self._run_cohort_member(gene_symbols, gene_stage, *task))
+        else:
+            # spawn: worker processes must not inherit this process's threads and locks
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_cohort_worker,
+                initargs=(str(self.config.config_path), gene_symbols, gene_stage)
+            ) as executor:
+                futures = {executor.submit(_run_cohort_task, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    index, source = futures[future][:2]
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        entry = {"index": index, "source": source, "patient_id": None,
+                                 "status": "failed", "duration_seconds": None, "error": str(e)}
+                    patients.append(entry)
+                    print(f"[{len(patients)}/{len(tasks)}] {entry['source']}: {entry['status']}")
+        patients.sort(key=lambda entry: entry["index"])
+
+        end_time = datetime.now()
+        succeeded = sum(1 for entry in patients if entry["status"] == "succeeded")
+        manifest = {
+            "run_id": workspace.run_id,
+            "workspace": str(workspace.root),
+            "genes": gene_symbols,
+            "gene_status": {
+                gene: bool((result or {}).get("success")) for gene, result in gene_stage["results"].items()
+            },
+            "started": start_time.isoformat(),
+            "finished": end_time.isoformat(),
+            "duration_seconds": round((end_time - start_time).total_seconds(), 3),
+            "gene_stage_seconds": round(gene_stage_seconds, 3),
+            "workers": workers,
+            "total_patients": len(patients),
+            "succeeded": succeeded,
+            "failed": len(patients) - succeeded,
+            "patients": patients,
+        }
+        manifest_file = workspace.root / "manifest.json"
+        write_json(manifest_file, manifest)
+        manifest["manifest"] = str(manifest_file)
+
+        print(f"\n{'='*70}")
+        print("COHORT RUN COMPLETE!")
+        print(f"{'='*70}")
+        print(f"Patients: {succeeded}/{len(patients)} succeeded")
+        print(f"Gene stage: {gene_stage_seconds:.1f}s, total: {manifest['duration_seconds']:.1f}s")
+        print(f"Manifest: {manifest_file}")
+        print(f"{'='*70}\n")
+        return manifest
+
+    def _run_cohort_member(self, gene_symbols: list, gene_stage: dict, index: int, source: str,
+                           patient_profile: dict, patient_root: str) -> dict:
+        """Run the patient-dependent stages for one cohort member
+
+        Returns:
+            Manifest entry with status, timing and output paths
+        """
+        started = time.perf_counter()
+        entry = {"index": index, "source": source, "patient_id": None, "status": "failed"}
+        try:
+            patient_id, dashboard_source = self._resolve_patient_id(patient_profile)
+            entry["patient_id"] = patient_id
+            # Patient stages annotate variants in place; the gene stage is shared
+            stage = dict(gene_stage, variants=copy.deepcopy(gene_stage["variants"]))
+            _, outputs, db_thread = self._run_patient_stages(
+                patient_id, gene_symbols, stage, patient_profile, dashboard_source,
+                RunWorkspace(patient_root, run_id=f"{index:04d}")
+            )
+            if db_thread is not None:
+                db_thread.join()
+            db_status = outputs.pop("db_status", None)
+            entry["outputs"] = outputs
+            entry["db_status"] = db_status
+            if "error" in outputs:
+                entry["error"] = outputs["error"]
+            else:
+                entry["status"] = "succeeded"
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["duration_seconds"] = round(time.perf_counter() - started, 3)
+        return entry
+
+    def _resolve_patient_id(self, patient_profile: dict = None) -> tuple:
+        """Determine the patient ID and profile source for a run
+
+        Args:
+            patient_profile: Optional patient profile
+
+        Returns:
+            Tuple of (patient_id, dashboard_source)
+        """
+        dashboard_source = False
+        if patient_profile:
+            # Check if this is a dashboard-created profile
+            dashboard_source = patient_profile.get("dashboard_source", False)
+            
+            # Prefer MRN as the canonical identifier for patient_id
+            patient_id = None
+            demographics = (patient_profile.get("clinical_information", {}) or {}).get("demographics", {})
+            mrn = demographics.get("mrn")
+            if isinstance(mrn, str) and mrn.strip():
+                patient_id = mrn.strip()  # keep MRN format as-is (e.g., MRN-12345)
+            else:
+                # Fallback to explicit patient_id if present
+                patient_id = patient_profile.get("patient_id")
+                
+            # If still missing, final fallback
+            
+            # Final fallback
+            if not patient_id:
+                patient_id = f"dashboard_patient_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            
+            print(f"Using patient profile from dashboard: {patient_id}")
+        else:
+            patient_id = f"comprehensive_patient_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            print(f"Generating new patient profile: {patient_id}")
+        return patient_id, dashboard_source
+
+    def _run_gene_stage(self, gene_symbols: list, workspace, results: dict = None) -> dict:
+        """Run (or reuse) the patient-independent phases 1-5 for every gene
+
+        Args:
+            gene_symbols: Genes to analyse
+            workspace: RunWorkspace for the per-gene files
+            results: Optional dict filled with per-gene results as they complete
+                (so callers keep partial results if the stage fails)
+
+        Returns:
+            Dict with per-gene "results", collected "variants", "drugs" and
+            "diseases"
+        """
+        results = {} if results is None else results
+        all_variants = []
+        all_drugs = set()
+        all_diseases = set()
+
+        # Thread-safe lock for shared data structures
+        lock = threading.Lock()
+
+        # PARALLEL PROCESSING: Process genes concurrently
+        # Optimize thread pool size based on:
+        # 1. Number of genes to process
+        # 2. CPU count (for I/O-bound tasks like API calls, can be higher)
+        # 3. Maximum limit to avoid overwhelming APIs
+        # INCREMENTAL RE-ANALYSIS: phases 1-5 per gene do not depend on the patient,
+        # so genes whose inputs are unchanged are served from the gene result store
+        gene_keys = {}
+        genes_to_run = list(gene_symbols)
+        if self.gene_store is not None:
+            genes_to_run = []
+            for gene_symbol in gene_symbols:
+                gene_keys[gene_symbol] = self._gene_cache_key(gene_symbol)
+                entry = self.gene_store.load(gene_symbol, gene_keys[gene_symbol])
+                if entry is None:
+                    genes_to_run.append(gene_symbol)
+                    continue
+                results[gene_symbol] = dict(entry["gene_result"], cached=True)
+                all_variants.extend(entry.get("variants", []))
+                all_drugs.update(entry.get("drugs", []))
+                all_diseases.update(entry.get("diseases", []))
+                print(f"Reusing cached gene results for {gene_symbol}")
+
+            reused = len(gene_symbols) - len(genes_to_run)
+            if reused:
+                self.event_bus.emit(PipelineEvent(
+                    stage="lab_prep",
+                    substage="gene_cache",
+                    message=f"Reusing cached results for {reused}/{len(gene_symbols)} genes...",
+                    progress=0.1
+                ))
+
+        import os
+        cpu_count = os.cpu_count() or 4
+        # For I/O-bound tasks, use 2x CPU count, but cap at 8
+        max_workers = max(1, min(len(genes_to_run), min(cpu_count * 2, 8)))
+
+        print(f"\n{'='*70}")
+        print(f"PARALLEL PROCESSING: Running {len(genes_to_run)} genes with {max_workers} workers")
+        print(f"CPU Count: {cpu_count}, Optimized workers: {max_workers}")
+        print(f"{'='*70}\n")
+
+        # Resolve UniProt accessions for the whole panel in one shot (local index first)
+        protein_ids = {}
+        if genes_to_run:
+            try:
+                from phase1_discovery.variant_discoverer import ProteinFetcher
+                protein_ids = ProteinFetcher().get_protein_ids(genes_to_run)
+            except Exception as e:
+                print(f"Warning: Could not resolve UniProt IDs for the panel: {e}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all gene processing tasks
+            future_to_gene = {
+                executor.submit(self.run, gene_symbol, protein_ids.get(gene_symbol),
+                                workspace=workspace): gene_symbol
+                for gene_symbol in genes_to_run
+            }
+
+            # Process results as they complete
+            completed = len(gene_symbols) - len(genes_to_run)
+            for future in as_completed(future_to_gene):
+                gene_symbol = future_to_gene[future]
+                completed += 1
+
+                # Drop genes that have not started once the run is cancelled
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    for pending in future_to_gene:
+                        pending.cancel()
+
+                progress = 0.1 + (0.6 * completed / len(gene_symbols))  # 10-70% for gene processing
+
+                try:
+                    gene_result = future.result()
+
+                    # Thread-safe updates
+                    with lock:
+                        results[gene_symbol] = gene_result
+
+                    self.event_bus.emit(PipelineEvent(
+                        stage="ngs" if completed <= len(gene_symbols)/2 else "annotation",
+                        substage="processing",
+                        message=f"Completed gene {gene_symbol} ({completed}/{len(gene_symbols)})...",
+                        progress=progress
+                    ))
+
+                    print(f"\n{'='*70}")
+                    print(f"COMPLETED GENE {completed}/{len(gene_symbols)}: {gene_symbol}")
+                    print(f"{'='*70}")
+
+                    if gene_result["success"]:
+                        # Collect variants from this gene
+                        gene_variants = self._extract_gene_variants(gene_symbol, workspace)
+                        # Resolve exact rsIDs as early as possible using allele tuple
+                        try:
+                            gene_variants = self._assign_exact_rsid(gene_variants)
+                        except Exception:
+                            pass
+                        gene_drugs, gene_diseases = self._extract_drugs_diseases(gene_symbol, workspace)
+
+                        # Store before the patient-dependent stages annotate the variants
+                        if self.gene_store is not None:
+                            try:
+                                self.gene_store.save(
+                                    gene_symbol, gene_keys[gene_symbol], gene_result,
+                                    gene_variants, gene_drugs, gene_diseases
+                                )
+                            except Exception as e:
+                                print(f"Warning: Could not store gene results for {gene_symbol}: {e}")
+
+                        # Thread-safe updates
+                        with lock:
+                            all_variants.extend(gene_variants)
+                            all_drugs.update(gene_drugs)
+                            all_diseases.update(gene_diseases)
+                    else:
+                        print(f"WARNING: Failed to process {gene_symbol}: {gene_result.get('error', 'Unknown error')}")
+
+                except Exception as e:
+                    print(f"ERROR: Exception processing {gene_symbol}: {str(e)}")
+                    with lock:
+                        results[gene_symbol] = {
+                            "success": False,
+                            "gene": gene_symbol,
+                            "error": str(e)
+                        }
+
+        return {
+            "results": results,
+            "variants": all_variants,
+            "drugs": all_drugs,
+            "diseases": all_diseases,
+        }
+
+    def _run_patient_stages(self, patient_id: str, gene_symbols: list, gene_stage: dict,
+                            patient_profile: dict = None, dashboard_source: bool = False,
+                            workspace=None) -> tuple:
+        """Run the patient-dependent stages on top of a gene stage: comprehensive
+        profile, database load, variant linking and comprehensive outputs
+
+        The gene stage's variants are annotated in place; pass a copy when the
+        same gene stage is shared by several patients.
+
+        Args:
+            patient_id: Patient identifier
+            gene_symbols: Genes analysed
+            gene_stage: Result of _run_gene_stage()
+            patient_profile: Optional patient profile
+            dashboard_source: True for dashboard-created profiles
+            workspace: RunWorkspace for the comprehensive outputs
+
+        Returns:
+            Tuple of (comprehensive_profile, outputs, db_thread); db_thread is the
+            background database load (None when the database is disabled)
+        """
+        results = gene_stage["results"]
+        all_variants = gene_stage["variants"]
+        all_drugs = gene_stage["drugs"]
+        all_diseases = gene_stage["diseases"]
+
+        # Create comprehensive patient profile
+        self.event_bus.emit(PipelineEvent(
+            stage="enrichment",
+            substage="profile_generation",
+            message="Creating comprehensive patient profile...",
+            progress=0.75
+        ))
+        
+        print(f"\n{'='*70}")
+        print("CREATING COMPREHENSIVE PATIENT PROFILE")
+        print(f"{'='*70}")
+        
+        comprehensive_profile = self._create_comprehensive_profile(
+            patient_id, gene_symbols, all_variants, all_drugs, all_diseases, patient_profile, dashboard_source
+        )
+        
+        # ✅ PERFORMANCE FIX: Start database loading IMMEDIATELY in background thread
+        # This runs in parallel with variant linking and output generation (60-70% speedup)
+        db_status = {"success": False, "error": None, "completed": False}
+        db_thread = None
+        if self.config and self.config.database_enabled:
+            try:
+                from utils.database_loader import DatabaseLoader
+                
+                def load_to_database():
+                    """Load profile to database in background thread - NON-BLOCKING"""
+                    try:
+                        db_loader = DatabaseLoader(config=self.config)
+                        result = db_loader.load_patient_profile(comprehensive_profile)
+                        db_status.update(result)
+                        db_status["completed"] = True
+                        db_loader.close()
+                    except Exception as e:
+                        db_status["success"] = False
+                        db_status["error"] = str(e)
+                        db_status["completed"] = True
+                        if self.config.database_non_blocking:
+                            print(f"Database loading failed (non-blocking): {e}")
+                        else:
+                            raise
+                
+                # Start database loading immediately - runs in parallel!
+                db_thread = threading.Thread(target=load_to_database, daemon=True)
+                db_thread.start()
+                print("✓ Started database loading in parallel thread (runs in background)")
+            except Exception as e:
+                db_status["error"] = str(e)
+                db_status["completed"] = True
+                if self.config.database_non_blocking:
+                    print(f"Could not start database loading (non-blocking): {e}")
+                else:
+                    raise
+        
+        # Link patient profile to variants and detect conflicts (database loads in parallel!)
+        self.event_bus.emit(PipelineEvent(
+            stage="enrichment",
+            substage="variant_linking",
+            message="Linking patient profile to variants...",
+            progress=0.85
+        ))
+        
+        print(f"\n{'='*70}")
+        print("LINKING PATIENT PROFILE TO VARIANTS")
+        print(f"{'='*70}")
+        linking_results = self.variant_linker.link_patient_profile_to_variants(
+            patient_profile=comprehensive_profile,
+            variants=all_variants
+        )
+        
+        # Add linking results to comprehensive profile
+        comprehensive_profile["variant_linking"] = linking_results
+
+        # Enrich variants with patient-specific population frequency context
+        try:
+            from utils.population_frequencies import classify_population_significance, summarize_ethnicity_context
+            from utils.dosing_adjustments import suggest_ethnicity_adjustments
+            patient_ethnicity = None
+            patient_ethnicity_snomed_code = None
+            try:
+                demo = comprehensive_profile.get("clinical_information", {}).get("demographics", {})
+                eth = demo.get("ethnicity")
+                if isinstance(eth, list) and eth:
+                    patient_ethnicity = eth[0]
+                elif isinstance(eth, str):
+                    patient_ethnicity = eth
+                # Attach SNOMED code for patient's ethnicity if available
+                eth_snomed = comprehensive_profile.get("clinical_information", {}).get("ethnicity_snomed")
+                if isinstance(eth_snomed, list) and patient_ethnicity:
+                    for ent in eth_snomed:
+                        label = ent.get("label") or ent.get("rdfs:label") or ent.get("skos:prefLabel")
+                        if label == patient_ethnicity:
+                            patient_ethnicity_snomed_code = ent.get("snomed:code")
+                            break
+            except Exception:
+                patient_ethnicity = None
+
+            for v in all_variants:
+                freqs = v.get("population_frequencies") or {}
+                pf = None
+                if patient_ethnicity:
+                    pf = freqs.get(patient_ethnicity)
+                v["patient_population_frequency"] = pf
+                v["population_significance"] = classify_population_significance(pf)
+                v["ethnicity_context"] = summarize_ethnicity_context(
+                    v.get("rsid") or v.get("variant_id", ""),
+                    v.get("gene", ""),
+                    patient_ethnicity,
+                    freqs,
+                )
+                if patient_ethnicity_snomed_code:
+                    v["patient_ethnicity_snomed_code"] = patient_ethnicity_snomed_code
+
+            # Ethnicity-aware medication adjustment hints (non-binding)
+            adjustments = suggest_ethnicity_adjustments(all_variants, patient_ethnicity)
+            if adjustments:
+                # Enrich with SNOMED CT codes where possible
+                try:
+                    if hasattr(self, 'variant_linker') and self.variant_linker and hasattr(self.variant_linker, '_search_drug_snomed'):
+                        for adj in adjustments:
+                            dname = adj.get("drug")
+                            if not dname:
+                                continue
+                            snomed = self.variant_linker._search_drug_snomed(dname)
+                            if snomed and snomed.get("code"):
+                                adj["snomed:code"] = snomed["code"]
+                                adj["snomed:uri"] = f"http://snomed.info/id/{snomed['code']}"
+                except Exception:
+                    pass
+                comprehensive_profile["ethnicity_medication_adjustments"] = adjustments
+        except Exception:
+            pass
+        
+        # Generate all output formats
+        self._check_cancelled()
+        self.event_bus.emit(PipelineEvent(
+            stage="report",
+            substage="export",
+            message="Generating all output formats...",
+            progress=0.95
+        ))
+        
+        # ✅ PERFORMANCE: Pass db_status and db_thread so outputs can check database status
+        outputs = self._generate_all_outputs(comprehensive_profile, results, db_status=db_status, db_thread=db_thread,
+                                             workspace=workspace)
+
+        return comprehensive_profile, outputs, db_thread
+    def _extract_gene_variants(self, gene_symbol: str, workspace=None) -> list:
         """Extract variants from a processed gene"""
+        ws = workspace or DEFAULT_WORKSPACE
         try:
             # Load Phase 2 data (enriched variants)
-            phase2_file = f"data/phase2/{gene_symbol}_clinical.json"
+            phase2_file = ws.clinical_file(gene_symbol)
             with open(phase2_file, 'r', encoding='utf-8') as f:
                 phase2_data = json.load(f)
             
             # Load Phase 3 data (enriched with literature)
-            phase3_file = f"data/phase3/{gene_symbol}_enriched.json"
+            phase3_file = ws.enriched_file(gene_symbol)
             phase3_data = {}
             try:
                 with open(phase3_file, 'r', encoding='utf-8') as f:
@@ -716,14 +1199,14 @@ class PGxPipeline:
             print(f"Warning: Could not extract variants for {gene_symbol}: {e}")
             return []
     
-    def _extract_drugs_diseases(self, gene_symbol: str) -> tuple:
+    def _extract_drugs_diseases(self, gene_symbol: str, workspace=None) -> tuple:
         """Extract unique drugs and diseases from a gene"""
         drugs = set()
         diseases = set()
         
         try:
             # Load Phase 3 data (enriched with drugs/diseases)
-            phase3_file = f"data/phase3/{gene_symbol}_enriched.json"
+            phase3_file = (workspace or DEFAULT_WORKSPACE).enriched_file(gene_symbol)
             with open(phase3_file, 'r', encoding='utf-8') as f:
                 phase3_data = json.load(f)
             
@@ -988,29 +1471,7 @@ class PGxPipeline:
             traceback.print_exc()
         
         profile = {
-            "@context": {
-                "foaf": "http://xmlns.com/foaf/0.1/",
-                "schema": "http://schema.org/",
-                "pgx": "http://pgx-kg.org/",
-                "sdisco": "http://ugent.be/sdisco/",
-                "snomed": "http://snomed.info/id/",
-                "drugbank": "https://go.drugbank.com/drugs/",
-                "ugent": "http://ugent.be/person/",
-                "dbsnp": "https://identifiers.org/dbsnp/",
-                "ncbigene": "https://identifiers.org/ncbigene/",
-                "clinpgx": "https://www.clinpgx.org/haplotype/",
-                "gn": "http://www.geonames.org/ontology#",
-                "skos": "http://www.w3.org/2004/02/skos/core#",
-                "xsd": "http://www.w3.org/2001/XMLSchema#",
-                # JSON-LD terms for new patient-specific properties
-                "population_frequencies": "pgx:populationFrequencies",
-                "patient_population_frequency": "pgx:patientPopulationFrequency",
-                "population_significance": "pgx:populationSignificance",
-                "population_frequency_source": "pgx:populationFrequencySource",
-                "ethnicity_context": "pgx:ethnicityContext",
-                "ethnicity_medication_adjustments": "pgx:ethnicityMedicationAdjustments",
-                "ethnicity_snomed": "pgx:ethnicitySnomed"
-            },
+            "@context": dict(PROFILE_CONTEXT),
             "@id": f"http://ugent.be/person/{canonical_id}",
             "@type": ["foaf:Person", "schema:Person", "schema:Patient"],
             "identifier": canonical_id,
@@ -1620,7 +2081,8 @@ class PGxPipeline:
 
         return factors
     
-    def _generate_clinical_summary(self, variants: list) -> dict:
+    @staticmethod
+    def _generate_clinical_summary(variants: list) -> dict:
         """Generate clinical summary from variants"""
         summary = {
             "total_variants": len(variants),
@@ -1653,7 +2115,8 @@ class PGxPipeline:
         
         return summary
     
-    def _generate_literature_summary(self, variants: list) -> dict:
+    @staticmethod
+    def _generate_literature_summary(variants: list) -> dict:
         """Generate literature summary from variants with enhanced variant-specific data
         ✅ CRITICAL FIX: Now includes actual publication dictionaries for database loader
         """
@@ -1756,9 +2219,9 @@ class PGxPipeline:
             "drugs_with_literature": len(drugs_with_literature),
             "top_publications": top_publications[:10],  # Top 10 most cited
             "coverage": {
-                "genes_covered": list(genes_with_literature),
-                "variants_covered": list(variants_with_literature)[:10],
-                "drugs_covered": list(drugs_with_literature)[:10]
+                "genes_covered": sorted(genes_with_literature),
+                "variants_covered": sorted(variants_with_literature)[:10],
+                "drugs_covered": sorted(drugs_with_literature)[:10]
             },
             # ✅ CRITICAL: Actual publication dictionaries for database loader
             "gene_literature": gene_literature,
@@ -1766,7 +2229,8 @@ class PGxPipeline:
             "drug_literature": drug_literature
         }
     
-    def _generate_all_outputs(self, profile: dict, gene_results: dict, db_status: dict = None, db_thread = None) -> dict:
+    def _generate_all_outputs(self, profile: dict, gene_results: dict, db_status: dict = None, db_thread = None,
+                              workspace=None) -> dict:
         """Generate all output formats: JSON-LD, TTL, HTML, Summary JSON, etc.
         
         Args:
@@ -1774,17 +2238,16 @@ class PGxPipeline:
             gene_results: Results from gene analysis
             db_status: Database loading status dict (if database loading already started)
             db_thread: Database loading thread (if already started)
+            workspace: RunWorkspace for the comprehensive outputs
         """
         from pathlib import Path
-        import json
         import threading
         
         outputs = {}
         patient_id = profile.get("patient_id", "unknown")
         
         # Create comprehensive output directory
-        comp_dir = Path("output/comprehensive")
-        comp_dir.mkdir(parents=True, exist_ok=True)
+        comp_dir = (workspace or DEFAULT_WORKSPACE).comprehensive_dir
         
         # ✅ PERFORMANCE FIX: Database loading already started earlier (line ~470) in parallel
         # Use passed db_status/db_thread or initialize empty if not provided
@@ -1797,86 +2260,9 @@ class PGxPipeline:
             # 1. Comprehensive JSON-LD with all gene knowledge graphs merged
             jsonld_file = comp_dir / f"{patient_id}_comprehensive.jsonld"
             
-            # Merge all gene knowledge graphs into the profile
-            comprehensive_jsonld = profile.copy()
-            
-            # Load and merge each gene's knowledge graph
-            json_output_dir = Path("output/json")
-            if json_output_dir.exists():
-                all_variants_detailed = []
-                
-                for gene in gene_results.keys():
-                    gene_kg_file = json_output_dir / f"{gene}_knowledge_graph.jsonld"
-                    if gene_kg_file.exists():
-                        try:
-                            with open(gene_kg_file, 'r', encoding='utf-8') as f:
-                                gene_kg = json.load(f)
-                            
-                            # Extract variants from gene knowledge graph
-                            if isinstance(gene_kg, dict):
-                                # Check for variants in various possible locations
-                                if 'variants' in gene_kg:
-                                    all_variants_detailed.extend(gene_kg['variants'])
-                                elif '@graph' in gene_kg:
-                                    # If using @graph format, extract variant nodes
-                                    for node in gene_kg['@graph']:
-                                        if node.get('@type') in ['Variant', 'GeneticVariant', 'pgx:Variant']:
-                                            all_variants_detailed.append(node)
-                                
-                        except Exception as e:
-                            print(f"Error merging {gene} knowledge graph: {e}")
-                
-                # Add all detailed variants to comprehensive profile
-                if all_variants_detailed:
-                    comprehensive_jsonld['variants'] = all_variants_detailed
-            
-            # Merge patient-specific variant annotations into detailed variants (if present)
-            try:
-                if isinstance(comprehensive_jsonld.get('variants'), list) and isinstance(profile.get('variants'), list):
-                    # Build lookup from original enriched variants by rsid/variant_id
-                    enriched_map = {}
-                    for v in profile.get('variants', []):
-                        key = v.get('rsid') or v.get('variant_id')
-                        if not key:
-                            # Fallback: try genomic location
-                            gl = None
-                            try:
-                                glc = v.get('raw_data', {}).get('genomicLocation')
-                                if isinstance(glc, list) and glc:
-                                    gl = glc[0]
-                            except Exception:
-                                gl = None
-                            key = gl
-                        if key:
-                            enriched_map[str(key)] = v
-                    merged_variants = []
-                    for dv in comprehensive_jsonld.get('variants', []):
-                        dv_key = dv.get('rsid') or dv.get('variant_id') or dv.get('id')
-                        if not dv_key:
-                            # Fallback: attempt to use genomicLocation or similar field
-                            gl2 = dv.get('genomicLocation')
-                            if isinstance(gl2, list) and gl2:
-                                dv_key = gl2[0]
-                        ev = enriched_map.get(str(dv_key)) if dv_key else None
-                        if ev:
-                            # Attach patient-specific population context fields if missing
-                            for k in (
-                                'population_frequencies',
-                                'patient_population_frequency',
-                                'population_significance',
-                                'ethnicity_context',
-                                'population_frequency_source',
-                            ):
-                                if k not in dv and k in ev:
-                                    dv[k] = ev[k]
-                        merged_variants.append(dv)
-                    comprehensive_jsonld['variants'] = merged_variants
-            except Exception:
-                pass
-            
-            # Save comprehensive JSON-LD
-            with open(jsonld_file, 'w', encoding='utf-8') as f:
-                json.dump(comprehensive_jsonld, f, indent=2)
+            # The profile already carries every gene's variants with their
+            # population context; they are encoded one at a time
+            write_json_streaming(jsonld_file, profile, {"variants": profile.get("variants") or []})
             outputs["JSON-LD"] = str(jsonld_file)
             
             # 2. Turtle RDF
@@ -1886,25 +2272,23 @@ class PGxPipeline:
                 f.write(ttl_content)
             outputs["TTL"] = str(ttl_file)
             
-            # 3. HTML Report
+            # 3. HTML Report (streamed from the report model, which also holds the drug matrix)
+            from phase5_export.report_model import build_comprehensive_report_model
+            from phase5_export.report_templates import write_report
+            report_model = build_comprehensive_report_model(profile, gene_results)
             html_file = comp_dir / f"{patient_id}_comprehensive_report.html"
-            html_content = self._generate_html_report(profile, gene_results)
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            write_report("comprehensive_report.html.j2", report_model, html_file)
             outputs["HTML"] = str(html_file)
             
             # 4. Summary JSON (simplified for dashboards)
             summary_file = comp_dir / f"{patient_id}_summary.json"
             summary = self._generate_summary_json(profile, gene_results)
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2)
+            write_json(summary_file, summary)
             outputs["Summary JSON"] = str(summary_file)
             
             # 5. Drug Interaction Matrix JSON
             drug_matrix_file = comp_dir / f"{patient_id}_drug_matrix.json"
-            drug_matrix = self._create_drug_matrix(profile["variants"])
-            with open(drug_matrix_file, 'w', encoding='utf-8') as f:
-                json.dump(drug_matrix, f, indent=2)
+            write_json(drug_matrix_file, report_model["drug_matrix"])
             outputs["Drug Matrix JSON"] = str(drug_matrix_file)
             
             # 6. Clinical Conflict Report JSON
@@ -1915,25 +2299,21 @@ class PGxPipeline:
                     "links": profile["variant_linking"].get("links", {}),
                     "summary": profile["variant_linking"].get("summary", {})
                 }
-                with open(conflict_file, 'w', encoding='utf-8') as f:
-                    json.dump(conflict_data, f, indent=2)
+                write_json(conflict_file, conflict_data)
                 outputs["Conflict Report JSON"] = str(conflict_file)
             
-            # 7. Add gene-specific knowledge graphs from output/json directory
-            json_output_dir = Path("output/json")
-            if json_output_dir.exists():
-                for gene in gene_results.keys():
-                    gene_jsonld = json_output_dir / f"{gene}_knowledge_graph.jsonld"
-                    if gene_jsonld.exists():
-                        outputs[f"{gene} Knowledge Graph"] = str(gene_jsonld)
-            
-            # 8. Add gene-specific RDF graphs from output/rdf directory
-            rdf_output_dir = Path("output/rdf")
-            if rdf_output_dir.exists():
-                for gene in gene_results.keys():
-                    gene_ttl = rdf_output_dir / f"{gene}_knowledge_graph.ttl"
-                    if gene_ttl.exists():
-                        outputs[f"{gene} RDF Graph"] = str(gene_ttl)
+            # 7-8. Add gene-specific knowledge graphs and RDF graphs. Paths come from
+            # each gene's result, since cached genes were written by an earlier run.
+            ws = workspace or DEFAULT_WORKSPACE
+            for gene, gene_result in gene_results.items():
+                gene_outputs = (gene_result or {}).get("outputs") or {}
+                for key, label, default_path in (
+                    ("jsonld", "Knowledge Graph", ws.jsonld_file),
+                    ("rdf", "RDF Graph", ws.rdf_file),
+                ):
+                    path = Path(gene_outputs.get(key) or default_path(gene))
+                    if path.exists():
+                        outputs[f"{gene} {label}"] = str(path)
             
         except Exception as e:
             print(f"Error generating outputs: {e}")
@@ -2015,265 +2395,94 @@ class PGxPipeline:
     
     def _create_drug_matrix(self, variants: list) -> dict:
         """Create drug-gene interaction matrix"""
-        matrix = {}
-        
-        for variant in variants:
-            gene = variant.get("gene")
-            for drug_info in variant.get("drugs", []):
-                drug_name = drug_info.get("name")
-                if drug_name and gene:
-                    if drug_name not in matrix:
-                        matrix[drug_name] = {}
-                    
-                    matrix[drug_name][gene] = {
-                        "variant": variant.get("variant_id"),
-                        "recommendation": drug_info.get("recommendation"),
-                        "evidence_level": drug_info.get("evidence_level"),
-                        "clinical_significance": variant.get("clinical_significance")
-                    }
-        
-        return matrix
+        from phase5_export.report_model import drug_matrix
+        return drug_matrix(variants)
     
     def _generate_ttl_from_profile(self, profile: dict) -> str:
-        """Generate TTL (Turtle) content from comprehensive profile"""
-        try:
-            from rdflib import Graph, URIRef, Literal, Namespace
-            from rdflib.namespace import RDF, RDFS, XSD
-            
-            # Create graph
-            g = Graph()
-            
-            # Define namespaces
-            FOAF = Namespace("http://xmlns.com/foaf/0.1/")
-            SCHEMA = Namespace("http://schema.org/")
-            PGX = Namespace("http://pgx-kg.org/")
-            SNOMED = Namespace("http://snomed.info/id/")
-            
-            # Bind namespaces
-            g.bind("foaf", FOAF)
-            g.bind("schema", SCHEMA)
-            g.bind("pgx", PGX)
-            g.bind("snomed", SNOMED)
-            
+        """Generate TTL (Turtle) content from comprehensive profile
+        
+        Triples are emitted straight to Turtle by the streaming triple writer
+        rather than collected in an rdflib Graph and re-sorted on serialize.
+        """
+        from phase4_rdf.triple_writer import IRI, Lit, RDF_TYPE, serialize_triples
+        
+        # Define namespaces
+        FOAF = "http://xmlns.com/foaf/0.1/"
+        SCHEMA = "http://schema.org/"
+        PGX = "http://pgx-kg.org/"
+        SNOMED = "http://snomed.info/id/"
+        bindings = {"foaf": FOAF, "schema": SCHEMA, "pgx": PGX, "snomed": SNOMED}
+        
+        rdf_type = IRI(RDF_TYPE)
+        
+        # Add variants
+        def _extract_rsid(v: dict) -> str:
+            """Return canonical rsID from any known fields/xrefs; empty string if not found."""
+            try:
+                # direct fields
+                for key in ["rsid", "dbsnp_id", "dbsnp", "variant_id"]:
+                    val = str(v.get(key, "")).strip()
+                    if val.lower().startswith("rs"):
+                        return val
+                # xrefs list
+                for xr in (v.get("xrefs", []) or []):
+                    name = str(xr.get("name", "")).lower()
+                    vid = str(xr.get("id", "")).strip()
+                    if name in ("dbsnp", "rsid") and vid:
+                        return vid if vid.lower().startswith("rs") else f"rs{vid}"
+                # nested clinvar
+                cv = v.get("clinvar", {}) or {}
+                for k in ["rsid", "dbsnp", "dbsnp_id"]:
+                    val = str(cv.get(k, "")).strip()
+                    if val.lower().startswith("rs"):
+                        return val
+                # generic identifiers dict
+                ids = v.get("identifiers", {}) or {}
+                for _, val in (ids.items() if isinstance(ids, dict) else []):
+                    sval = str(val).strip()
+                    if sval.lower().startswith("rs"):
+                        return sval
+            except Exception:
+                return ""
+            return ""
+
+        def _triples():
             # Add patient
-            patient_uri = URIRef(profile["@id"])
-            g.add((patient_uri, RDF.type, FOAF.Person))
-            g.add((patient_uri, RDF.type, SCHEMA.Person))
-            g.add((patient_uri, SCHEMA.identifier, Literal(profile["identifier"])))
-            g.add((patient_uri, SCHEMA.name, Literal(profile["name"])))
-            g.add((patient_uri, SCHEMA.description, Literal(profile["description"])))
+            patient_uri = IRI(profile["@id"])
+            yield (patient_uri, rdf_type, IRI(FOAF + "Person"))
+            yield (patient_uri, rdf_type, IRI(SCHEMA + "Person"))
+            yield (patient_uri, IRI(SCHEMA + "identifier"), Lit(profile["identifier"]))
+            yield (patient_uri, IRI(SCHEMA + "name"), Lit(profile["name"]))
+            yield (patient_uri, IRI(SCHEMA + "description"), Lit(profile["description"]))
             
             # Add pharmacogenomics profile
             pgx_profile = profile.get("pharmacogenomics_profile", {})
-            if "genes_analyzed" in pgx_profile:
-                for gene in pgx_profile["genes_analyzed"]:
-                    gene_uri = URIRef(f"http://identifiers.org/ncbigene/{gene}")
-                    g.add((patient_uri, PGX.hasGene, gene_uri))
-                    g.add((gene_uri, RDF.type, PGX.Gene))
-                    g.add((gene_uri, SCHEMA.name, Literal(gene)))
-            
-            # Add variants
-            def _extract_rsid(v: dict) -> str:
-                """Return canonical rsID from any known fields/xrefs; empty string if not found."""
-                try:
-                    # direct fields
-                    for key in ["rsid", "dbsnp_id", "dbsnp", "variant_id"]:
-                        val = str(v.get(key, "")).strip()
-                        if val.lower().startswith("rs"):
-                            return val
-                    # xrefs list
-                    for xr in (v.get("xrefs", []) or []):
-                        name = str(xr.get("name", "")).lower()
-                        vid = str(xr.get("id", "")).strip()
-                        if name in ("dbsnp", "rsid") and vid:
-                            return vid if vid.lower().startswith("rs") else f"rs{vid}"
-                    # nested clinvar
-                    cv = v.get("clinvar", {}) or {}
-                    for k in ["rsid", "dbsnp", "dbsnp_id"]:
-                        val = str(cv.get(k, "")).strip()
-                        if val.lower().startswith("rs"):
-                            return val
-                    # generic identifiers dict
-                    ids = v.get("identifiers", {}) or {}
-                    for _, val in (ids.items() if isinstance(ids, dict) else []):
-                        sval = str(val).strip()
-                        if sval.lower().startswith("rs"):
-                            return sval
-                except Exception:
-                    return ""
-                return ""
-
+            genes = pgx_profile.get("genes_analyzed", [])
+            for gene in genes:
+                yield (patient_uri, IRI(PGX + "hasGene"), IRI(f"http://identifiers.org/ncbigene/{gene}"))
+            for gene in genes:
+                gene_uri = IRI(f"http://identifiers.org/ncbigene/{gene}")
+                yield (gene_uri, rdf_type, IRI(PGX + "Gene"))
+                yield (gene_uri, IRI(SCHEMA + "name"), Lit(gene))
+            
             for variant in profile.get("variants", []):
                 rsid = _extract_rsid(variant)
                 if not rsid:
                     # Skip non-rs variants to avoid inventing identifiers; upstream should supply rsIDs
                     continue
-                variant_uri = URIRef(f"http://identifiers.org/dbsnp/{rsid}")
-                g.add((variant_uri, RDF.type, PGX.Variant))
-                g.add((variant_uri, SCHEMA.identifier, Literal(variant.get("variant_id", ""))))
-                g.add((variant_uri, PGX.affectsGene, URIRef(f"http://identifiers.org/ncbigene/{variant.get('gene', '')}")))
-                g.add((patient_uri, PGX.hasVariant, variant_uri))
-            
-            return g.serialize(format="turtle")
-            
-        except ImportError:
-            return f"# TTL export requires rdflib library\n# Patient: {profile.get('identifier')}\n# Genes: {', '.join(profile.get('pharmacogenomics_profile', {}).get('genes_analyzed', []))}\n"
+                variant_uri = IRI(f"http://identifiers.org/dbsnp/{rsid}")
+                yield (variant_uri, rdf_type, IRI(PGX + "Variant"))
+                yield (variant_uri, IRI(SCHEMA + "identifier"), Lit(variant.get("variant_id", "")))
+                yield (variant_uri, IRI(PGX + "affectsGene"), IRI(f"http://identifiers.org/ncbigene/{variant.get('gene', '')}"))
+                yield (patient_uri, IRI(PGX + "hasVariant"), variant_uri)
+        
+        return serialize_triples(_triples(), "turtle", bindings)
     
     def _generate_html_report(self, profile: dict, gene_results: dict) -> str:
         """Generate HTML report from comprehensive profile"""
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Comprehensive Pharmacogenomics Report - {profile.get('identifier', 'Unknown')}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }}
-        .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
-        .section {{ margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-        .gene-result {{ background: #f8f9fa; margin: 10px 0; padding: 10px; border-radius: 3px; }}
-        .variant {{ background: #e9ecef; margin: 5px 0; padding: 8px; border-radius: 3px; }}
-        .conflict {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 10px; margin: 5px 0; border-radius: 3px; }}
-        .critical {{ background: #f8d7da; border: 1px solid #f5c6cb; }}
-        .warning {{ background: #fff3cd; border: 1px solid #ffeaa7; }}
-        .info {{ background: #d1ecf1; border: 1px solid #bee5eb; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 10px 0; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🧬 Comprehensive Pharmacogenomics Report</h1>
-        <p><strong>Patient ID:</strong> {profile.get('identifier', 'Unknown')}</p>
-        <p><strong>Generated:</strong> {profile.get('dateCreated', 'Unknown')}</p>
-        <p><strong>Description:</strong> {profile.get('description', 'No description')}</p>
-    </div>
-    
-    <div class="section">
-        <h2>📊 Analysis Summary</h2>
-        <p><strong>Genes Analyzed:</strong> {', '.join(profile.get('pharmacogenomics_profile', {}).get('genes_analyzed', []))}</p>
-        <p><strong>Total Variants:</strong> {profile.get('pharmacogenomics_profile', {}).get('total_variants', 0)}</p>
-        <p><strong>Affected Drugs:</strong> {len(profile.get('pharmacogenomics_profile', {}).get('affected_drugs', []))}</p>
-        <p><strong>Associated Diseases:</strong> {len(profile.get('pharmacogenomics_profile', {}).get('associated_diseases', []))}</p>
-    </div>
-    
-    <div class="section">
-        <h2>🧪 Gene Analysis Results</h2>
-"""
-        
-        # Add gene results
-        for gene, result in gene_results.items():
-            status = "✅ Success" if result.get("success", False) else "❌ Failed"
-            html += f"""
-        <div class="gene-result">
-            <h3>{gene} {status}</h3>
-            <p><strong>Variants Processed:</strong> {result.get('variants_processed', 0)}</p>
-            {f"<p><strong>Error:</strong> {result.get('error', '')}</p>" if not result.get('success', False) else ""}
-        </div>
-"""
-        
-        html += """
-    </div>
-    
-    <div class="section">
-        <h2>🧬 Variants</h2>
-"""
-        
-        # Add variants
-        for variant in profile.get("variants", []):
-            html += f"""
-        <div class="variant">
-            <h4>{variant.get('variant_id', 'Unknown')}</h4>
-            <p><strong>Gene:</strong> {variant.get('gene', 'Unknown')}</p>
-            <p><strong>Clinical Significance:</strong> {variant.get('clinical_significance', 'Unknown')}</p>
-            <p><strong>Drugs Affected:</strong> {len(variant.get('drugs', []))}</p>
-"""
-            # Ethnicity-aware population frequencies (if available)
-            freqs = variant.get('population_frequencies') or {}
-            patient_pf = variant.get('patient_population_frequency')
-            pop_sig = variant.get('population_significance')
-            context = variant.get('ethnicity_context')
-            if freqs or patient_pf is not None:
-                def fmt_pct(x):
-                    return f"{round(x*100, 1)}%" if isinstance(x, (int, float)) else "N/A"
-                html += """
-            <p><strong>Population Frequencies:</strong></p>
-            <ul>
-"""
-                for k in ["African", "Asian", "Caucasian/European", "Hispanic/Latino"]:
-                    v = freqs.get(k)
-                    html += f"<li>{k}: {fmt_pct(v)}</li>"
-                html += """
-            </ul>
-"""
-                if patient_pf is not None:
-                    html += f"<p><strong>Patient Ethnicity Frequency:</strong> {fmt_pct(patient_pf)} ({pop_sig or 'unknown'})</p>"
-                if context:
-                    html += f"<p><em>{context}</em></p>"
-            html += """
-        </div>
-"""
-        
-        # Ethnicity-aware medication adjustment hints (if available)
-        adjustments = profile.get("ethnicity_medication_adjustments", [])
-        if adjustments:
-            html += """
-    </div>
-    
-    <div class="section">
-        <h2>🌍 Ethnicity-aware Medication Considerations</h2>
-"""
-            for adj in adjustments:
-                html += f"""
-        <div class="variant">
-            <h4>{adj.get('drug', 'Medication')}</h4>
-            <p><strong>Gene:</strong> {adj.get('gene', 'Unknown')}</p>
-            <p><strong>Adjustment:</strong> {adj.get('adjustment', 'N/A')} ({adj.get('strength', 'info')})</p>
-            <p>{adj.get('rationale', '')}</p>
-        </div>
-"""
-        
-        # Add variant linking and conflicts if available
-        if "variant_linking" in profile:
-            linking = profile["variant_linking"]
-            html += """
-    </div>
-    
-    <div class="section">
-        <h2>⚠️ Variant Linking & Conflicts</h2>
-"""
-            
-            # Add conflicts
-            conflicts = linking.get("conflicts", [])
-            if conflicts:
-                html += f"<p><strong>Total Conflicts:</strong> {len(conflicts)}</p>"
-                for conflict in conflicts:
-                    severity_class = conflict.get("severity", "info").lower()
-                    html += f"""
-        <div class="conflict {severity_class}">
-            <h4>{conflict.get('title', 'Unknown Conflict')}</h4>
-            <p><strong>Severity:</strong> {conflict.get('severity', 'Unknown')}</p>
-            <p><strong>Description:</strong> {conflict.get('description', 'No description')}</p>
-        </div>
-"""
-            else:
-                html += "<p>No conflicts detected.</p>"
-        
-        html += f"""
-    </div>
-    
-    <div class="section">
-        <h2>📋 Data Sources</h2>
-        <p>{profile.get('dataSource', 'Unknown data sources')}</p>
-    </div>
-    
-</body>
-</html>
-"""
-        
-        return html
+        from phase5_export.report_model import build_comprehensive_report_model
+        from phase5_export.report_templates import render_report
+        return render_report("comprehensive_report.html.j2", build_comprehensive_report_model(profile, gene_results))
 
     def _assign_exact_rsid(self, variants: list) -> list:
         """Assign exact dbSNP rsID for each variant using allele tuple when available.
@@ -2309,6 +2518,87 @@ class PGxPipeline:
         return variants
 
 
+# Long-lived pipelines keyed by config file. Runs never use them directly:
+# each run gets its own session() over their shared phase modules and caches
+_warm_pipelines = {}
+_warm_pipelines_lock = threading.Lock()
+
+
+def get_warm_pipeline(config_path: str = "config.yaml") -> PGxPipeline:
+    """Return the process-wide pipeline for a config file, creating it on first use
+
+    The returned instance only holds the warm, shared resources (config,
+    phase modules with their API clients, tables and caches). Run on it with
+    ``with pipeline.session(event_queue=...) as run:`` so each run gets its
+    own pipeline with its own events, cancel_event and workspace. Sessions
+    from several users may overlap, so callers that can run concurrently
+    should pass ``workspace=pipeline.new_workspace(isolated=True)``.
+    """
+    key = str(get_config(config_path).config_path)
+    pipeline = _warm_pipelines.get(key)
+    if pipeline is None:
+        with _warm_pipelines_lock:
+            pipeline = _warm_pipelines.get(key)
+            if pipeline is None:
+                pipeline = PGxPipeline(config_path=config_path)
+                _warm_pipelines[key] = pipeline
+    return pipeline
+
+
+def load_patient_profiles(source: str) -> list:
+    """Load patient profiles for a cohort run
+
+    Args:
+        source: Directory of JSON profile files, a JSONL file (one profile per
+            line) or a JSON file holding one profile or a list of profiles
+
+    Returns:
+        List of (source label, profile) pairs
+    """
+    path = Path(source)
+    profiles = []
+    if path.is_dir():
+        for file in sorted(path.glob("*.json")):
+            with open(file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            items = data if isinstance(data, list) else [data]
+            for i, profile in enumerate(items):
+                profiles.append((file.name if len(items) == 1 else f"{file.name}[{i}]", profile))
+    elif path.suffix.lower() == ".jsonl":
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    profiles.append((f"{path.name}:{line_no}", json.loads(line)))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        items = data if isinstance(data, list) else [data]
+        profiles.extend((f"{path.name}[{i}]", profile) for i, profile in enumerate(items))
+    return profiles
+
+
+# Per-process state of cohort workers (set once by the pool initializer)
+_cohort_worker_state = {}
+
+
+def _init_cohort_worker(config_path: str, gene_symbols: list, gene_stage: dict):
+    """Process pool initializer: receive the shared gene stage once per worker"""
+    _cohort_worker_state.update(
+        config_path=config_path,
+        gene_symbols=gene_symbols,
+        gene_stage=gene_stage,
+    )
+
+
+def _run_cohort_task(index: int, source: str, patient_profile: dict, patient_root: str) -> dict:
+    """Process pool task: patient-dependent stages on the worker's warm pipeline"""
+    pipeline = get_warm_pipeline(_cohort_worker_state["config_path"])
+    return pipeline._run_cohort_member(
+        _cohort_worker_state["gene_symbols"], _cohort_worker_state["gene_stage"],
+        index, source, patient_profile, patient_root
+    )
+
+
 # Legacy class for backward compatibility
 class PGxKGPipeline(PGxPipeline):
     """Legacy class name for backward compatibility"""
@@ -2330,6 +2620,10 @@ Examples:
   python src/main.py --genes CYP2D6 CYP2C19 CYP3A4
   python src/main.py --genes CYP2D6 CYP2C19 CYP3A4 DPYD TPMT
   
+  # Cohort batch: many patient profiles against one panel
+  python src/main.py --genes CYP2D6 CYP2C19 --cohort profiles/
+  python src/main.py --genes CYP2D6 CYP2C19 --cohort patients.jsonl --workers 8
+  
   # Custom configuration
   python src/main.py --gene CYP3A4 --config custom_config.yaml
 
@@ -2353,6 +2647,17 @@ For more information, see README.md
         help="UniProt protein ID (optional, will be fetched if not provided)"
     )
     
+    parser.add_argument(
+        "--cohort",
+        help="Directory of patient profile JSON files or a JSONL file; runs every patient against the gene panel"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for cohort patient stages (default: CPU count)"
+    )
+    
     parser.add_argument(
         "--config",
         default="config.yaml",
@@ -2371,7 +2676,12 @@ For more information, see README.md
     # Run pipeline
     pipeline = PGxPipeline(config_path=args.config)
     
-    if args.genes:
+    if args.cohort:
+        # Cohort batch mode
+        manifest = pipeline.run_cohort(args.genes or [args.gene], load_patient_profiles(args.cohort),
+                                       workers=args.workers)
+        sys.exit(0 if manifest["failed"] == 0 else 1)
+    elif args.genes:
         # Multi-gene mode
         result = pipeline.run_multi_gene(args.genes)
     else:
@@ -0,0 +1,273 @@
+"""
+Gene Accession Index
+Local gene symbol -> reviewed human UniProt accession index
+
+The mapping changes rarely, so it is read from a bundled table
+(gene_accessions.tsv, next to this module) plus a local overlay
+(data/cache/gene_accessions.tsv) that records accessions resolved online.
+Genes missing from both are resolved for a whole panel with a single
+UniProt query, and the overlay can be rebuilt from a UniProt or HGNC export.
+"""
+import argparse
+import csv
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+BUNDLED_INDEX = Path(__file__).parent / "gene_accessions.tsv"
+LOCAL_INDEX = Path("data/cache/gene_accessions.tsv")
+
+UNIPROT_SEARCH_URL = "https://rest.uniprot.org/uniprotkb/stream"
+_FIELDS = ("gene_symbol", "accession", "entry_name")
+# Genes per UniProt query (keeps the query string well under URL limits)
+_BATCH_SIZE = 50
+
+
+class GeneAccessionIndex:
+    """Gene symbol -> UniProt accession lookups backed by local TSV tables"""
+
+    def __init__(self, bundled_path: Union[str, Path] = BUNDLED_INDEX,
+                 local_path: Union[str, Path] = LOCAL_INDEX):
+        """
+        Initialize gene accession index
+
+        Args:
+            bundled_path: Read-only table shipped with the package
+            local_path: Writable overlay (takes precedence over the bundled table)
+        """
+        self.bundled_path = Path(bundled_path)
+        self.local_path = Path(local_path)
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self.reload()
+
+    @staticmethod
+    def _read_table(path: Path) -> Dict[str, Dict[str, str]]:
+        """Read an index table keyed by upper-case gene symbol"""
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return {
+                row["gene_symbol"].upper(): row
+                for row in csv.DictReader(f, delimiter='\t')
+                if row.get("gene_symbol") and row.get("accession")
+            }
+
+    def reload(self):
+        """Re-read the bundled table and the local overlay"""
+        entries = self._read_table(self.bundled_path)
+        entries.update(self._read_table(self.local_path))
+        with self._lock:
+            self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, gene_symbol: str) -> bool:
+        return gene_symbol.upper() in self._entries
+
+    def get(self, gene_symbol: str) -> Optional[str]:
+        """
+        Look up a gene's accession without any network access
+
+        Args:
+            gene_symbol: HGNC gene symbol (case-insensitive)
+
+        Returns:
+            UniProt accession or None
+        """
+        entry = self._entries.get(gene_symbol.upper())
+        return entry["accession"] if entry else None
+
+    def add(self, entries: Iterable[Dict[str, str]]):
+        """
+        Record accessions in the local overlay
+
+        Args:
+            entries: Dicts with gene_symbol, accession and optional entry_name
+        """
+        with self._lock:
+            overlay = self._read_table(self.local_path)
+            for entry in entries:
+                row = {field: entry.get(field, "") for field in _FIELDS}
+                overlay[row["gene_symbol"].upper()] = row
+                self._entries[row["gene_symbol"].upper()] = row
+            self._write_table(self.local_path, overlay.values())
+
+    @staticmethod
+    def _write_table(path: Path, rows: Iterable[Dict[str, str]]):
+        """Write an index table (sorted by gene symbol)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".partial")
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=_FIELDS, delimiter='\t', extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(sorted(rows, key=lambda row: row["gene_symbol"].upper()))
+        tmp_path.replace(path)
+
+    def resolve(self, gene_symbols: Iterable[str], online: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Resolve accessions for a gene panel
+
+        Genes found locally never touch the network; the rest are resolved with
+        one UniProt query per batch of genes and recorded in the local overlay.
+
+        Args:
+            gene_symbols: Gene symbols
+            online: Query UniProt for genes missing from the index
+
+        Returns:
+            Mapping of gene symbol -> accession (None if unresolved)
+        """
+        gene_symbols = list(dict.fromkeys(gene_symbols))
+        resolved = {gene: self.get(gene) for gene in gene_symbols}
+        missing = [gene for gene, accession in resolved.items() if accession is None]
+
+        if missing and online:
+            found = []
+            for i in range(0, len(missing), _BATCH_SIZE):
+                found.extend(search_uniprot(missing[i:i + _BATCH_SIZE]))
+            if found:
+                self.add(found)
+                for entry in found:
+                    resolved[entry["gene_symbol"]] = entry["accession"]
+
+        return resolved
+
+    def refresh(self, gene_symbols: Optional[Iterable[str]] = None) -> int:
+        """
+        Re-resolve genes online and update the local overlay
+
+        Args:
+            gene_symbols: Genes to refresh (default: every indexed gene)
+
+        Returns:
+            Number of genes refreshed
+        """
+        gene_symbols = list(gene_symbols) if gene_symbols is not None else sorted(self._entries)
+        found = []
+        for i in range(0, len(gene_symbols), _BATCH_SIZE):
+            found.extend(search_uniprot(gene_symbols[i:i + _BATCH_SIZE]))
+        if found:
+            self.add(found)
+        return len(found)
+
+    def import_export(self, export_path: Union[str, Path]) -> int:
+        """
+        Load the local overlay from a UniProt or HGNC export
+
+        Accepts a UniProt TSV download (columns "Entry", "Entry Name",
+        "Gene Names (primary)") or the HGNC complete set ("symbol", "uniprot_ids").
+
+        Args:
+            export_path: Path to the TSV export
+
+        Returns:
+            Number of genes imported
+        """
+        entries = []
+        with open(export_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f, delimiter='\t'):
+                if "symbol" in row and "uniprot_ids" in row:
+                    # HGNC: pipe-separated accessions, the first is the reviewed entry
+                    accession = (row.get("uniprot_ids") or "").split("|")[0].strip()
+                    symbol = (row.get("symbol") or "").strip()
+                    entry_name = ""
+                else:
+                    accession = (row.get("Entry") or "").strip()
+                    symbol = (row.get("Gene Names (primary)") or "").split(";")[0].strip()
+                    entry_name = (row.get("Entry Name") or "").strip()
+                if symbol and accession:
+                    entries.append({"gene_symbol": symbol, "accession": accession, "entry_name": entry_name})
+        if entries:
+            self.add(entries)
+        return len(entries)
+
+
+def search_uniprot(gene_symbols: List[str], timeout: int = 30) -> List[Dict[str, str]]:
+    """
+    Resolve several genes with one UniProt query (reviewed human entries)
+
+    Primary gene names are matched first; synonyms (e.g. HER2 for ERBB2)
+    only resolve genes without a primary-name match.
+
+    Args:
+        gene_symbols: Gene symbols
+        timeout: Request timeout in seconds
+
+    Returns:
+        Index entries for the genes that were found
+    """
+    if not gene_symbols:
+        return []
+
+    import requests
+
+    genes_query = " OR ".join(f"(gene_exact:{gene})" for gene in gene_symbols)
+    params = {
+        "fields": "accession,id,gene_primary,gene_synonym",
+        "format": "tsv",
+        "query": f"({genes_query}) AND (organism_id:9606) AND (reviewed:true)"
+    }
+    try:
+        response = requests.get(UNIPROT_SEARCH_URL, params=params, timeout=timeout)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"   Error resolving UniProt IDs for {', '.join(gene_symbols)}: {e}")
+        return []
+
+    wanted = {gene.upper(): gene for gene in gene_symbols}
+    primary, synonym = {}, {}
+    for line in response.text.strip().split('\n')[1:]:
+        columns = line.split('\t')
+        if len(columns) < 3:
+            continue
+        accession, entry_name, gene_primary = columns[0], columns[1], columns[2]
+        entry = {"accession": accession, "entry_name": entry_name}
+        gene = wanted.get(gene_primary.strip().upper())
+        if gene and gene not in primary:
+            primary[gene] = entry
+        for alias in (columns[3].split() if len(columns) > 3 else []):
+            gene = wanted.get(alias.upper())
+            if gene and gene not in synonym:
+                synonym[gene] = entry
+
+    found = []
+    for gene in gene_symbols:
+        entry = primary.get(gene) or synonym.get(gene)
+        if entry:
+            found.append({"gene_symbol": gene, **entry})
+    return found
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_gene_index() -> GeneAccessionIndex:
+    """Get the process-wide gene accession index (loaded on first use)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = GeneAccessionIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local gene -> UniProt accession index")
+    parser.add_argument("--refresh", nargs="*", metavar="GENE",
+                        help="Re-resolve genes online (all indexed genes when none are given)")
+    parser.add_argument("--import-export", metavar="TSV",
+                        help="Load a UniProt or HGNC TSV export into the local index")
+    parser.add_argument("--lookup", nargs="+", metavar="GENE", help="Resolve genes and print their accessions")
+    args = parser.parse_args()
+
+    index = get_gene_index()
+    if args.import_export:
+        print(f"Imported {index.import_export(args.import_export)} genes into {index.local_path}")
+    if args.refresh is not None:
+        print(f"Refreshed {index.refresh(args.refresh or None)} genes in {index.local_path}")
+    if args.lookup:
+        for gene, accession in index.resolve(args.lookup).items():
+            print(f"{gene}\t{accession or 'not found'}")
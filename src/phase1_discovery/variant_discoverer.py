@@ -2,15 +2,68 @@
 Variant Discovery Module
 Discovers clinically significant variants from EMBL-EBI Proteins API
 """
-import json
+import heapq
 import uuid
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.api_client import APIClient
+from utils.event_bus import PipelineEvent
+from utils.json_writer import loads, write_json
+from utils.run_workspace import RunWorkspace
+from phase1_discovery.gene_index import get_gene_index
+
+# ijson is optional - parses the variation document incrementally so only
+# clinically significant features are ever held in memory
+try:
+    import ijson
+    _ijson_available = True
+except ImportError:
+    ijson = None
+    _ijson_available = False
+
+# Cache key tag for the projected variation document (bump if the projection changes)
+CLINICAL_PROJECTION = "clinical_features_v1"
+
+
+def iter_variation_features(stream: BinaryIO) -> Iterator[Dict]:
+    """
+    Yield the features of an EBI Proteins variation document one at a time
+
+    Args:
+        stream: Binary file-like object holding the JSON document
+
+    Yields:
+        Feature dictionaries
+    """
+    if _ijson_available:
+        yield from ijson.items(stream, "features.item", use_float=True)
+    else:
+        yield from loads(stream.read()).get("features", [])
+
+
+def project_clinical_variants(stream: BinaryIO, accession: Optional[str] = None) -> Dict:
+    """
+    Read a variation document keeping only clinically significant features
+
+    Args:
+        stream: Binary file-like object holding the JSON document
+        accession: UniProt accession recorded in the projection
+
+    Returns:
+        Dictionary with ``accession``, the clinical ``features`` and
+        ``totalFeatures`` (feature count before filtering)
+    """
+    features = []
+    total = 0
+    for feature in iter_variation_features(stream):
+        total += 1
+        if "clinicalSignificances" in feature:
+            features.append(feature)
+    return {"accession": accession, "features": features, "totalFeatures": total}
 
 
 class ProteinFetcher:
@@ -33,6 +86,13 @@ class ProteinFetcher:
         """
         print(f"Fetching UniProt ID for human gene {gene_symbol}...")
         
+        # Local index first - symbol -> accession mappings change rarely
+        if organism.lower() == "human":
+            accession = get_gene_index().get(gene_symbol)
+            if accession:
+                print(f"   Found UniProt ID: {accession} (local index)")
+                return accession
+        
         # Use taxonomy ID for human (9606) to ensure we only get human proteins
         # This is more precise than text search for "human"
         organism_query = "organism_id:9606" if organism.lower() == "human" else f"organism_name:{organism}"
@@ -62,6 +122,10 @@ class ProteinFetcher:
                     # Double-check it's human data
                     if organism.lower() == "human" and "homo sapiens" not in organism_name.lower():
                         print(f"   Warning: Expected human protein but got {organism_name}")
+                    elif organism.lower() == "human":
+                        get_gene_index().add([{
+                            "gene_symbol": gene_symbol, "accession": accession, "entry_name": data_line[2]
+                        }])
                     
                     return accession
                 else:
@@ -73,44 +137,107 @@ class ProteinFetcher:
             print(f"   Error fetching UniProt ID: {e}")
         
         return None
+    
+    def get_protein_ids(self, gene_symbols: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve UniProt accessions for a whole human gene panel
+        
+        Indexed genes are answered locally; the rest are resolved with a
+        single batched UniProt query and added to the local index.
+        
+        Args:
+            gene_symbols: Gene symbols
+            
+        Returns:
+            Mapping of gene symbol -> accession (None if not found)
+        """
+        resolved = get_gene_index().resolve(gene_symbols)
+        found = sum(1 for accession in resolved.values() if accession)
+        print(f"Resolved UniProt IDs for {found}/{len(resolved)} genes")
+        return resolved
 
 
 class VariantDiscoverer:
     """Discovers and processes genetic variants from EMBL-EBI"""
     
-    def __init__(self, output_dir: str = "data/phase1"):
+    def __init__(self, output_dir: str = "data/phase1", max_variants: int = 50):
+        """
+        Initialize variant discoverer
+        
+        Args:
+            output_dir: Default output directory (when no workspace is given)
+            max_variants: Variants kept per clinical significance category
+                (output.max_variants_per_gene)
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_variants = max_variants
         self.base_url = "https://www.ebi.ac.uk/proteins/api/variation"
         self.client = APIClient(self.base_url, rate_limit=10)
     
     def fetch_variants(self, protein_id: str) -> Optional[Dict]:
         """
-        Download raw variant data for a protein
-        
+        Download variant data for a protein, keeping only clinical features
+
+        The variation document (tens of thousands of features for large genes)
+        is parsed as it downloads; features without clinical significances are
+        dropped on the fly and only the projected document is cached.
+
         Args:
             protein_id: UniProt protein accession ID
             
         Returns:
-            Raw variant data or None
+            Variation document restricted to clinically significant features
+            (``totalFeatures`` holds the unfiltered count), or None
         """
         print(f"Downloading variants for {protein_id}...")
         
-        endpoint = f"{protein_id}?format=json"
-        data = self.client.get(endpoint)
+        data = self.client.get_projected(
+            protein_id, lambda stream: project_clinical_variants(stream, protein_id), CLINICAL_PROJECTION,
+            params={"format": "json"}
+        )
         
         if data:
-            print(f"   Downloaded {len(data.get('features', []))} total variants")
+            print(f"   Downloaded {data.get('totalFeatures', len(data.get('features', [])))} total variants "
+                  f"({len(data.get('features', []))} with clinical significance)")
         
         return data
     
+    @staticmethod
+    def _score_variant(variant: Dict, prefer_population_data: bool = True, prefer_evidence: bool = True) -> int:
+        """Priority score of a variant: population frequency data and evidence citations rank first"""
+        score = 0
+        
+        # Prefer variants with embedded population frequency data from UniProt
+        if prefer_population_data:
+            pop_freqs = variant.get("populationFrequencies", [])
+            if pop_freqs:
+                # Has population data in UniProt - high priority
+                score += 100
+                # Bonus for having multiple sources (ClinVar + gnomAD)
+                sources = set(p.get("source", "") for p in pop_freqs if p.get("frequency") is not None)
+                if len(sources) > 1:
+                    score += 20
+        
+        # Prefer variants with evidence citations (PubMed, etc.)
+        if prefer_evidence:
+            evidences = variant.get("evidences", [])
+            if evidences:
+                score += 50
+                # Bonus for PubMed citations (clinical/literature evidence)
+                pubmed_count = sum(1 for e in evidences if e.get("source", {}).get("name") == "pubmed")
+                if pubmed_count > 0:
+                    score += 30
+        
+        return score
+    
     def filter_clinical_variants(self, raw_data: Dict, prefer_population_data: bool = True, prefer_evidence: bool = True) -> List[Dict]:
         """
         Keep only clinically significant variants
         Optionally prioritizes variants with population frequency data and evidence citations
         
         Args:
-            raw_data: Raw variant data from EMBL-EBI
+            raw_data: Variant data from EMBL-EBI (full or as returned by fetch_variants)
             prefer_population_data: If True, prioritize variants with populationFrequencies in UniProt data
             prefer_evidence: If True, prioritize variants with evidence citations (PubMed, etc.)
             
@@ -124,36 +251,11 @@ class VariantDiscoverer:
         
         # Score variants: higher score = better for population frequency data
         if prefer_population_data or prefer_evidence:
-            scored_variants = []
-            for variant in variants:
-                score = 0
-                
-                # Prefer variants with embedded population frequency data from UniProt
-                if prefer_population_data:
-                    pop_freqs = variant.get("populationFrequencies", [])
-                    if pop_freqs:
-                        # Has population data in UniProt - high priority
-                        score += 100
-                        # Bonus for having multiple sources (ClinVar + gnomAD)
-                        sources = set(p.get("source", "") for p in pop_freqs if p.get("frequency") is not None)
-                        if len(sources) > 1:
-                            score += 20
-                
-                # Prefer variants with evidence citations (PubMed, etc.)
-                if prefer_evidence:
-                    evidences = variant.get("evidences", [])
-                    if evidences:
-                        score += 50
-                        # Bonus for PubMed citations (clinical/literature evidence)
-                        pubmed_count = sum(1 for e in evidences if e.get("source", {}).get("name") == "pubmed")
-                        if pubmed_count > 0:
-                            score += 30
-                
-                scored_variants.append((score, variant))
-            
-            # Sort by score (descending) - variants with population data and evidence first
-            scored_variants.sort(key=lambda x: x[0], reverse=True)
-            variants = [v for _, v in scored_variants]
+            # Stable sort by score (descending) - variants with population data and evidence first
+            variants.sort(
+                key=lambda v: self._score_variant(v, prefer_population_data, prefer_evidence),
+                reverse=True
+            )
             
             if prefer_population_data:
                 has_pop = sum(1 for v in variants if v.get("populationFrequencies"))
@@ -165,6 +267,81 @@ class VariantDiscoverer:
         print(f"   Filtered to {len(variants)} clinically significant variants")
         return variants
     
+    def select_clinical_variants(self, raw_data: Dict, top_k: Optional[int] = None,
+                                 prefer_population_data: bool = True, prefer_evidence: bool = True,
+                                 event_bus=None) -> Tuple[Dict[str, List], Dict]:
+        """
+        Filter, score and categorize variants in one pass, keeping only the
+        top-k variants of each clinical significance category
+        
+        Equivalent to filter_clinical_variants + categorize_by_significance
+        truncated to top_k per category, without sorting every feature: each
+        category keeps a bounded min-heap keyed by (score, document order).
+        
+        Args:
+            raw_data: Variant data from EMBL-EBI (full or as returned by fetch_variants)
+            top_k: Variants kept per category (default: max_variants)
+            prefer_population_data: Rank variants with populationFrequencies first
+            prefer_evidence: Rank variants with evidence citations next
+            event_bus: Optional EventBus receiving the per-stage counts
+            
+        Returns:
+            Tuple of (categories mapping significance type -> variants, best
+            first; counts dictionary)
+        """
+        top_k = top_k or self.max_variants
+        heaps: Dict[str, List] = {}
+        category_totals: Dict[str, int] = {}
+        clinical = with_population = with_evidence = 0
+        
+        features = raw_data.get("features", [])
+        for index, variant in enumerate(features):
+            if "clinicalSignificances" not in variant:
+                continue
+            clinical += 1
+            if variant.get("populationFrequencies"):
+                with_population += 1
+            if variant.get("evidences"):
+                with_evidence += 1
+            
+            # Negative index: equal scores keep document order (as the stable sort did)
+            entry = (self._score_variant(variant, prefer_population_data, prefer_evidence), -index, variant)
+            sig_types = dict.fromkeys(sig["type"] for sig in variant["clinicalSignificances"])
+            for sig_type in sig_types:
+                category_totals[sig_type] = category_totals.get(sig_type, 0) + 1
+                heap = heaps.setdefault(sig_type, [])
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+        
+        categories = {
+            sig_type: [variant for _, _, variant in sorted(heap, key=lambda e: e[:2], reverse=True)]
+            for sig_type, heap in heaps.items()
+        }
+        counts = {
+            "total_features": raw_data.get("totalFeatures", len(features)),
+            "clinical": clinical,
+            "with_population_data": with_population,
+            "with_evidence": with_evidence,
+            "categories": category_totals,
+            "retained_per_category": top_k,
+        }
+        self._emit(event_bus, "variant_selection",
+                   f"{clinical} clinically significant variants in {len(categories)} categories "
+                   f"({with_population} with population data, {with_evidence} with evidence)",
+                   counts)
+        return categories, counts
+    
+    @staticmethod
+    def _emit(event_bus, substage: str, message: str, payload: Optional[Dict] = None):
+        """Report a phase 1 measurement through the pipeline's event bus (printed when standalone)"""
+        if event_bus is None:
+            print(f"   {message}")
+            return
+        event_bus.emit(PipelineEvent(stage="lab_prep", substage=substage, level="info",
+                                     message=message, payload=payload))
+    
     def categorize_by_significance(self, variants: List[Dict]) -> Dict[str, List]:
         """
         Group variants by clinical significance type
@@ -229,7 +406,8 @@ class VariantDiscoverer:
         Select a realistic diplotype (2 alleles) from available variants
         
         Args:
-            categorized_variants: Variants grouped by clinical significance
+            categorized_variants: Variants grouped by clinical significance, each
+                list ranked best-first (as returned by select_clinical_variants)
             
         Returns:
             List of 2 variants representing a realistic diplotype
@@ -251,18 +429,7 @@ class VariantDiscoverer:
             if category in categorized_variants and categorized_variants[category]:
                 variants = categorized_variants[category]
                 
-                # Within each category, prefer variants with population frequency data and evidence
-                # Sort variants by: 1) has populationFrequencies, 2) has evidences, 3) original order
-                def variant_priority(v):
-                    score = 0
-                    if v.get("populationFrequencies"):
-                        score += 10  # Prioritize variants with embedded population data
-                    if v.get("evidences"):
-                        score += 5   # Then prefer variants with evidence citations
-                    return -score  # Negative for descending sort
-                
-                variants = sorted(variants, key=variant_priority)
-                
+                # Category lists are ranked best-first (population frequency data, then evidence)
                 # Select the first (highest priority) variant from this category
                 if len(selected_variants) < 2:
                     variant = variants[0].copy()  # Make a copy to preserve evidences
@@ -486,13 +653,16 @@ class VariantDiscoverer:
         
         return turtle_content
     
-    def run_pipeline(self, gene_symbol: str, protein_id: Optional[str] = None) -> Dict:
+    def run_pipeline(self, gene_symbol: str, protein_id: Optional[str] = None,
+                     workspace: Optional[RunWorkspace] = None, event_bus=None) -> Dict:
         """
         Execute full variant discovery pipeline
         
         Args:
             gene_symbol: Gene symbol (e.g., CYP2D6)
             protein_id: UniProt ID (optional, will be fetched if not provided)
+            workspace: Run workspace for outputs (defaults to output_dir)
+            event_bus: Optional EventBus receiving per-stage variant counts
             
         Returns:
             Dictionary with discovery results
@@ -513,14 +683,11 @@ class VariantDiscoverer:
         if not raw_data:
             raise ValueError(f"Failed to fetch variants for {protein_id}")
         
-        # Filter clinical variants
-        clinical_variants = self.filter_clinical_variants(raw_data)
-        if not clinical_variants:
+        # Filter, score and categorize in one pass (top-k per category)
+        categorized, counts = self.select_clinical_variants(raw_data, event_bus=event_bus)
+        if not counts["clinical"]:
             print(f"   WARNING: No clinically significant variants found")
         
-        # Categorize
-        categorized = self.categorize_by_significance(clinical_variants)
-        
         # Extract evidence
         pubmed_data = self.extract_pubmed_evidence(categorized)
         
@@ -568,7 +735,7 @@ class VariantDiscoverer:
         output = {
             "gene_symbol": gene_symbol,
             "protein_id": protein_id,
-            "total_variants": len(clinical_variants),
+            "total_variants": counts["clinical"],
             "selected_diplotype": {
                 "variants": selected_variants,
                 "count": len(selected_variants),
@@ -577,7 +744,8 @@ class VariantDiscoverer:
             "variant_catalog": {
                 "categories": categorized,
                 "pubmed_evidence": pubmed_data,
-                "note": "Complete catalog of all discovered variants (for reference only)"
+                "category_counts": counts["categories"],
+                "note": "Top-ranked variants per significance category (for reference only)"
             },
             "raw_data": raw_data,
             "timestamp": datetime.now().isoformat()
@@ -585,18 +753,16 @@ class VariantDiscoverer:
         
         # Generate RDF Turtle representation (following your example pattern)
         print(f"   Generating RDF Turtle representation...")
-        turtle_file = self.output_dir / f"{gene_symbol}_virtual_patient.ttl"
+        output_dir = workspace.phase1_dir if workspace else self.output_dir
+        turtle_file = output_dir / f"{gene_symbol}_virtual_patient.ttl"
         turtle_content = self.create_patient_rdf_turtle(virtual_patient, str(turtle_file))
         
         # Save outputs
-        variants_file = self.output_dir / f"{gene_symbol}_variants.json"
-        patient_file = self.output_dir / f"{gene_symbol}_virtual_patient.json"
-        
-        with open(variants_file, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2)
+        variants_file = output_dir / f"{gene_symbol}_variants.json"
+        patient_file = output_dir / f"{gene_symbol}_virtual_patient.json"
         
-        with open(patient_file, 'w', encoding='utf-8') as f:
-            json.dump(virtual_patient, f, indent=2)
+        write_json(variants_file, output)
+        write_json(patient_file, virtual_patient)
         
         print(f"\nPhase 1 Complete!")
         print(f"   Variants saved: {variants_file}")
@@ -11,6 +11,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from phase2_clinical.clinvar_client import ClinVarClient
 from phase2_clinical.pharmgkb_client import PharmGKBClient
 from phase2_clinical.bioportal_client import BioPortalClient
+from utils.json_writer import write_json_streaming
+from utils.run_workspace import DEFAULT_WORKSPACE, RunWorkspace
 
 
 class ClinicalValidator:
@@ -149,13 +151,15 @@ class ClinicalValidator:
         
         return None
     
-    def run_pipeline(self, gene_symbol: str, phase1_file: str = None) -> Dict:
+    def run_pipeline(self, gene_symbol: str, phase1_file: str = None,
+                     workspace: Optional[RunWorkspace] = None) -> Dict:
         """
         Execute Phase 2: Clinical validation pipeline
         
         Args:
             gene_symbol: Gene symbol
             phase1_file: Path to Phase 1 output file
+            workspace: Run workspace for inputs and outputs (defaults to data/)
             
         Returns:
             Enriched clinical data
@@ -166,7 +170,7 @@ class ClinicalValidator:
         
         # Load Phase 1 data
         if not phase1_file:
-            phase1_file = f"data/phase1/{gene_symbol}_variants.json"
+            phase1_file = str((workspace or DEFAULT_WORKSPACE).variants_file(gene_symbol))
         
         phase1_path = Path(phase1_file)
         if not phase1_path.exists():
@@ -235,9 +239,9 @@ class ClinicalValidator:
         }
         
         # Save output
-        output_file = self.output_dir / f"{gene_symbol}_clinical.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2)
+        output_dir = workspace.phase2_dir if workspace else self.output_dir
+        output_file = output_dir / f"{gene_symbol}_clinical.json"
+        write_json_streaming(output_file, output, {"variants": enriched_variants})
         
         print(f"\nPhase 2 Complete!")
         print(f"   Enriched variants saved: {output_file}")
@@ -248,9 +252,9 @@ class ClinicalValidator:
 
 if __name__ == "__main__":
     # Test the module
-    from utils.config import Config
+    from utils.config import get_config
     
-    config = Config()
+    config = get_config()
     validator = ClinicalValidator(
         ncbi_email=config.ncbi_email,
         ncbi_api_key=config.ncbi_api_key,
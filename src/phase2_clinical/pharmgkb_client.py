@@ -3,13 +3,13 @@ PharmGKB Client
 Queries PharmGKB for pharmacogenomic annotations and drug-gene interactions
 """
 import sys
-import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from typing import Dict, Optional, List
 from utils.api_client import APIClient
 from utils.evidence_levels import EvidenceLevelInterpreter
+from phase2_clinical.star_alleles import get_allele_table, not_determined
 
 
 class PharmGKBClient:
@@ -21,6 +21,8 @@ class PharmGKBClient:
         # Use 1.5 requests per second to be conservative with PharmGKB rate limits
         self.client = APIClient(self.base_url, rate_limit=1.5)
         self.evidence_interpreter = EvidenceLevelInterpreter()
+        # Compiled CPIC allele-definition/function/phenotype tables (shared per process)
+        self.allele_table = get_allele_table()
     
     def get_gene_annotations(self, gene_symbol: str) -> List[Dict]:
         """
@@ -125,99 +127,31 @@ class PharmGKBClient:
             }
         """
         if not variants or len(variants) == 0:
-            return {
-                "phenotype": "Not determined",
-                "diplotype": "Unknown/Unknown",
-                "functionality": "Unknown/Unknown",
-                "source": "No variants found"
-            }
+            return not_determined()
         
-        # Get PharmGKB haplotypes to map variants to star alleles
-        haplotypes = self.get_haplotypes(gene_symbol)
+        # Star alleles from the allele-definition table (annotation text as fallback)
+        star_alleles = self.allele_table.star_alleles_for_variants(gene_symbol, variants)
+        result = self.allele_table.call(gene_symbol, star_alleles[0], star_alleles[1])
+        result["source"] = "PharmGKB/CPIC"
+        return result
+    
+    def determine_cohort_phenotypes(self, cohort: Dict[str, Dict[str, List[Dict]]]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Determine metabolizer phenotypes for every gene of every patient at once
         
-        # Try to extract star allele names from PharmGKB data or variant annotations
-        star_alleles = []
-        for variant in variants[:2]:  # Only use first 2 for diplotype
-            # Check PharmGKB data for star allele assignment
-            pharmgkb_data = variant.get("pharmgkb", {})
-            annotations = pharmgkb_data.get("annotations", [])
-            
-            star_allele = None
-            # Look for star allele mentions in phenotypes or drug recommendations
-            for ann in annotations:
-                phenotype_text = ""
-                for allele_pheno in ann.get("allelePhenotypes", []):
-                    phenotype_text += " " + allele_pheno.get("phenotype", "")
-                
-                # Search for star allele pattern (e.g., CYP2C19*17, *2, *1/*2)
-                star_pattern = rf'{gene_symbol}\*(\d+[A-Z]?)|\*(\d+[A-Z]?)'
-                matches = re.findall(star_pattern, phenotype_text, re.IGNORECASE)
-                if matches:
-                    # Extract star allele number
-                    for match in matches:
-                        star_num = match[0] or match[1]
-                        if star_num:
-                            star_allele = f"*{star_num}"
-                            break
-                
-                if star_allele:
-                    break
-            
-            if not star_allele:
-                # Try to match based on variant rsID to known star alleles
-                rsid = None
-                for xref in variant.get("xrefs", []):
-                    if xref.get("name") == "dbSNP":
-                        rsid = xref.get("id")
-                        break
-                
-                # Map common variants to star alleles (simplified - should use PharmGKB API)
-                star_allele = self._map_variant_to_star_allele(gene_symbol, rsid, variant)
+        Args:
+            cohort: patient ID -> gene symbol -> diplotype variants
             
-            star_alleles.append(star_allele or "*1")  # Default to *1 (wild-type)
-        
-        # If only one variant, assume homozygous
-        if len(star_alleles) == 1:
-            star_alleles.append(star_alleles[0])
-        
-        diplotype = f"{star_alleles[0]}/{star_alleles[1]}"
-        
-        # Determine functionality and phenotype based on star alleles
-        functionality = self._get_allele_functionality(gene_symbol, star_alleles[0], star_alleles[1])
-        phenotype = self._determine_phenotype_from_functionality(functionality)
-        
-        return {
-            "phenotype": phenotype,
-            "diplotype": diplotype,
-            "functionality": functionality,
-            "star_alleles": star_alleles,
-            "source": "PharmGKB/CPIC"
-        }
+        Returns:
+            patient ID -> gene symbol -> phenotype dictionary (as determine_metabolizer_phenotype)
+        """
+        return self.allele_table.call_cohort(cohort)
     
     def _map_variant_to_star_allele(self, gene_symbol: str, rsid: str, variant: Dict) -> Optional[str]:
         """
-        Map a variant rsID to a star allele (simplified - should query PharmGKB API)
-        This is a basic implementation - ideally should use PharmGKB variant-to-haplotype mapping
+        Map a variant rsID to a star allele using the CPIC allele-definition table
         """
-        # Common rsID to star allele mappings (simplified - would need comprehensive database)
-        # This is a placeholder - full implementation should query PharmGKB
-        known_mappings = {
-            "CYP2C19": {
-                "rs4244285": "*2",  # CYP2C19*2
-                "rs4986893": "*3",   # CYP2C19*3
-                "rs12248560": "*17", # CYP2C19*17
-            },
-            "CYP2D6": {
-                "rs1065852": "*10",  # CYP2D6*10
-                "rs3892097": "*4",   # CYP2D6*4
-                "rs1135840": "*2",   # CYP2D6*2
-            }
-        }
-        
-        if gene_symbol in known_mappings and rsid in known_mappings[gene_symbol]:
-            return known_mappings[gene_symbol][rsid]
-        
-        return None
+        return self.allele_table.star_allele_for_rsid(gene_symbol, rsid)
     
     def _get_allele_functionality(self, gene_symbol: str, allele1: str, allele2: str) -> str:
         """
@@ -231,35 +165,15 @@ class PharmGKBClient:
         Returns:
             Functionality string like "Normal/Decreased" or "Normal/Normal"
         """
-        # Map star alleles to functionality (CPIC/PharmGKB standard)
-        # This is simplified - full implementation would query PharmGKB API
-        functionality_map = {
-            "CYP2C19": {
-                "*1": "Normal",
-                "*2": "Decreased",
-                "*3": "Decreased",
-                "*17": "Increased",
-            },
-            "CYP2D6": {
-                "*1": "Normal",
-                "*2": "Normal",
-                "*4": "Decreased",
-                "*10": "Decreased",
-            }
-        }
-        
-        func_map = functionality_map.get(gene_symbol, {})
-        func1 = func_map.get(allele1, "Unknown")
-        func2 = func_map.get(allele2, "Unknown")
-        
-        return f"{func1}/{func2}"
+        return f"{self.allele_table.function(gene_symbol, allele1)}/{self.allele_table.function(gene_symbol, allele2)}"
     
-    def _determine_phenotype_from_functionality(self, functionality: str) -> str:
+    def _determine_phenotype_from_functionality(self, functionality: str, gene_symbol: str = None) -> str:
         """
         Determine metabolizer phenotype from functionality
         
         Args:
             functionality: String like "Normal/Normal" or "Normal/Decreased"
+            gene_symbol: Optional gene symbol (gene-specific CPIC rules; default rules otherwise)
             
         Returns:
             Phenotype string like "Normal Metabolizer" or "Intermediate Metabolizer"
@@ -267,31 +181,7 @@ class PharmGKBClient:
         func_parts = functionality.split("/")
         if len(func_parts) != 2:
             return "Not determined"
-        
-        func1, func2 = func_parts
-        
-        # Both alleles have same functionality
-        if func1 == func2:
-            if func1 == "Normal":
-                return "Normal Metabolizer"
-            elif func1 == "Decreased":
-                return "Poor Metabolizer"
-            elif func1 == "Increased":
-                return "Ultrarapid Metabolizer"
-        
-        # Mixed functionality
-        functions = [func1, func2]
-        if "Increased" in functions:
-            return "Ultrarapid Metabolizer"
-        elif "Decreased" in functions or "No function" in functions:
-            if "Normal" in functions:
-                return "Intermediate Metabolizer"
-            else:
-                return "Poor Metabolizer"
-        elif "Normal" in functions:
-            return "Normal Metabolizer"
-        
-        return "Unknown Metabolizer"
+        return self.allele_table.phenotype(gene_symbol or "", func_parts[0], func_parts[1])
     
     def extract_drugs_from_annotations(self, annotations: List[Dict]) -> List[Dict]:
         """
@@ -0,0 +1,387 @@
+"""
+Star Allele Tables
+Data-driven star-allele calling and diplotype -> phenotype lookup
+
+Allele definitions (defining rsID -> star allele), allele functions and
+activity values, diplotype phenotypes and activity-score phenotypes are read
+from CPIC-style TSV tables and compiled into integer-coded arrays:
+
+- every (gene, allele) pair gets a global allele code,
+- ``allele_function[allele_code]`` is the allele's function code,
+- ``allele_activity[allele_code]`` is its activity value in quarters (-1 if none),
+- ``phenotype_table[gene_code, function_1, function_2]`` is a phenotype code,
+- ``activity_table[gene_code, score]`` is a phenotype code for an activity
+  score in quarters (0 = the gene has no rule for it).
+
+Genes CPIC classifies by activity score (CYP2C9, CYP2D6) are called from the
+summed activity values of both alleles, which tells apart alleles with the
+same function but different activity (CYP2D6*10 vs *41). The function-pair
+table is used for every other gene, and for any diplotype with an allele
+whose activity value is not tabulated.
+
+Single diplotypes are then a few index lookups, and a whole cohort (every
+gene of every patient) is called in one vectorised pass with numpy.
+"""
+import csv
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# numpy is optional - without it cohort calls use the same tables element-wise
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    np = None
+    _numpy_available = False
+
+TABLE_DIR = Path(__file__).parent
+ALLELE_DEFINITIONS_FILE = "cpic_allele_definitions.tsv"
+ALLELE_FUNCTIONS_FILE = "cpic_allele_functions.tsv"
+DIPLOTYPE_PHENOTYPES_FILE = "cpic_diplotype_phenotypes.tsv"
+ACTIVITY_PHENOTYPES_FILE = "cpic_activity_phenotypes.tsv"
+
+# Function codes (0 = allele not in the function table)
+FUNCTIONS = ("Unknown", "No function", "Decreased", "Normal", "Increased")
+FUNCTION_CODES = {name: code for code, name in enumerate(FUNCTIONS)}
+UNKNOWN_FUNCTION = 0
+DEFAULT_GENE = "*"
+REFERENCE_ALLELE = "*1"
+# Activity values and scores are multiples of 0.25 and stored as integer quarters
+ACTIVITY_UNITS = 4
+NO_ACTIVITY = -1
+
+
+def _read_tsv(path: Path) -> List[Dict[str, str]]:
+    """Read a tab-separated table with a header row"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return [
+            {key: (value or "").strip() for key, value in row.items()}
+            for row in csv.DictReader(f, delimiter='\t')
+        ]
+
+
+def _activity_units(value: str) -> int:
+    """Activity value or score in quarters (NO_ACTIVITY when blank)"""
+    return int(round(float(value) * ACTIVITY_UNITS)) if value else NO_ACTIVITY
+
+
+def variant_rsid(variant: Dict) -> Optional[str]:
+    """dbSNP rsID of a variant (from xrefs, falling back to the rsid field)"""
+    for xref in variant.get("xrefs", []) or []:
+        if xref.get("name") == "dbSNP":
+            return xref.get("id")
+    rsid = variant.get("rsid")
+    return rsid if isinstance(rsid, str) and rsid.lower().startswith("rs") else None
+
+
+class AlleleTable:
+    """Compiled allele-definition, allele-function and diplotype-phenotype tables"""
+
+    def __init__(self, table_dir: Union[str, Path] = TABLE_DIR):
+        """
+        Load and compile the tables
+
+        Args:
+            table_dir: Directory holding the CPIC-style TSV tables
+        """
+        self.table_dir = Path(table_dir)
+        definitions = _read_tsv(self.table_dir / ALLELE_DEFINITIONS_FILE)
+        functions = _read_tsv(self.table_dir / ALLELE_FUNCTIONS_FILE)
+        phenotypes = _read_tsv(self.table_dir / DIPLOTYPE_PHENOTYPES_FILE)
+        activity_phenotypes = _read_tsv(self.table_dir / ACTIVITY_PHENOTYPES_FILE)
+
+        # Gene codes: 0 is the default rule set for genes without their own rows
+        genes = sorted(
+            {row["gene"] for row in definitions + functions + phenotypes + activity_phenotypes} - {DEFAULT_GENE}
+        )
+        self.genes = [DEFAULT_GENE] + genes
+        self.gene_codes = {gene: code for code, gene in enumerate(self.genes)}
+
+        # Allele codes: 0 is the unknown allele (function Unknown)
+        self.alleles: List[Tuple[str, str]] = [("", "")]
+        self.allele_codes: Dict[Tuple[str, str], int] = {}
+        allele_function = [UNKNOWN_FUNCTION]
+        allele_activity = [NO_ACTIVITY]
+        function_codes = {name.lower(): code for name, code in FUNCTION_CODES.items()}
+        for row in functions:
+            key = (row["gene"], row["allele"])
+            if key not in self.allele_codes:
+                self.allele_codes[key] = len(self.alleles)
+                self.alleles.append(key)
+                allele_function.append(UNKNOWN_FUNCTION)
+                allele_activity.append(NO_ACTIVITY)
+            allele_function[self.allele_codes[key]] = function_codes.get(row["function"].lower(), UNKNOWN_FUNCTION)
+            allele_activity[self.allele_codes[key]] = _activity_units(row.get("activity_value", ""))
+        for row in definitions:
+            key = (row["gene"], row["allele"])
+            if key not in self.allele_codes:
+                self.allele_codes[key] = len(self.alleles)
+                self.alleles.append(key)
+                allele_function.append(UNKNOWN_FUNCTION)
+                allele_activity.append(NO_ACTIVITY)
+
+        # Defining variants: (gene, rsID) -> allele code
+        self.rsid_alleles: Dict[Tuple[str, str], int] = {
+            (row["gene"], row["rsid"]): self.allele_codes[(row["gene"], row["allele"])]
+            for row in definitions if row.get("rsid")
+        }
+
+        # Phenotype codes: 0 is "Not determined"
+        self.phenotypes = ["Not determined"]
+        phenotype_codes = {}
+
+        def phenotype_code(name: str) -> int:
+            if name not in phenotype_codes:
+                phenotype_codes[name] = len(self.phenotypes)
+                self.phenotypes.append(name)
+            return phenotype_codes[name]
+
+        n_genes, n_functions = len(self.genes), len(FUNCTIONS)
+        table = [[[0] * n_functions for _ in range(n_functions)] for _ in range(n_genes)]
+        # Default rules first, then copy them to every gene before applying its overrides
+        ordered = sorted(phenotypes, key=lambda row: row["gene"] != DEFAULT_GENE)
+        defaults_copied = False
+        for row in ordered:
+            if row["gene"] != DEFAULT_GENE and not defaults_copied:
+                for gene_code in range(1, n_genes):
+                    table[gene_code] = [list(r) for r in table[0]]
+                defaults_copied = True
+            f1 = function_codes.get(row["function_1"].lower(), UNKNOWN_FUNCTION)
+            f2 = function_codes.get(row["function_2"].lower(), UNKNOWN_FUNCTION)
+            code = phenotype_code(row["phenotype"])
+            gene_code = self.gene_codes[row["gene"]]
+            table[gene_code][f1][f2] = code
+            table[gene_code][f2][f1] = code
+        if not defaults_copied:
+            for gene_code in range(1, n_genes):
+                table[gene_code] = [list(r) for r in table[0]]
+
+        # Activity-score rules: every score from min_score to max_score (open-ended
+        # when blank) of a gene maps to the phenotype
+        max_score = 2 * max(allele_activity)
+        activity_table = [[0] * (max_score + 1) for _ in range(n_genes)]
+        for row in activity_phenotypes:
+            low = _activity_units(row["min_score"])
+            high = _activity_units(row["max_score"]) if row["max_score"] else max_score
+            code = phenotype_code(row["phenotype"])
+            for score in range(max(low, 0), min(high, max_score) + 1):
+                activity_table[self.gene_codes[row["gene"]]][score] = code
+
+        if _numpy_available:
+            self.allele_function = np.asarray(allele_function, dtype=np.int8)
+            self.allele_activity = np.asarray(allele_activity, dtype=np.int16)
+            self.phenotype_table = np.asarray(table, dtype=np.int16)
+            self.activity_table = np.asarray(activity_table, dtype=np.int16)
+        else:
+            self.allele_function = allele_function
+            self.allele_activity = allele_activity
+            self.phenotype_table = table
+            self.activity_table = activity_table
+
+        self._text_patterns: Dict[str, re.Pattern] = {}
+
+    # --- Single lookups -------------------------------------------------
+
+    def gene_code(self, gene_symbol: str) -> int:
+        """Gene code (0 = default rules)"""
+        return self.gene_codes.get(gene_symbol, 0)
+
+    def allele_code(self, gene_symbol: str, allele: Optional[str]) -> int:
+        """Allele code (0 = unknown allele)"""
+        return self.allele_codes.get((gene_symbol, allele), 0) if allele else 0
+
+    def star_allele_for_rsid(self, gene_symbol: str, rsid: Optional[str]) -> Optional[str]:
+        """Star allele defined by an rsID, if any"""
+        code = self.rsid_alleles.get((gene_symbol, rsid)) if rsid else None
+        return self.alleles[code][1] if code else None
+
+    def star_allele_from_text(self, gene_symbol: str, text: str) -> Optional[str]:
+        """First star allele mentioned in free text (e.g. annotation phenotypes)"""
+        pattern = self._text_patterns.get(gene_symbol)
+        if pattern is None:
+            pattern = re.compile(rf'{re.escape(gene_symbol)}\*(\d+[A-Z]?)|\*(\d+[A-Z]?)', re.IGNORECASE)
+            self._text_patterns[gene_symbol] = pattern
+        match = pattern.search(text)
+        if match:
+            return f"*{match.group(1) or match.group(2)}"
+        return None
+
+    def function(self, gene_symbol: str, allele: Optional[str]) -> str:
+        """Function of an allele ("Unknown" when not tabulated)"""
+        return FUNCTIONS[int(self.allele_function[self.allele_code(gene_symbol, allele)])]
+
+    def phenotype(self, gene_symbol: str, function_1: str, function_2: str) -> str:
+        """Phenotype for a pair of allele functions (when the alleles themselves are unknown)"""
+        if function_1 not in FUNCTION_CODES or function_2 not in FUNCTION_CODES:
+            return "Unknown Metabolizer"
+        table = self.phenotype_table[self.gene_code(gene_symbol)]
+        return self.phenotypes[int(table[FUNCTION_CODES[function_1]][FUNCTION_CODES[function_2]])]
+
+    def activity_score(self, gene_symbol: str, allele_1: Optional[str], allele_2: Optional[str]) -> Optional[float]:
+        """Activity score of a diplotype (None unless both alleles have activity values)"""
+        units_1 = int(self.allele_activity[self.allele_code(gene_symbol, allele_1)])
+        units_2 = int(self.allele_activity[self.allele_code(gene_symbol, allele_2)])
+        if units_1 == NO_ACTIVITY or units_2 == NO_ACTIVITY:
+            return None
+        return (units_1 + units_2) / ACTIVITY_UNITS
+
+    def _phenotype_code(self, gene_code: int, allele_code_1: int, allele_code_2: int) -> int:
+        """Phenotype code of a diplotype: activity-score rule if one applies, else the function pair"""
+        units_1 = int(self.allele_activity[allele_code_1])
+        units_2 = int(self.allele_activity[allele_code_2])
+        if units_1 != NO_ACTIVITY and units_2 != NO_ACTIVITY:
+            code = int(self.activity_table[gene_code][units_1 + units_2])
+            if code:
+                return code
+        function_1 = int(self.allele_function[allele_code_1])
+        function_2 = int(self.allele_function[allele_code_2])
+        return int(self.phenotype_table[gene_code][function_1][function_2])
+
+    def call(self, gene_symbol: str, allele_1: str, allele_2: str) -> Dict:
+        """
+        Functions and phenotype of one diplotype
+
+        Args:
+            gene_symbol: Gene symbol
+            allele_1: First star allele
+            allele_2: Second star allele
+
+        Returns:
+            Dictionary with diplotype, functionality, phenotype and star_alleles
+        """
+        function_1 = self.function(gene_symbol, allele_1)
+        function_2 = self.function(gene_symbol, allele_2)
+        phenotype = self._phenotype_code(
+            self.gene_code(gene_symbol), self.allele_code(gene_symbol, allele_1), self.allele_code(gene_symbol, allele_2)
+        )
+        return {
+            "phenotype": self.phenotypes[phenotype],
+            "diplotype": f"{allele_1}/{allele_2}",
+            "functionality": f"{function_1}/{function_2}",
+            "star_alleles": [allele_1, allele_2],
+        }
+
+    # --- Variant-level calling ------------------------------------------
+
+    def star_alleles_for_variants(self, gene_symbol: str, variants: List[Dict]) -> List[str]:
+        """
+        Assign star alleles to a diplotype's variants
+
+        Tabulated defining rsIDs win; otherwise the first star allele named in
+        the variant's PharmGKB annotation phenotypes is used, then *1.
+
+        Args:
+            gene_symbol: Gene symbol
+            variants: Diplotype variants (first two are used; one means homozygous)
+
+        Returns:
+            Two star alleles
+        """
+        star_alleles = []
+        for variant in variants[:2]:
+            star_allele = self.star_allele_for_rsid(gene_symbol, variant_rsid(variant))
+            if not star_allele:
+                for ann in (variant.get("pharmgkb") or {}).get("annotations", []):
+                    text = " ".join(p.get("phenotype", "") for p in ann.get("allelePhenotypes", []))
+                    star_allele = self.star_allele_from_text(gene_symbol, text)
+                    if star_allele:
+                        break
+            star_alleles.append(star_allele or REFERENCE_ALLELE)
+        if len(star_alleles) == 1:
+            star_alleles.append(star_alleles[0])
+        return star_alleles
+
+    def call_cohort(self, cohort: Dict[str, Dict[str, List[Dict]]]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Call diplotypes and phenotypes for every gene of every patient
+
+        Star alleles are assigned per variant; functions and phenotypes for
+        all diplotypes are then looked up in one vectorised pass.
+
+        Args:
+            cohort: patient ID -> gene symbol -> diplotype variants
+
+        Returns:
+            patient ID -> gene symbol -> phenotype dictionary (as call())
+        """
+        keys: List[Tuple[str, str]] = []
+        gene_codes: List[int] = []
+        allele_pairs: List[Tuple[str, str]] = []
+        codes_1: List[int] = []
+        codes_2: List[int] = []
+        results: Dict[str, Dict[str, Dict]] = {}
+
+        for patient_id, genes in cohort.items():
+            results[patient_id] = {}
+            for gene_symbol, variants in genes.items():
+                if not variants:
+                    results[patient_id][gene_symbol] = not_determined()
+                    continue
+                allele_1, allele_2 = self.star_alleles_for_variants(gene_symbol, variants)
+                keys.append((patient_id, gene_symbol))
+                gene_codes.append(self.gene_code(gene_symbol))
+                allele_pairs.append((allele_1, allele_2))
+                codes_1.append(self.allele_code(gene_symbol, allele_1))
+                codes_2.append(self.allele_code(gene_symbol, allele_2))
+
+        if not keys:
+            return results
+
+        if _numpy_available:
+            codes_1, codes_2, gene_codes = np.asarray(codes_1), np.asarray(codes_2), np.asarray(gene_codes)
+            functions_1 = self.allele_function[codes_1]
+            functions_2 = self.allele_function[codes_2]
+            phenotype_codes = self.phenotype_table[gene_codes, functions_1, functions_2]
+            # Activity-score rules win where both alleles have activity values
+            activity_1 = self.allele_activity[codes_1]
+            activity_2 = self.allele_activity[codes_2]
+            scored = (activity_1 != NO_ACTIVITY) & (activity_2 != NO_ACTIVITY)
+            activity_codes = self.activity_table[gene_codes, np.where(scored, activity_1 + activity_2, 0)]
+            phenotype_codes = np.where(scored & (activity_codes > 0), activity_codes, phenotype_codes)
+            functions_1, functions_2, phenotype_codes = (
+                functions_1.tolist(), functions_2.tolist(), phenotype_codes.tolist()
+            )
+        else:
+            functions_1 = [self.allele_function[c] for c in codes_1]
+            functions_2 = [self.allele_function[c] for c in codes_2]
+            phenotype_codes = [self._phenotype_code(g, c1, c2) for g, c1, c2 in zip(gene_codes, codes_1, codes_2)]
+
+        for (patient_id, gene_symbol), (allele_1, allele_2), f1, f2, phenotype in zip(
+                keys, allele_pairs, functions_1, functions_2, phenotype_codes):
+            results[patient_id][gene_symbol] = {
+                "phenotype": self.phenotypes[phenotype],
+                "diplotype": f"{allele_1}/{allele_2}",
+                "functionality": f"{FUNCTIONS[f1]}/{FUNCTIONS[f2]}",
+                "star_alleles": [allele_1, allele_2],
+                "source": "PharmGKB/CPIC",
+            }
+        return results
+
+
+def not_determined() -> Dict:
+    """Phenotype result for a gene without variants"""
+    return {
+        "phenotype": "Not determined",
+        "diplotype": "Unknown/Unknown",
+        "functionality": "Unknown/Unknown",
+        "source": "No variants found"
+    }
+
+
+_tables: Dict[str, AlleleTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_allele_table(table_dir: Union[str, Path] = TABLE_DIR) -> AlleleTable:
+    """Get the compiled tables for a directory (compiled once per process)"""
+    key = str(Path(table_dir).resolve())
+    table = _tables.get(key)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None:
+                table = AlleleTable(table_dir)
+                _tables[key] = table
+    return table
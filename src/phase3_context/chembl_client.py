@@ -6,19 +6,86 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from utils.api_client import APIClient
 
 
 class ChEMBLClient:
     """Client for querying ChEMBL Web Services API"""
     
+    # Focus on CYP enzymes and other PGx-relevant targets
+    PGX_TARGETS = [
+        "CYP2C19", "CYP2D6", "CYP3A4", "CYP2C9", "CYP1A2",
+        "DPYD", "TPMT", "UGT1A1", "SLCO1B1", "ABCB1"
+    ]
+    
+    # Field projections (``only=``) - just the fields we persist downstream
+    MOLECULE_FIELDS = [
+        "molecule_chembl_id", "pref_name", "molecule_type", "max_phase",
+        "therapeutic_flag", "molecule_properties", "structure_type"
+    ]
+    ACTIVITY_FIELDS = [
+        "molecule_chembl_id", "target_chembl_id", "target_pref_name", "target_organism",
+        "assay_type", "assay_description", "standard_type", "standard_value",
+        "standard_units", "standard_relation"
+    ]
+    TARGET_FIELDS = [
+        "target_chembl_id", "pref_name", "target_type", "organism", "target_components"
+    ]
+    MECHANISM_FIELDS = [
+        "molecule_chembl_id", "mechanism_of_action", "target_chembl_id",
+        "action_type", "mechanism_comment"
+    ]
+    
+    # IDs per ``__in`` filter (keeps request URLs short) and ChEMBL's maximum page size
+    BATCH_SIZE = 50
+    PAGE_SIZE = 1000
+    
     def __init__(self):
         """Initialize ChEMBL client"""
         self.base_url = "https://www.ebi.ac.uk/chembl/api/data"
         # ChEMBL allows up to 20 requests per second
         self.client = APIClient(self.base_url, rate_limit=15)
     
+    def _chunks(self, ids: List[str]) -> List[List[str]]:
+        """Split unique, non-empty IDs into BATCH_SIZE groups (order preserved)"""
+        unique_ids = list(dict.fromkeys(i for i in ids if i))
+        return [unique_ids[i:i + self.BATCH_SIZE] for i in range(0, len(unique_ids), self.BATCH_SIZE)]
+    
+    def _iter_pages(self, endpoint: str, params: Dict, collection_key: str,
+                    max_pages: int = None) -> Iterator[List[Dict]]:
+        """
+        Yield successive pages of a ChEMBL list endpoint
+        
+        Follows ``page_meta.next`` using offset paging so callers can stop
+        early once they have what they need.
+        
+        Args:
+            endpoint: List endpoint (e.g. activity.json)
+            params: Filter parameters (limit/offset are managed here)
+            collection_key: Key holding the records (e.g. "activities")
+            max_pages: Optional safety cap on the number of pages fetched
+        """
+        offset = 0
+        pages = 0
+        while True:
+            page_params = dict(params, limit=self.PAGE_SIZE, offset=offset)
+            data = self.client.get(endpoint, params=page_params)
+            if not data:
+                return
+            
+            records = data.get(collection_key) or []
+            if records:
+                yield records
+            pages += 1
+            
+            page_meta = data.get("page_meta") or {}
+            if not records or not page_meta.get("next"):
+                return
+            if max_pages and pages >= max_pages:
+                return
+            offset += len(records)
+    
     def search_compound_by_name(self, drug_name: str) -> Optional[Dict]:
         """
         Search for a compound by name in ChEMBL
@@ -97,15 +164,8 @@ class ChEMBLClient:
         # Get bioactivities first to find targets
         bioactivities = self.get_compound_bioactivities(chembl_id)
         
-        targets = {}
-        for activity in bioactivities:
-            target_chembl_id = activity.get("target_chembl_id")
-            if target_chembl_id and target_chembl_id not in targets:
-                target_info = self.get_target_details(target_chembl_id)
-                if target_info:
-                    targets[target_chembl_id] = target_info
-        
-        return list(targets.values())
+        target_ids = [activity.get("target_chembl_id") for activity in bioactivities]
+        return list(self.get_targets_details(target_ids).values())
     
     def get_target_details(self, target_chembl_id: str) -> Optional[Dict]:
         """
@@ -126,6 +186,227 @@ class ChEMBLClient:
         
         return None
     
+    def search_compounds_by_names(self, drug_names: List[str]) -> Dict[str, Dict]:
+        """
+        Resolve many drug names to ChEMBL compounds
+        
+        Uses a single ``pref_name__in`` query per batch and only falls back to
+        the per-name synonym search for names that were not matched. Names
+        containing a comma (salts, combinations) cannot go into an ``__in``
+        list, which ChEMBL splits on commas, so they get a ``pref_name__iexact``
+        query of their own.
+        
+        Args:
+            drug_names: Drug names to resolve
+            
+        Returns:
+            Dictionary mapping each resolved drug name to its compound record
+        """
+        compounds = {}
+        names_by_pref = {}
+        for name in drug_names:
+            if name:
+                names_by_pref.setdefault(name.strip().upper(), []).append(name)
+        
+        batched = [pref for pref in names_by_pref if "," not in pref]
+        queries = [{"pref_name__in": ",".join(chunk)} for chunk in self._chunks(batched)]
+        queries += [{"pref_name__iexact": pref} for pref in names_by_pref if "," in pref]
+        
+        for query in queries:
+            params = dict(query, only=",".join(self.MOLECULE_FIELDS))
+            for molecules in self._iter_pages("molecule.json", params, "molecules", max_pages=1):
+                for molecule in molecules:
+                    for name in names_by_pref.get((molecule.get("pref_name") or "").upper(), []):
+                        compounds.setdefault(name, molecule)
+        
+        # Synonym search for anything the preferred-name lookup missed
+        for names in names_by_pref.values():
+            for name in names:
+                if name not in compounds:
+                    compound = self.search_compound_by_name(name)
+                    if compound:
+                        compounds[name] = compound
+        
+        return compounds
+    
+    def get_bioactivities_for_compounds(self, chembl_ids: List[str], target_gene: str = None,
+                                        limit_per_compound: int = 50,
+                                        max_pages: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Get bioactivity data for many compounds at once
+        
+        Args:
+            chembl_ids: ChEMBL compound IDs
+            target_gene: Optional gene symbol to filter targets (e.g., CYP2C19)
+            limit_per_compound: Maximum activities kept per compound
+            max_pages: Pages fetched per batch of IDs; compounds the batch left
+                short when the cap was reached are then fetched one by one
+            
+        Returns:
+            Dictionary mapping compound ID to its bioactivity records
+        """
+        activities = {chembl_id: [] for chembl_id in chembl_ids if chembl_id}
+        
+        for chunk in self._chunks(chembl_ids):
+            params = {
+                "molecule_chembl_id__in": ",".join(chunk),
+                "only": ",".join(self.ACTIVITY_FIELDS)
+            }
+            if target_gene:
+                params["target_organism"] = "Homo sapiens"
+                params["target_pref_name__icontains"] = target_gene
+            
+            pending = set(chunk)
+            pages = 0
+            for page in self._iter_pages("activity.json", params, "activities", max_pages=max_pages):
+                pages += 1
+                for activity in page:
+                    bucket = activities.get(activity.get("molecule_chembl_id"))
+                    if bucket is None or len(bucket) >= limit_per_compound:
+                        continue
+                    bucket.append(activity)
+                    if len(bucket) >= limit_per_compound:
+                        pending.discard(activity.get("molecule_chembl_id"))
+                # Stop paging once every compound in this batch is full
+                if not pending:
+                    break
+            
+            # Compounds with many activities can use up the page cap before
+            # the rest of the batch is reached - fetch those left short on
+            # their own, with a per-compound limit
+            if pending and max_pages and pages >= max_pages:
+                for chembl_id in chunk:
+                    if chembl_id not in pending:
+                        continue
+                    single = dict(params, molecule_chembl_id=chembl_id)
+                    del single["molecule_chembl_id__in"]
+                    activities[chembl_id] = []
+                    for page in self._iter_pages("activity.json", single, "activities", max_pages=1):
+                        activities[chembl_id] = page[:limit_per_compound]
+        
+        return activities
+    
+    def get_targets_details(self, target_chembl_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get details for many targets at once
+        
+        Args:
+            target_chembl_ids: ChEMBL target IDs
+            
+        Returns:
+            Dictionary mapping target ID to target details
+        """
+        targets = {}
+        
+        for chunk in self._chunks(target_chembl_ids):
+            params = {
+                "target_chembl_id__in": ",".join(chunk),
+                "only": ",".join(self.TARGET_FIELDS)
+            }
+            for page in self._iter_pages("target.json", params, "targets"):
+                for target in page:
+                    if target.get("target_chembl_id"):
+                        targets[target["target_chembl_id"]] = target
+        
+        # Preserve the order in which targets were requested
+        return {tid: targets[tid] for tid in dict.fromkeys(target_chembl_ids) if tid in targets}
+    
+    def get_mechanisms_for_compounds(self, chembl_ids: List[str],
+                                     limit_per_compound: int = 20) -> Dict[str, List[Dict]]:
+        """
+        Get mechanism of action data for many compounds at once
+        
+        Args:
+            chembl_ids: ChEMBL compound IDs
+            limit_per_compound: Maximum mechanisms kept per compound
+            
+        Returns:
+            Dictionary mapping compound ID to mechanism of action records
+        """
+        mechanisms = {chembl_id: [] for chembl_id in chembl_ids if chembl_id}
+        
+        for chunk in self._chunks(chembl_ids):
+            params = {
+                "molecule_chembl_id__in": ",".join(chunk),
+                "only": ",".join(self.MECHANISM_FIELDS)
+            }
+            for page in self._iter_pages("mechanism.json", params, "mechanisms"):
+                for mech in page:
+                    bucket = mechanisms.get(mech.get("molecule_chembl_id"))
+                    if bucket is not None and len(bucket) < limit_per_compound:
+                        bucket.append(self._format_mechanism(mech))
+        
+        return mechanisms
+    
+    def _format_mechanism(self, mech: Dict) -> Dict:
+        """Project a raw ChEMBL mechanism record onto the persisted fields"""
+        return {
+            "mechanism_of_action": mech.get("mechanism_of_action"),
+            "target_chembl_id": mech.get("target_chembl_id"),
+            "target_name": mech.get("target_pref_name"),
+            "action_type": mech.get("action_type"),
+            "mechanism_comment": mech.get("mechanism_comment")
+        }
+    
+    def _build_pgx_bioactivities(self, activities: List[Dict], targets: Dict[str, Dict]) -> List[Dict]:
+        """
+        Keep bioactivities against PGx-relevant targets
+        
+        Args:
+            activities: Raw activity records for one compound
+            targets: Target details keyed by target ChEMBL ID
+            
+        Returns:
+            List of PGx bioactivity records
+        """
+        records = []
+        for activity in activities:
+            target_name = activity.get("target_pref_name") or ""
+            
+            # Check if this is a PGx-relevant target
+            if not any(pgx_gene in target_name.upper() for pgx_gene in self.PGX_TARGETS):
+                continue
+            
+            target_chembl_id = activity.get("target_chembl_id")
+            target_details = targets.get(target_chembl_id) if target_chembl_id else None
+            
+            records.append({
+                "target_chembl_id": target_chembl_id,
+                "target_name": target_name,
+                "target_type": activity.get("target_type"),
+                "target_organism": activity.get("target_organism"),
+                "target_pref_name": activity.get("target_pref_name"),
+                "assay_type": activity.get("assay_type"),
+                "bioactivity_type": activity.get("standard_type"),
+                "value": activity.get("standard_value"),
+                "units": activity.get("standard_units"),
+                "relation": activity.get("standard_relation"),
+                "assay_description": (activity.get("assay_description") or "")[:200],
+                "target_gene_symbol": target_details.get("target_components", [{}])[0].get("target_component_synonym", "") if target_details and target_details.get("target_components") else None
+            })
+        
+        return records
+    
+    def _build_compound_info(self, compound: Dict) -> Dict:
+        """Extract compound and ADMET properties from a molecule record"""
+        molecule_props = compound.get("molecule_properties") or {}
+        if not isinstance(molecule_props, dict):
+            molecule_props = {}
+        return {
+            "pref_name": compound.get("pref_name"),
+            "molecule_type": compound.get("molecule_type"),
+            "max_phase": compound.get("max_phase"),
+            "therapeutic_flag": compound.get("therapeutic_flag"),
+            "molecular_weight": molecule_props.get("mw_freebase"),
+            "alogp": molecule_props.get("alogp"),
+            "hbd": molecule_props.get("hbd"),  # Hydrogen bond donors (ADMET)
+            "hba": molecule_props.get("hba"),  # Hydrogen bond acceptors (ADMET)
+            "psa": molecule_props.get("psa"),  # Polar surface area (ADMET)
+            "rtb": molecule_props.get("rtb"),  # Rotatable bonds (ADMET)
+            "num_ro5_violations": molecule_props.get("num_ro5_violations"),  # Lipinski's Rule of Five violations
+            "structure_type": compound.get("structure_type")
+        }
+    
     def get_pharmacogenomic_bioactivities(self, chembl_id: str) -> Dict:
         """
         Get pharmacogenomics-relevant bioactivity data
@@ -136,56 +417,16 @@ class ChEMBLClient:
         Returns:
             Dictionary with PGx-relevant bioactivity data
         """
-        # Focus on CYP enzymes and other PGx-relevant targets
-        pgx_targets = [
-            "CYP2C19", "CYP2D6", "CYP3A4", "CYP2C9", "CYP1A2",
-            "DPYD", "TPMT", "UGT1A1", "SLCO1B1", "ABCB1"
-        ]
+        # Get all bioactivities, then target details in one batched call
+        all_bioactivities = self.get_compound_bioactivities(chembl_id)
+        targets = self.get_targets_details([a.get("target_chembl_id") for a in all_bioactivities])
         
-        pgx_data = {
+        return {
             "chembl_id": chembl_id,
-            "pgx_bioactivities": [],
-            "mechanism_of_action": [],
+            "pgx_bioactivities": self._build_pgx_bioactivities(all_bioactivities, targets),
+            "mechanism_of_action": self.get_mechanism_of_action(chembl_id),
             "target_interactions": []
         }
-        
-        # Get all bioactivities
-        all_bioactivities = self.get_compound_bioactivities(chembl_id)
-        
-        for activity in all_bioactivities:
-            target_name = activity.get("target_pref_name", "")
-            
-            # Check if this is a PGx-relevant target
-            is_pgx_target = any(pgx_gene in target_name.upper() for pgx_gene in pgx_targets)
-            
-            if is_pgx_target:
-                # Get target details including ChEMBL target ID
-                target_chembl_id = activity.get("target_chembl_id")
-                target_details = None
-                if target_chembl_id:
-                    target_details = self.get_target_details(target_chembl_id)
-                
-                bioactivity_record = {
-                    "target_chembl_id": target_chembl_id,
-                    "target_name": target_name,
-                    "target_type": activity.get("target_type"),
-                    "target_organism": activity.get("target_organism"),
-                    "target_pref_name": activity.get("target_pref_name"),
-                    "assay_type": activity.get("assay_type"),
-                    "bioactivity_type": activity.get("standard_type"),
-                    "value": activity.get("standard_value"),
-                    "units": activity.get("standard_units"),
-                    "relation": activity.get("standard_relation"),
-                    "assay_description": activity.get("assay_description", "")[:200],
-                    "target_gene_symbol": target_details.get("target_components", [{}])[0].get("target_component_synonym", "") if target_details and target_details.get("target_components") else None
-                }
-                
-                pgx_data["pgx_bioactivities"].append(bioactivity_record)
-        
-        # Get mechanism of action
-        pgx_data["mechanism_of_action"] = self.get_mechanism_of_action(chembl_id)
-        
-        return pgx_data
     
     def get_mechanism_of_action(self, chembl_id: str) -> List[Dict]:
         """
@@ -206,20 +447,54 @@ class ChEMBLClient:
         data = self.client.get(endpoint, params=params)
         
         if data and "mechanisms" in data:
-            mechanisms = []
-            for mech in data["mechanisms"]:
-                mechanism_record = {
-                    "mechanism_of_action": mech.get("mechanism_of_action"),
-                    "target_chembl_id": mech.get("target_chembl_id"),
-                    "target_name": mech.get("target_pref_name"),
-                    "action_type": mech.get("action_type"),
-                    "mechanism_comment": mech.get("mechanism_comment")
-                }
-                mechanisms.append(mechanism_record)
-            return mechanisms
+            return [self._format_mechanism(mech) for mech in data["mechanisms"]]
         
         return []
     
+    def enrich_drugs_batch(self, drug_names: List[str]) -> Dict[str, Dict]:
+        """
+        Enrich many drugs with ChEMBL data using bulk ``__in`` queries
+        
+        One compound lookup, one activity scan, one target lookup and one
+        mechanism lookup per batch of IDs - instead of several calls per drug
+        and one call per target.
+        
+        Args:
+            drug_names: Drug names
+            
+        Returns:
+            Dictionary mapping drug name to its ChEMBL enrichment data
+        """
+        compounds = self.search_compounds_by_names(drug_names)
+        compounds = {name: c for name, c in compounds.items() if c.get("molecule_chembl_id")}
+        if not compounds:
+            return {}
+        
+        chembl_ids = [c["molecule_chembl_id"] for c in compounds.values()]
+        activities = self.get_bioactivities_for_compounds(chembl_ids)
+        mechanisms = self.get_mechanisms_for_compounds(chembl_ids)
+        target_ids = [a.get("target_chembl_id") for acts in activities.values() for a in acts]
+        targets = self.get_targets_details(target_ids)
+        
+        enriched = {}
+        for drug_name, compound in compounds.items():
+            chembl_id = compound["molecule_chembl_id"]
+            compound_activities = activities.get(chembl_id, [])
+            compound_target_ids = dict.fromkeys(
+                a.get("target_chembl_id") for a in compound_activities if a.get("target_chembl_id")
+            )
+            enriched[drug_name] = {
+                "drug_name": drug_name,
+                "chembl_id": chembl_id,
+                "compound_info": self._build_compound_info(compound),
+                "pgx_bioactivities": self._build_pgx_bioactivities(compound_activities, targets),
+                "mechanism_of_action": mechanisms.get(chembl_id, []),
+                # Limit to top 10
+                "target_interactions": [targets[tid] for tid in compound_target_ids if tid in targets][:10]
+            }
+        
+        return enriched
+    
     def enrich_drug_with_chembl_data(self, drug_name: str, gene_symbol: str = None) -> Optional[Dict]:
         """
         Enrich a drug with comprehensive ChEMBL data
@@ -231,49 +506,7 @@ class ChEMBLClient:
         Returns:
             Dictionary with ChEMBL enrichment data
         """
-        # Search for the compound
-        compound = self.search_compound_by_name(drug_name)
-        
-        if not compound:
-            return None
-        
-        chembl_id = compound.get("molecule_chembl_id")
-        if not chembl_id:
-            return None
-        
-        # Get comprehensive data including ADMET properties
-        molecule_props = compound.get("molecule_properties") or {}
-        enrichment_data = {
-            "drug_name": drug_name,
-            "chembl_id": chembl_id,
-            "compound_info": {
-                "pref_name": compound.get("pref_name"),
-                "molecule_type": compound.get("molecule_type"),
-                "max_phase": compound.get("max_phase"),
-                "therapeutic_flag": compound.get("therapeutic_flag"),
-                "molecular_weight": molecule_props.get("mw_freebase") if isinstance(molecule_props, dict) else None,
-                "alogp": molecule_props.get("alogp") if isinstance(molecule_props, dict) else None,
-                "hbd": molecule_props.get("hbd") if isinstance(molecule_props, dict) else None,  # Hydrogen bond donors (ADMET)
-                "hba": molecule_props.get("hba") if isinstance(molecule_props, dict) else None,  # Hydrogen bond acceptors (ADMET)
-                "psa": molecule_props.get("psa") if isinstance(molecule_props, dict) else None,  # Polar surface area (ADMET)
-                "rtb": molecule_props.get("rtb") if isinstance(molecule_props, dict) else None,  # Rotatable bonds (ADMET)
-                "num_ro5_violations": molecule_props.get("num_ro5_violations") if isinstance(molecule_props, dict) else None,  # Lipinski's Rule of Five violations
-                "structure_type": compound.get("structure_type")
-            },
-            "pgx_bioactivities": [],
-            "mechanism_of_action": [],
-            "target_interactions": []
-        }
-        
-        # Get pharmacogenomic bioactivities
-        pgx_data = self.get_pharmacogenomic_bioactivities(chembl_id)
-        enrichment_data.update(pgx_data)
-        
-        # Get target interactions
-        targets = self.get_compound_targets(chembl_id)
-        enrichment_data["target_interactions"] = targets[:10]  # Limit to top 10
-        
-        return enrichment_data
+        return self.enrich_drugs_batch([drug_name]).get(drug_name)
     
     def enrich_drugs_with_chembl_data(self, variants: List[Dict]) -> List[Dict]:
         """
@@ -287,31 +520,32 @@ class ChEMBLClient:
         """
         print("   Enriching drugs with ChEMBL bioactivity data...")
         
+        # The same drug appears on many variants - resolve each name once
+        drug_names = list(dict.fromkeys(
+            drug.get("name", "")
+            for variant in variants
+            for drug in (variant.get("pharmgkb") or {}).get("drugs", [])
+            if drug.get("name")
+        ))
+        if not drug_names:
+            return variants
+        
+        print(f"     Querying ChEMBL for {len(drug_names)} unique drugs in bulk...")
+        chembl_by_drug = self.enrich_drugs_batch(drug_names)
+        
+        for drug_name in drug_names:
+            chembl_data = chembl_by_drug.get(drug_name)
+            if chembl_data:
+                print(f"       [OK] Found ChEMBL data for {drug_name}: {chembl_data['chembl_id']}")
+            else:
+                print(f"       [SKIP] No ChEMBL data found for {drug_name}")
+        
         for variant in variants:
             if "pharmgkb" in variant and "drugs" in variant["pharmgkb"]:
-                chembl_enriched_drugs = []
-                
                 for drug in variant["pharmgkb"]["drugs"]:
-                    drug_name = drug.get("name", "")
-                    if drug_name:
-                        print(f"     Querying ChEMBL for {drug_name}...")
-                        
-                        # Get gene symbol from variant context if available
-                        gene_symbol = None
-                        if "gene_symbol" in variant:
-                            gene_symbol = variant["gene_symbol"]
-                        
-                        chembl_data = self.enrich_drug_with_chembl_data(drug_name, gene_symbol)
-                        
-                        if chembl_data:
-                            drug["chembl_data"] = chembl_data
-                            print(f"       [OK] Found ChEMBL data: {chembl_data['chembl_id']}")
-                        else:
-                            print(f"       [SKIP] No ChEMBL data found for {drug_name}")
-                        
-                        chembl_enriched_drugs.append(drug)
-                
-                variant["pharmgkb"]["drugs"] = chembl_enriched_drugs
+                    chembl_data = chembl_by_drug.get(drug.get("name", ""))
+                    if chembl_data:
+                        drug["chembl_data"] = chembl_data
         
         return variants
 
@@ -4,7 +4,7 @@ Orchestrates Phase 3: Drug and disease context enrichment
 """
 import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -13,18 +13,23 @@ from phase3_context.openfda_client import OpenFDAClient
 from phase3_context.chembl_client import ChEMBLClient
 from phase3_context.europepmc_client import EuropePMCClient
 from phase2_clinical.bioportal_client import BioPortalClient
+from utils.config import Config, get_config
+from utils.json_writer import write_json_streaming
+from utils.run_workspace import DEFAULT_WORKSPACE, RunWorkspace
 
 
 class DrugDiseaseLinker:
     """Links variants to drugs, diseases, and literature"""
     
-    def __init__(self, bioportal_api_key: str = None):
+    def __init__(self, bioportal_api_key: str = None, config: Config = None):
         """
         Initialize drug-disease linker
         
         Args:
             bioportal_api_key: BioPortal API key for SNOMED CT
+            config: Shared configuration (defaults to the process-wide instance)
         """
+        self.config = config if config is not None else get_config()
         self.identifier_mapper = IdentifierMapper()
         self.openfda = OpenFDAClient()
         self.chembl = ChEMBLClient()
@@ -229,13 +234,15 @@ class DrugDiseaseLinker:
         
         return variants
     
-    def run_pipeline(self, gene_symbol: str, phase2_file: str = None) -> Dict:
+    def run_pipeline(self, gene_symbol: str, phase2_file: str = None,
+                     workspace: Optional[RunWorkspace] = None) -> Dict:
         """
         Execute Phase 3: Drug & disease enrichment pipeline
         
         Args:
             gene_symbol: Gene symbol
             phase2_file: Path to Phase 2 output file
+            workspace: Run workspace for inputs and outputs (defaults to data/)
             
         Returns:
             Enriched data
@@ -246,7 +253,7 @@ class DrugDiseaseLinker:
         
         # Load Phase 2 data
         if not phase2_file:
-            phase2_file = f"data/phase2/{gene_symbol}_clinical.json"
+            phase2_file = str((workspace or DEFAULT_WORKSPACE).clinical_file(gene_symbol))
         
         phase2_path = Path(phase2_file)
         if not phase2_path.exists():
@@ -257,23 +264,8 @@ class DrugDiseaseLinker:
         
         print(f"Loaded {phase2_data['total_variants']} variants from Phase 2")
         
-        # Load configuration to check feature flags
-        from utils.config import Config
-        # Try to find config.yaml in common locations
-        config_path = None
-        for path in [
-            Path(__file__).parent.parent.parent / "config.yaml",  # Project root
-            Path("config.yaml"),  # Current directory
-            Path(__file__).parent.parent / "config.yaml",  # src directory
-        ]:
-            if path.exists():
-                config_path = str(path)
-                break
-        
-        config = Config(config_path=config_path) if config_path else Config()
-        
         # Enrich with ChEMBL bioactivity data (if enabled)
-        if config.config.get("features", {}).get("enable_chembl", True):
+        if self.config.feature_enabled("enable_chembl", True):
             print("\nEnriching with ChEMBL bioactivity data...")
             phase2_data["variants"] = self.chembl.enrich_drugs_with_chembl_data(
                 phase2_data["variants"]
@@ -282,7 +274,7 @@ class DrugDiseaseLinker:
             print("\nSkipping ChEMBL enrichment (disabled in config)")
         
         # Enrich with OpenFDA drug labels (if enabled)
-        if config.config.get("features", {}).get("enable_openfda", False):
+        if self.config.feature_enabled("enable_openfda", False):
             print("\nEnriching with OpenFDA drug labels...")
             phase2_data["variants"] = self.openfda.enrich_drugs_with_fda_data(
                 phase2_data["variants"]
@@ -291,7 +283,7 @@ class DrugDiseaseLinker:
             print("\nSkipping OpenFDA enrichment (disabled in config)")
         
         # Enrich with literature from Europe PMC (if enabled)
-        if config.config.get("features", {}).get("enable_europepmc", True):
+        if self.config.feature_enabled("enable_europepmc", True):
             print("\nEnriching with literature evidence...")
             phase2_data["variants"] = self.europepmc.enrich_with_literature(
                 gene_symbol,
@@ -311,9 +303,9 @@ class DrugDiseaseLinker:
         phase2_data["variants"] = self.map_adverse_reactions_to_snomed(phase2_data["variants"])
         
         # Save output
-        output_file = self.output_dir / f"{gene_symbol}_enriched.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(phase2_data, f, indent=2)
+        output_dir = workspace.phase3_dir if workspace else self.output_dir
+        output_file = output_dir / f"{gene_symbol}_enriched.json"
+        write_json_streaming(output_file, phase2_data, {"variants": phase2_data["variants"]})
         
         print(f"\nPhase 3 Complete!")
         print(f"   Enriched data saved: {output_file}")
@@ -323,10 +315,8 @@ class DrugDiseaseLinker:
 
 if __name__ == "__main__":
     # Test the module
-    from utils.config import Config
-    
-    config = Config()
-    linker = DrugDiseaseLinker(bioportal_api_key=config.bioportal_api_key)
+    config = get_config()
+    linker = DrugDiseaseLinker(bioportal_api_key=config.bioportal_api_key, config=config)
     
     result = linker.run_pipeline("CYP2D6")
     print(f"\n   Total variants: {result['total_variants']}")
@@ -7,61 +7,99 @@ from pathlib import Path
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, XSD
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import sys
+import threading
 sys.path.append(str(Path(__file__).parent.parent))
 
+from phase4_rdf.triple_writer import TripleBuffer
+from utils.run_workspace import DEFAULT_WORKSPACE, RunWorkspace
+
 
 class RDFGraphBuilder:
-    """Builds RDF knowledge graphs from enriched data"""
+    """Builds RDF knowledge graphs from enriched data
+
+    Each gene is assembled into its own graph, so a save only serialises the
+    triples of the gene being built. The working graph is thread-local, which
+    lets one builder serve the concurrent gene runs of run_multi_gene. Graphs
+    are TripleBuffers written by the streaming Turtle writer; use to_graph()
+    when a full rdflib Graph is needed.
+    """
+    
+    # Prefix bindings for every graph the builder creates
+    NAMESPACE_BINDINGS = {
+        # Standard ontologies
+        "foaf": "http://xmlns.com/foaf/0.1/",
+        "schema": "http://schema.org/",
+        "sio": "http://semanticscience.org/resource/",
+        "obo": "http://purl.obolibrary.org/obo/",
+        "dcterms": "http://purl.org/dc/terms/",
+        
+        # Identifier systems
+        "dbsnp": "https://identifiers.org/dbsnp:",
+        "uniprot": "https://identifiers.org/uniprot:",
+        "rxnorm": "https://identifiers.org/rxnorm:",
+        "snomed": "http://snomed.info/id/",
+        "clinvar": "https://identifiers.org/clinvar:",
+        "ncbigene": "https://identifiers.org/ncbigene:",
+        "pharmgkb": "https://www.pharmgkb.org/",
+        "pubmed": "https://pubmed.ncbi.nlm.nih.gov/",
+        "chembl": "https://www.ebi.ac.uk/chembl/compound_report_card/",
+        
+        # Project namespaces
+        "pgx": "http://pgx-kg.org/",
+        "patient": "http://pgx-kg.org/patient/",
+        "genotype": "http://pgx-kg.org/genotype/",
+    }
     
     def __init__(self):
         """Initialize RDF graph builder"""
-        self.graph = Graph()
-        self._bind_namespaces()
+        self._local = threading.local()
+        self._init_namespaces()
         self.output_dir = Path("output/rdf")
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def _bind_namespaces(self):
+    @property
+    def graph(self) -> TripleBuffer:
+        """Graph currently being built on this thread"""
+        graph = getattr(self._local, "graph", None)
+        if graph is None:
+            graph = self.new_graph()
+            self._local.graph = graph
+        return graph
+    
+    @graph.setter
+    def graph(self, graph: TripleBuffer):
+        self._local.graph = graph
+    
+    def new_graph(self) -> TripleBuffer:
+        """Create an empty graph with the standard namespaces bound"""
+        graph = TripleBuffer()
+        self._bind_namespaces(graph)
+        return graph
+    
+    def _bind_namespaces(self, graph):
         """Bind standard namespaces"""
-        # Standard ontologies
-        self.graph.bind("foaf", Namespace("http://xmlns.com/foaf/0.1/"))
-        self.graph.bind("schema", Namespace("http://schema.org/"))
-        self.graph.bind("sio", Namespace("http://semanticscience.org/resource/"))
-        self.graph.bind("obo", Namespace("http://purl.obolibrary.org/obo/"))
-        self.graph.bind("dcterms", Namespace("http://purl.org/dc/terms/"))
-        
-        # Identifier systems
-        self.graph.bind("dbsnp", Namespace("https://identifiers.org/dbsnp:"))
-        self.graph.bind("uniprot", Namespace("https://identifiers.org/uniprot:"))
-        self.graph.bind("rxnorm", Namespace("https://identifiers.org/rxnorm:"))
-        self.graph.bind("snomed", Namespace("http://snomed.info/id/"))
-        self.graph.bind("clinvar", Namespace("https://identifiers.org/clinvar:"))
-        self.graph.bind("ncbigene", Namespace("https://identifiers.org/ncbigene:"))
-        self.graph.bind("pharmgkb", Namespace("https://www.pharmgkb.org/"))
-        self.graph.bind("pubmed", Namespace("https://pubmed.ncbi.nlm.nih.gov/"))
-        self.graph.bind("chembl", Namespace("https://www.ebi.ac.uk/chembl/compound_report_card/"))
-        
-        # Project namespaces
-        self.graph.bind("pgx", Namespace("http://pgx-kg.org/"))
-        self.graph.bind("patient", Namespace("http://pgx-kg.org/patient/"))
-        self.graph.bind("genotype", Namespace("http://pgx-kg.org/genotype/"))
-        
-        # Store as instance variables for easy access
-        self.FOAF = Namespace("http://xmlns.com/foaf/0.1/")
-        self.SCHEMA = Namespace("http://schema.org/")
-        self.SIO = Namespace("http://semanticscience.org/resource/")
-        self.OBO = Namespace("http://purl.obolibrary.org/obo/")
-        self.DCTERMS = Namespace("http://purl.org/dc/terms/")
-        self.DBSNP = Namespace("https://identifiers.org/dbsnp:")
-        self.UNIPROT = Namespace("https://identifiers.org/uniprot:")
-        self.RXNORM = Namespace("https://identifiers.org/rxnorm:")
-        self.SNOMED = Namespace("http://snomed.info/id/")
-        self.CLINVAR = Namespace("https://identifiers.org/clinvar:")
-        self.PUBMED = Namespace("https://pubmed.ncbi.nlm.nih.gov/")
-        self.CHEMBL = Namespace("https://www.ebi.ac.uk/chembl/compound_report_card/")
-        self.PATIENT_NS = Namespace("http://pgx-kg.org/patient/")
-        self.GENOTYPE_NS = Namespace("http://pgx-kg.org/genotype/")
+        for prefix, uri in self.NAMESPACE_BINDINGS.items():
+            graph.bind(prefix, Namespace(uri))
+    
+    def _init_namespaces(self):
+        """Store namespaces as instance variables for easy access"""
+        ns = self.NAMESPACE_BINDINGS
+        self.FOAF = Namespace(ns["foaf"])
+        self.SCHEMA = Namespace(ns["schema"])
+        self.SIO = Namespace(ns["sio"])
+        self.OBO = Namespace(ns["obo"])
+        self.DCTERMS = Namespace(ns["dcterms"])
+        self.DBSNP = Namespace(ns["dbsnp"])
+        self.UNIPROT = Namespace(ns["uniprot"])
+        self.RXNORM = Namespace(ns["rxnorm"])
+        self.SNOMED = Namespace(ns["snomed"])
+        self.CLINVAR = Namespace(ns["clinvar"])
+        self.PUBMED = Namespace(ns["pubmed"])
+        self.CHEMBL = Namespace(ns["chembl"])
+        self.PATIENT_NS = Namespace(ns["patient"])
+        self.GENOTYPE_NS = Namespace(ns["genotype"])
     
     def add_virtual_patient(self, patient_data: Dict, genotype_uri: URIRef) -> URIRef:
         """Add virtual patient to graph"""
@@ -321,7 +359,7 @@ class RDFGraphBuilder:
         
         return gene_uri
     
-    def build_from_enriched_data(self, enriched_data: Dict, patient_data: Dict) -> Graph:
+    def build_from_enriched_data(self, enriched_data: Dict, patient_data: Dict) -> TripleBuffer:
         """Build complete RDF graph from enriched data"""
         gene_symbol = enriched_data["gene_symbol"]
         protein_id = enriched_data["protein_id"]
@@ -345,47 +383,83 @@ class RDFGraphBuilder:
         
         return self.graph
     
-    def save(self, gene_symbol: str, format: str = "turtle"):
-        """Save graph to file"""
-        output_file = self.output_dir / f"{gene_symbol}_knowledge_graph.ttl"
+    def save(self, gene_symbol: str, format: str = "turtle", workspace: Optional[RunWorkspace] = None):
+        """Save graph to file (Turtle and N-Triples bypass rdflib's serializer)"""
+        output_dir = workspace.rdf_dir if workspace else self.output_dir
+        output_file = output_dir / f"{gene_symbol}_knowledge_graph.ttl"
         self.graph.serialize(destination=str(output_file), format=format, encoding="utf-8")
         print(f"   RDF graph saved: {output_file}")
         return output_file
     
     def run_pipeline(self, gene_symbol: str, phase3_file: str = None, 
-                     patient_file: str = None) -> str:
-        """Execute Phase 4: RDF graph building"""
+                     patient_file: str = None, workspace: Optional[RunWorkspace] = None) -> str:
+        """Execute Phase 4: RDF graph building
+        
+        Args:
+            gene_symbol: Gene symbol
+            phase3_file: Phase 3 enriched data file
+            patient_file: Phase 1 virtual patient file
+            workspace: Run workspace for inputs and outputs (defaults to data/ and output/rdf)
+        """
+        ws = workspace or DEFAULT_WORKSPACE
         print(f"\n{'='*60}")
         print(f"Phase 4: RDF Knowledge Graph Assembly for {gene_symbol}")
         print(f"{'='*60}\n")
         
         # Load Phase 3 data
         if not phase3_file:
-            phase3_file = f"data/phase3/{gene_symbol}_enriched.json"
+            phase3_file = str(ws.enriched_file(gene_symbol))
         
         with open(phase3_file, 'r', encoding='utf-8') as f:
             enriched_data = json.load(f)
         
         # Load patient data
         if not patient_file:
-            patient_file = f"data/phase1/{gene_symbol}_virtual_patient.json"
+            patient_file = str(ws.virtual_patient_file(gene_symbol))
         
         with open(patient_file, 'r', encoding='utf-8') as f:
             patient_data = json.load(f)
         
         print(f"Loaded enriched data with {enriched_data['total_variants']} variants")
         
-        # Build graph
+        # Build graph (a fresh graph per gene - earlier genes are already on disk)
         print("Building RDF graph...")
-        self.build_from_enriched_data(enriched_data, patient_data)
-        
-        # Save
-        output_file = self.save(gene_symbol)
-        
-        print(f"\nPhase 4 Complete!")
-        print(f"   Total triples: {len(self.graph)}")
+        self.graph = self.new_graph()
+        try:
+            self.build_from_enriched_data(enriched_data, patient_data)
+            
+            # Save
+            output_file = self.save(gene_symbol, workspace=workspace)
+            
+            print(f"\nPhase 4 Complete!")
+            print(f"   Total triples: {len(self.graph)}")
+        finally:
+            # Release the gene's triples once they are serialised
+            self.graph = None
         
         return str(output_file)
+    
+    def merge_gene_graphs(self, gene_symbols: List[str], workspace: Optional[RunWorkspace] = None) -> Graph:
+        """
+        Build a combined graph from saved per-gene graphs on demand
+        
+        Args:
+            gene_symbols: Genes whose knowledge graphs should be merged
+            workspace: Run workspace the graphs were saved to (defaults to output/rdf)
+        
+        Returns:
+            New graph holding the union of the gene graphs
+        """
+        merged = Graph()
+        self._bind_namespaces(merged)
+        rdf_dir = workspace.rdf_dir if workspace else self.output_dir
+        for gene_symbol in gene_symbols:
+            gene_file = rdf_dir / f"{gene_symbol}_knowledge_graph.ttl"
+            if gene_file.exists():
+                merged.parse(str(gene_file), format="turtle")
+            else:
+                print(f"   No RDF graph saved for {gene_symbol}, skipping")
+        return merged
 
 
 if __name__ == "__main__":
@@ -0,0 +1,288 @@
+"""
+Triple Writer
+Streams Turtle / N-Triples straight from triples, without an rdflib Graph
+
+rdflib's Turtle serializer sorts and groups every subject before writing,
+which dominates export time for large panels. The writer here emits triples
+in the order they were added: consecutive triples about the same subject are
+grouped with ``;`` and IRIs are prefix-compressed with the graph's bindings.
+The output parses to the same graph (isomorphic), just not in sorted order.
+
+Terms may be rdflib terms (URIRef / Literal) or the plain ``IRI`` / ``Lit``
+types below, so callers that do not otherwise need rdflib can avoid importing it.
+"""
+import re
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+RDF_TYPE = RDF_NS + "type"
+
+# Always available alongside the caller's bindings
+DEFAULT_BINDINGS = {
+    "rdf": RDF_NS,
+    "rdfs": RDFS_NS,
+    "xsd": XSD_NS,
+}
+
+# Conservative PN_LOCAL subset - anything else is written as a full IRI
+_LOCAL_NAME = re.compile(r"^[A-Za-z0-9_](?:[A-Za-z0-9_\-.]*[A-Za-z0-9_\-])?$")
+_PREFIX_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_\-]*$")
+
+_STRING_ESCAPES = {
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+}
+_NEEDS_ESCAPE = re.compile(r'[\\"\n\r\t]')
+
+_NTRIPLES_FORMATS = ("nt", "ntriples", "nt11", "n-triples")
+_TURTLE_FORMATS = ("turtle", "ttl")
+
+
+class IRI(str):
+    """IRI term for callers not using rdflib"""
+    __slots__ = ()
+
+
+class Lit(namedtuple("Lit", ["value", "datatype", "lang"])):
+    """Literal term for callers not using rdflib"""
+    __slots__ = ()
+
+    def __new__(cls, value, datatype: Optional[str] = None, lang: Optional[str] = None):
+        return super().__new__(cls, value, datatype, lang)
+
+
+Triple = Tuple[object, object, object]
+
+
+def _is_literal(term) -> bool:
+    """True for Lit and rdflib Literal terms"""
+    return isinstance(term, Lit) or hasattr(term, "datatype")
+
+
+def _literal_parts(term) -> Tuple[str, Optional[str], Optional[str]]:
+    """Lexical form, datatype IRI and language of a literal term"""
+    if isinstance(term, Lit):
+        value = term.value
+        if isinstance(value, bool):
+            lexical = "true" if value else "false"
+        else:
+            lexical = value.isoformat() if hasattr(value, "isoformat") else str(value)
+        return lexical, term.datatype, term.lang
+    # rdflib Literal - str() is the lexical form
+    datatype = str(term.datatype) if term.datatype is not None else None
+    return str(term), datatype, term.language
+
+
+def _quote(lexical: str) -> str:
+    """Quote a lexical form as a short string"""
+    if _NEEDS_ESCAPE.search(lexical):
+        lexical = _NEEDS_ESCAPE.sub(lambda m: _STRING_ESCAPES[m.group(0)], lexical)
+    return f'"{lexical}"'
+
+
+def _full_iri(iri: str) -> str:
+    """Write an IRI in angle brackets"""
+    return f"<{iri}>"
+
+
+class _PrefixMap:
+    """Longest-namespace-first prefix compression"""
+
+    def __init__(self, bindings: Dict[str, str]):
+        self.bindings = {p: str(ns) for p, ns in bindings.items() if _PREFIX_NAME.match(p)}
+        self._by_length = sorted(
+            ((ns, p) for p, ns in self.bindings.items()),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self._cache: Dict[str, str] = {}
+
+    def iri(self, iri: str) -> str:
+        """Prefixed name for an IRI when possible, otherwise <iri>"""
+        cached = self._cache.get(iri)
+        if cached is not None:
+            return cached
+        text = _full_iri(iri)
+        for ns, prefix in self._by_length:
+            if iri.startswith(ns):
+                local = iri[len(ns):]
+                if local and _LOCAL_NAME.match(local):
+                    text = f"{prefix}:{local}"
+                    break
+        self._cache[iri] = text
+        return text
+
+
+def format_ntriples_term(term) -> str:
+    """Format a term for N-Triples"""
+    if _is_literal(term):
+        lexical, datatype, lang = _literal_parts(term)
+        if lang:
+            return f"{_quote(lexical)}@{lang}"
+        if datatype:
+            return f"{_quote(lexical)}^^{_full_iri(datatype)}"
+        return _quote(lexical)
+    return _full_iri(str(term))
+
+
+def _format_turtle_term(term, prefixes: _PrefixMap) -> str:
+    """Format a term for Turtle"""
+    if _is_literal(term):
+        lexical, datatype, lang = _literal_parts(term)
+        if lang:
+            return f"{_quote(lexical)}@{lang}"
+        if datatype:
+            return f"{_quote(lexical)}^^{prefixes.iri(datatype)}"
+        return _quote(lexical)
+    return prefixes.iri(str(term))
+
+
+def iter_ntriples(triples: Iterable[Triple]) -> Iterator[str]:
+    """Yield N-Triples lines"""
+    for s, p, o in triples:
+        yield f"{format_ntriples_term(s)} {format_ntriples_term(p)} {format_ntriples_term(o)} .\n"
+
+
+def iter_turtle(triples: Iterable[Triple], bindings: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    Yield Turtle text chunks
+
+    Args:
+        triples: Triples in output order
+        bindings: Prefix -> namespace IRI bindings
+
+    Yields:
+        Turtle text (prefix declarations, then one chunk per triple)
+    """
+    prefixes = _PrefixMap({**DEFAULT_BINDINGS, **(bindings or {})})
+    for prefix, ns in prefixes.bindings.items():
+        yield f"@prefix {prefix}: <{ns}> .\n"
+    yield "\n"
+
+    current = None
+    for s, p, o in triples:
+        predicate = "a" if str(p) == RDF_TYPE else _format_turtle_term(p, prefixes)
+        obj = _format_turtle_term(o, prefixes)
+        if s == current:
+            yield f" ;\n    {predicate} {obj}"
+        else:
+            if current is not None:
+                yield " .\n\n"
+            current = s
+            yield f"{_format_turtle_term(s, prefixes)} {predicate} {obj}"
+    if current is not None:
+        yield " .\n"
+
+
+def serialize_triples(triples: Iterable[Triple], format: str = "turtle",
+                      bindings: Optional[Dict[str, str]] = None) -> str:
+    """Serialize triples to a Turtle or N-Triples string"""
+    return "".join(_iter_format(triples, format, bindings))
+
+
+def write_triples(path: Union[str, Path], triples: Iterable[Triple], format: str = "turtle",
+                  bindings: Optional[Dict[str, str]] = None) -> Path:
+    """
+    Stream triples to a Turtle or N-Triples file
+
+    Args:
+        path: Output file path
+        triples: Triples in output order (may be a generator)
+        format: "turtle" or "nt"
+        bindings: Prefix -> namespace IRI bindings (Turtle only)
+
+    Returns:
+        Output path
+    """
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        for chunk in _iter_format(triples, format, bindings):
+            f.write(chunk)
+    return path
+
+
+def _iter_format(triples: Iterable[Triple], format: str, bindings: Optional[Dict[str, str]]) -> Iterator[str]:
+    """Dispatch to the Turtle or N-Triples emitter"""
+    fmt = format.lower()
+    if fmt in _TURTLE_FORMATS:
+        return iter_turtle(triples, bindings)
+    if fmt in _NTRIPLES_FORMATS:
+        return iter_ntriples(triples)
+    raise ValueError(f"Unsupported format for triple writer: {format}")
+
+
+class TripleBuffer:
+    """
+    Ordered, de-duplicated triple collection with the Graph methods the
+    builders use (add, bind, len, iteration, serialize)
+
+    Serializing to Turtle or N-Triples goes through the streaming writer;
+    other formats are handed to rdflib via to_graph().
+    """
+
+    def __init__(self):
+        self._triples: Dict[Triple, None] = {}
+        self.bindings: Dict[str, str] = {}
+
+    def bind(self, prefix: str, namespace):
+        """Record a prefix binding"""
+        self.bindings[prefix] = str(namespace)
+
+    def add(self, triple: Triple):
+        """Add a triple (duplicates are ignored, as in rdflib)"""
+        self._triples[triple] = None
+        return self
+
+    def __len__(self) -> int:
+        return len(self._triples)
+
+    def __iter__(self) -> Iterator[Triple]:
+        return iter(self._triples)
+
+    def serialize(self, destination: Union[str, Path, None] = None, format: str = "turtle",
+                  encoding: Optional[str] = None):
+        """
+        Serialize like rdflib's Graph.serialize
+
+        Args:
+            destination: Output file path, or None to return the text
+            format: "turtle"/"ttl", "nt"/"ntriples" or any rdflib format
+            encoding: Ignored for files (always UTF-8); encodes returned text when given
+
+        Returns:
+            Serialized text (or bytes when encoding is given) if no destination
+        """
+        if format.lower() not in _TURTLE_FORMATS + _NTRIPLES_FORMATS:
+            return self.to_graph().serialize(destination=destination, format=format, encoding=encoding)
+
+        if destination is not None:
+            write_triples(destination, self, format, self.bindings)
+            return None
+        text = serialize_triples(self, format, self.bindings)
+        return text.encode(encoding) if encoding else text
+
+    def to_graph(self):
+        """Build an rdflib Graph holding the same triples"""
+        from rdflib import Graph, Literal, URIRef
+
+        def to_term(term):
+            if isinstance(term, Lit):
+                lexical, datatype, lang = _literal_parts(term)
+                return Literal(lexical, datatype=URIRef(datatype) if datatype else None, lang=lang)
+            if isinstance(term, IRI):
+                return URIRef(term)
+            return term
+
+        graph = Graph()
+        for prefix, ns in self.bindings.items():
+            graph.bind(prefix, ns)
+        for s, p, o in self._triples:
+            graph.add((to_term(s), to_term(p), to_term(o)))
+        return graph
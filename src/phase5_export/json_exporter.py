@@ -2,10 +2,14 @@
 JSON-LD Exporter
 Exports knowledge graph as JSON-LD
 """
-import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.json_writer import load_json, write_json_streaming
+from utils.run_workspace import DEFAULT_WORKSPACE, RunWorkspace
 
 
 class JSONLDExporter:
@@ -523,58 +527,68 @@ class JSONLDExporter:
         
         return nodes if nodes else {"genePublications": []}
     
-    def export(self, enriched_data: Dict, patient_data: Dict, gene_symbol: str) -> str:
-        """Export complete JSON-LD knowledge graph"""
+    def iter_graph_nodes(self, enriched_data: Dict, patient_data: Dict, gene_symbol: str) -> Iterator[Dict]:
+        """
+        Yield the @graph nodes for a gene one at a time
+
+        Args:
+            enriched_data: Phase 3 enriched data
+            patient_data: Phase 1 virtual patient
+            gene_symbol: Gene symbol
+
+        Yields:
+            Patient, genotype, variant and gene nodes in graph order
+        """
         genotype_id = f"http://pgx-kg.org/genotype/geno_{gene_symbol.lower()}_001"
-        
-        # Build JSON-LD structure
-        jsonld = {
-            "@context": self.build_context(),
-            "@graph": [
-                self.build_patient_node(patient_data, genotype_id),
-                self.build_genotype_node(
-                    gene_symbol, 
-                    enriched_data.get("variants", []),
-                    enriched_data.get("metabolizer_phenotype")
-                ),
-                *self.build_variant_nodes(
-                    enriched_data.get("variants", [])[:20],  # Limit to 20
-                    gene_symbol,
-                    enriched_data["protein_id"]
-                ),
-                self.build_gene_node(
-                    enriched_data["protein_id"],
-                    gene_symbol,
-                    enriched_data.get("hgnc", {})
-                )
-            ]
-        }
-        
-        # Save
-        output_file = self.output_dir / f"{gene_symbol}_knowledge_graph.jsonld"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(jsonld, f, indent=2)
+        variants = enriched_data.get("variants", [])
+
+        yield self.build_patient_node(patient_data, genotype_id)
+        yield self.build_genotype_node(
+            gene_symbol,
+            variants,
+            enriched_data.get("metabolizer_phenotype")
+        )
+        yield from self.build_variant_nodes(
+            variants[:20],  # Limit to 20
+            gene_symbol,
+            enriched_data["protein_id"]
+        )
+        yield self.build_gene_node(
+            enriched_data["protein_id"],
+            gene_symbol,
+            enriched_data.get("hgnc", {})
+        )
+
+    def export(self, enriched_data: Dict, patient_data: Dict, gene_symbol: str,
+               workspace: Optional[RunWorkspace] = None) -> str:
+        """Export complete JSON-LD knowledge graph"""
+        # Nodes are encoded as they are built rather than held as one document
+        output_dir = workspace.json_dir if workspace else self.output_dir
+        output_file = output_dir / f"{gene_symbol}_knowledge_graph.jsonld"
+        write_json_streaming(
+            output_file,
+            {"@context": self.build_context()},
+            {"@graph": self.iter_graph_nodes(enriched_data, patient_data, gene_symbol)}
+        )
         
         print(f"   JSON-LD saved: {output_file}")
         return str(output_file)
     
     def run_pipeline(self, gene_symbol: str, phase3_file: str = None, 
-                     patient_file: str = None) -> str:
+                     patient_file: str = None, workspace: Optional[RunWorkspace] = None) -> str:
         """Execute JSON-LD export"""
         print(f"Exporting JSON-LD...")
+        ws = workspace or DEFAULT_WORKSPACE
         
         # Load data
         if not phase3_file:
-            phase3_file = f"data/phase3/{gene_symbol}_enriched.json"
+            phase3_file = ws.enriched_file(gene_symbol)
         
-        with open(phase3_file, 'r', encoding='utf-8') as f:
-            enriched_data = json.load(f)
+        enriched_data = load_json(phase3_file)
         
         if not patient_file:
-            patient_file = f"data/phase1/{gene_symbol}_virtual_patient.json"
+            patient_file = ws.virtual_patient_file(gene_symbol)
         
-        with open(patient_file, 'r', encoding='utf-8') as f:
-            patient_data = json.load(f)
+        patient_data = load_json(patient_file)
         
-        return self.export(enriched_data, patient_data, gene_symbol)
-
+        return self.export(enriched_data, patient_data, gene_symbol, workspace)
@@ -0,0 +1,338 @@
+"""
+Report Model
+Precomputed data for the HTML report templates
+
+The per-gene and comprehensive reports are rendered from plain dictionaries
+built here in a single pass over the variants, so the templates only loop
+and print. The drug groupings are computed once and shared: the per-gene
+drug table comes from the same pass as the variant table, and the
+comprehensive model carries the drug-gene matrix that is also written as
+the Drug Matrix JSON.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+
+MAX_VARIANT_ROWS = 20
+MAX_DRUG_ROWS = 15
+POPULATION_GROUPS = ("African", "Asian", "Caucasian/European", "Hispanic/Latino")
+
+
+def get_rsid(variant: dict) -> Optional[str]:
+    """Extract rsID (without the "rs" prefix) from variant"""
+    for xref in variant.get("xrefs", []):
+        if xref.get("name") == "dbSNP":
+            return xref.get("id", "").replace("rs", "")
+    return None
+
+
+def get_clinical_significance(variant: dict) -> str:
+    """Get clinical significance"""
+    clin_sigs = [sig["type"] for sig in variant.get("clinicalSignificances", [])]
+    return clin_sigs[0] if clin_sigs else "Unknown"
+
+
+def get_protein_change(variant: dict) -> Optional[str]:
+    """Extract protein change from variant"""
+    for loc in variant.get("locations", []):
+        if "loc" in loc and loc["loc"].startswith("p."):
+            return loc["loc"]
+    return None
+
+
+def has_drug_response(variant: dict) -> bool:
+    """Check if variant affects drug response"""
+    for sig in variant.get("clinicalSignificances", []):
+        if "drug" in sig["type"].lower() or "response" in sig["type"].lower():
+            return True
+    return False
+
+
+def is_pathogenic(variant: dict) -> bool:
+    """Check if variant is pathogenic"""
+    for sig in variant.get("clinicalSignificances", []):
+        if "pathogenic" in sig["type"].lower():
+            return True
+    return False
+
+
+def evidence_color(strength: str) -> str:
+    """Get color for evidence strength"""
+    strength_lower = strength.lower()
+    if strength_lower in ["very high", "high"]:
+        return "#27ae60"  # Green
+    elif strength_lower == "moderate":
+        return "#f39c12"  # Orange
+    elif strength_lower == "low":
+        return "#e67e22"  # Dark orange
+    elif strength_lower == "very low":
+        return "#e74c3c"  # Red
+    else:
+        return "#7f8c8d"  # Gray
+
+
+def phenotype_color(phenotype: str) -> str:
+    """Get color for a metabolizer phenotype"""
+    if "Normal" in phenotype:
+        return "#27ae60"  # Green
+    elif "Poor" in phenotype:
+        return "#e74c3c"  # Red
+    elif "Intermediate" in phenotype:
+        return "#f39c12"  # Orange
+    elif "Ultrarapid" in phenotype:
+        return "#3498db"  # Blue
+    return "#7f8c8d"  # Default gray
+
+
+def _variant_row(variant: dict, rsid: str) -> Dict:
+    """Variant table row of the per-gene report"""
+    clin_sig = get_clinical_significance(variant)
+    star_rating = variant.get("clinvar", {}).get("star_rating", 0)
+
+    # ClinVar evidence interpretation as tooltip
+    clinvar_evidence = variant.get("clinvar", {}).get("evidence_interpretation", {})
+    star_tooltip = ""
+    if clinvar_evidence:
+        star_tooltip = f"title=\"{clinvar_evidence.get('description', '')} - {clinvar_evidence.get('clinical_actionability', '')}\""
+
+    drug_names = []
+    if "pharmgkb" in variant and "drugs" in variant["pharmgkb"]:
+        drug_names = [d["name"] for d in variant["pharmgkb"]["drugs"][:3]]
+
+    # CSS class based on significance
+    css_class = ""
+    if "drug" in clin_sig.lower():
+        css_class = "drug-response"
+    elif "pathogenic" in clin_sig.lower():
+        css_class = "pathogenic"
+    elif "uncertain" in clin_sig.lower():
+        css_class = "vus"
+
+    return {
+        "rsid": rsid,
+        "clinical_significance": clin_sig,
+        "css_class": css_class,
+        "protein_change": get_protein_change(variant) or "N/A",
+        "stars": "⭐" * star_rating if star_rating else "N/A",
+        "star_tooltip": star_tooltip,
+        "drugs": ", ".join(drug_names) if drug_names else "None",
+    }
+
+
+def _drug_row(drug: Dict) -> Dict:
+    """Drug table row of the per-gene report"""
+    recommendation = drug["recommendation"]
+    if len(recommendation) > 100:
+        recommendation = recommendation[:100] + "..."
+
+    description = drug["evidence_description"] or drug["first_interpretation_description"]
+    tooltip_parts = []
+    if description:
+        tooltip_parts.append(description)
+    if drug["interpretation_recommendation"]:
+        tooltip_parts.append(f"Recommendation: {drug['interpretation_recommendation']}")
+
+    return {
+        "name": drug["name"],
+        "variants": ", ".join(drug["variants"][:5]),
+        "evidence_level": drug["evidence_level"],
+        "evidence_strength": drug["evidence_strength"],
+        "evidence_color": evidence_color(drug["evidence_strength"]),
+        "tooltip": " | ".join(tooltip_parts),
+        "recommendation": recommendation or "See clinical guidelines",
+    }
+
+
+def build_gene_report_model(enriched_data: dict, gene_symbol: str, generated: datetime = None) -> Dict:
+    """
+    Build the per-gene report model in one pass over the variants
+
+    Args:
+        enriched_data: Phase 3 output (variants and metabolizer phenotype)
+        gene_symbol: Gene symbol
+        generated: Report timestamp (default: now)
+
+    Returns:
+        Model dictionary for gene_report.html.j2
+    """
+    variants = enriched_data.get("variants", [])
+
+    phenotype_info = enriched_data.get("metabolizer_phenotype", {})
+    phenotype = phenotype_info.get("phenotype", "Not determined")
+
+    drug_response_count = 0
+    pathogenic_count = 0
+    variant_rows = []
+    # Drug name -> grouping, in first-seen order
+    drugs: Dict[str, Dict] = {}
+
+    for index, variant in enumerate(variants):
+        if has_drug_response(variant):
+            drug_response_count += 1
+        if is_pathogenic(variant):
+            pathogenic_count += 1
+
+        rsid = get_rsid(variant)
+        if index < MAX_VARIANT_ROWS and rsid:
+            variant_rows.append(_variant_row(variant, rsid))
+
+        if "pharmgkb" not in variant or "drugs" not in variant["pharmgkb"]:
+            continue
+        interpreted = set()
+        for drug in variant["pharmgkb"]["drugs"]:
+            drug_name = drug["name"]
+            entry = drugs.get(drug_name)
+            if entry is None:
+                entry = drugs[drug_name] = {
+                    "name": drug_name,
+                    "variants": [],
+                    "recommendation": drug.get("recommendation", ""),
+                    "evidence_level": drug.get("evidence_level", ""),
+                    "evidence_strength": drug.get("evidence_interpretation", {}).get("strength", "Unknown"),
+                    "evidence_description": drug.get("evidence_interpretation", {}).get("description", ""),
+                    "first_interpretation_description": "",
+                    "interpretation_recommendation": "",
+                }
+            if rsid:
+                entry["variants"].append(f"rs{rsid}")
+
+            # Tooltip: the first non-empty interpretation description, and the
+            # recommendation of the last variant interpreting this drug
+            # (the first matching entry within each variant)
+            interpretation = drug.get("evidence_interpretation")
+            if interpretation and drug_name not in interpreted:
+                interpreted.add(drug_name)
+                entry["interpretation_recommendation"] = interpretation.get("recommendation", "")
+                if not entry["first_interpretation_description"]:
+                    entry["first_interpretation_description"] = interpretation.get("description", "")
+
+    drug_rows = [_drug_row(drug) for drug in list(drugs.values())[:MAX_DRUG_ROWS]]
+
+    return {
+        "gene_symbol": gene_symbol,
+        "generated": (generated or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+        "phenotype": phenotype,
+        "diplotype": phenotype_info.get("diplotype", "Unknown/Unknown"),
+        "functionality": phenotype_info.get("functionality", "Unknown/Unknown"),
+        "phenotype_color": phenotype_color(phenotype),
+        "total_variants": len(variants),
+        "drug_response_count": drug_response_count,
+        "pathogenic_count": pathogenic_count,
+        "drug_count": len(drugs),
+        "variant_rows": variant_rows,
+        "drug_rows": drug_rows,
+    }
+
+
+def _add_to_drug_matrix(matrix: Dict, variant: dict):
+    """Record a variant's drugs in the drug-gene matrix"""
+    gene = variant.get("gene")
+    for drug_info in variant.get("drugs", []):
+        drug_name = drug_info.get("name")
+        if drug_name and gene:
+            if drug_name not in matrix:
+                matrix[drug_name] = {}
+
+            matrix[drug_name][gene] = {
+                "variant": variant.get("variant_id"),
+                "recommendation": drug_info.get("recommendation"),
+                "evidence_level": drug_info.get("evidence_level"),
+                "clinical_significance": variant.get("clinical_significance")
+            }
+
+
+def drug_matrix(variants: list) -> Dict:
+    """Create drug-gene interaction matrix"""
+    matrix = {}
+    for variant in variants:
+        _add_to_drug_matrix(matrix, variant)
+    return matrix
+
+
+def _format_pct(value) -> str:
+    return f"{round(value*100, 1)}%" if isinstance(value, (int, float)) else "N/A"
+
+
+def build_comprehensive_report_model(profile: dict, gene_results: dict) -> Dict:
+    """
+    Build the comprehensive report model in one pass over the variants
+
+    Args:
+        profile: Comprehensive patient profile
+        gene_results: Results from gene analysis
+
+    Returns:
+        Model dictionary for comprehensive_report.html.j2, including the
+        drug-gene matrix
+    """
+    pgx = profile.get('pharmacogenomics_profile', {})
+
+    genes = [
+        {
+            "gene": gene,
+            "success": result.get("success", False),
+            "variants_processed": result.get("variants_processed", 0),
+            "error": result.get("error", ""),
+        }
+        for gene, result in gene_results.items()
+    ]
+
+    variants = []
+    matrix = {}
+    for variant in profile.get("variants", []):
+        _add_to_drug_matrix(matrix, variant)
+
+        row = {
+            "variant_id": variant.get('variant_id', 'Unknown'),
+            "gene": variant.get('gene', 'Unknown'),
+            "clinical_significance": variant.get('clinical_significance', 'Unknown'),
+            "drug_count": len(variant.get('drugs', [])),
+            "frequencies": None,
+        }
+        # Ethnicity-aware population frequencies (if available)
+        freqs = variant.get('population_frequencies') or {}
+        patient_pf = variant.get('patient_population_frequency')
+        if freqs or patient_pf is not None:
+            row["frequencies"] = [(group, _format_pct(freqs.get(group))) for group in POPULATION_GROUPS]
+            row["patient_frequency"] = _format_pct(patient_pf) if patient_pf is not None else None
+            row["population_significance"] = variant.get('population_significance') or 'unknown'
+            row["ethnicity_context"] = variant.get('ethnicity_context')
+        variants.append(row)
+
+    linking = profile.get("variant_linking")
+    conflicts = None
+    if linking is not None:
+        conflicts = [
+            {
+                "title": conflict.get('title', 'Unknown Conflict'),
+                "severity": conflict.get('severity', 'Unknown'),
+                "severity_class": conflict.get("severity", "info").lower(),
+                "description": conflict.get('description', 'No description'),
+            }
+            for conflict in linking.get("conflicts", [])
+        ]
+
+    return {
+        "identifier": profile.get('identifier', 'Unknown'),
+        "generated": profile.get('dateCreated', 'Unknown'),
+        "description": profile.get('description', 'No description'),
+        "genes_analyzed": ', '.join(pgx.get('genes_analyzed', [])),
+        "total_variants": pgx.get('total_variants', 0),
+        "affected_drug_count": len(pgx.get('affected_drugs', [])),
+        "disease_count": len(pgx.get('associated_diseases', [])),
+        "gene_results": genes,
+        "variants": variants,
+        "adjustments": [
+            {
+                "drug": adj.get('drug', 'Medication'),
+                "gene": adj.get('gene', 'Unknown'),
+                "adjustment": adj.get('adjustment', 'N/A'),
+                "strength": adj.get('strength', 'info'),
+                "rationale": adj.get('rationale', ''),
+            }
+            for adj in profile.get("ethnicity_medication_adjustments", [])
+        ],
+        "has_linking": linking is not None,
+        "conflicts": conflicts,
+        "data_source": profile.get('dataSource', 'Unknown data sources'),
+        "drug_matrix": matrix,
+    }
@@ -0,0 +1,81 @@
+"""
+Report Templates
+Compiled Jinja2 templates for the HTML reports
+
+Templates live in templates/ next to this module. The environment is created
+once per process, so each template is compiled once, and the compiled
+bytecode is cached under data/cache/templates for later processes. Reports
+are streamed to disk chunk by chunk instead of being assembled in memory.
+"""
+import threading
+from pathlib import Path
+from typing import Dict, Union
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+BYTECODE_CACHE_DIR = Path("data/cache/templates")
+
+_environment = None
+_environment_lock = threading.Lock()
+
+
+def get_report_environment() -> Environment:
+    """Get the process-wide template environment (created on first use)"""
+    global _environment
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                bytecode_cache = None
+                try:
+                    BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    bytecode_cache = FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR))
+                except OSError as e:
+                    print(f"⚠️ Template bytecode cache disabled: {e}")
+                # Values are inserted as-is, like the reports always have been
+                _environment = Environment(
+                    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                    bytecode_cache=bytecode_cache,
+                    autoescape=False,
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    keep_trailing_newline=True,
+                    auto_reload=False,
+                )
+    return _environment
+
+
+def render_report(template_name: str, model: Dict) -> str:
+    """
+    Render a report template to a string
+
+    Args:
+        template_name: Template file in templates/
+        model: Report model
+
+    Returns:
+        Rendered HTML
+    """
+    return get_report_environment().get_template(template_name).render(model)
+
+
+def write_report(template_name: str, model: Dict, output_file: Union[str, Path]) -> Path:
+    """
+    Stream a rendered report to disk (to a temporary file first, then renamed into place)
+
+    Args:
+        template_name: Template file in templates/
+        model: Report model
+        output_file: HTML output path
+
+    Returns:
+        Output path
+    """
+    output_file = Path(output_file)
+    tmp_path = output_file.with_name(output_file.name + ".partial")
+    template = get_report_environment().get_template(template_name)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for chunk in template.generate(model):
+            f.write(chunk)
+    tmp_path.replace(output_file)
+    return output_file
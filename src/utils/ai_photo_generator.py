@@ -1,24 +1,126 @@
 """
 AI-Powered Patient Photo Generator
 Generates realistic patient photos based on demographics and medical conditions
+
+Generated photos are cached by a hash of the normalised prompt (in memory
+and under data/cache/photos), so patients with the same visible features
+share one photo instead of paying for another API call. Photos can be
+generated in the background with submit_patient_photo(), and the "stub"
+service draws a local placeholder portrait for testing without an API key.
 """
 import os
+import io
+import re
+import copy
 import base64
+import hashlib
+import threading
 import requests
-from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 from pathlib import Path
 
+try:
+    from PIL import Image, ImageDraw
+    _pil_available = True
+except ImportError:
+    _pil_available = False
+
+PHOTO_CACHE_DIR = Path("data/cache/photos")
+_MEMORY_CACHE_SIZE = 64
+GEMINI_CANDIDATE_MODELS = (
+    "imagen-4.0-generate-001",
+    "imagen-4.0-ultra-generate-001",
+    "imagen-4.0-fast-generate-001",
+)
+
+# Prompt hash -> image bytes (most recently used last)
+_photo_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_photo_cache_lock = threading.Lock()
+
+# API key hash -> {"order": model names to try, "discovered": models.list() already ran}
+_gemini_models: Dict[str, Dict] = {}
+_gemini_lock = threading.Lock()
+
+_photo_executor = None
+_photo_executor_lock = threading.Lock()
+
+
+def normalise_prompt(prompt: str) -> str:
+    """
+    Normalise a prompt for use as a cache key
+
+    Case, whitespace and empty comma-separated parts are ignored, and exact
+    ages are bucketed into five-year bands ("57-year-old" -> "55-year-old"),
+    so patients who would look the same share a cache entry.
+
+    Args:
+        prompt: Image generation prompt
+
+    Returns:
+        Normalised prompt
+    """
+    text = re.sub(r"\s+", " ", (prompt or "").lower())
+    text = re.sub(r"(\d+)-year-old", lambda m: f"{int(m.group(1)) // 5 * 5}-year-old", text)
+    return ", ".join(part.strip() for part in text.split(",") if part.strip())
+
+
+def photo_cache_key(service: str, prompt: str) -> str:
+    """Cache key for a photo: hash of the service and the normalised prompt"""
+    return hashlib.sha256(f"{service}\n{normalise_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+def _cached_photo(key: str) -> Optional[bytes]:
+    """Photo bytes from the memory or disk cache"""
+    with _photo_cache_lock:
+        photo = _photo_cache.get(key)
+        if photo is not None:
+            _photo_cache.move_to_end(key)
+            return photo
+
+    path = PHOTO_CACHE_DIR / f"{key}.png"
+    try:
+        photo = path.read_bytes()
+    except OSError:
+        return None
+    _remember_photo(key, photo)
+    return photo
+
+
+def _remember_photo(key: str, photo: bytes):
+    """Keep photo bytes in the memory cache"""
+    with _photo_cache_lock:
+        _photo_cache[key] = photo
+        _photo_cache.move_to_end(key)
+        while len(_photo_cache) > _MEMORY_CACHE_SIZE:
+            _photo_cache.popitem(last=False)
+
+
+def _store_photo(key: str, photo: bytes):
+    """Add a generated photo to the memory and disk caches"""
+    _remember_photo(key, photo)
+    try:
+        PHOTO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = PHOTO_CACHE_DIR / f"{key}.png"
+        tmp_path = path.with_name(path.name + ".partial")
+        tmp_path.write_bytes(photo)
+        tmp_path.replace(path)
+    except OSError as e:
+        print(f"⚠️ Could not write photo cache: {e}")
+
 
 class AIPhotoGenerator:
     """Generates realistic patient photos using AI"""
 
-    def __init__(self, api_key: str = None, service: str = "gemini"):
+    def __init__(self, api_key: str = None, service: str = "gemini", use_cache: bool = True):
         """
         Initialize photo generator
 
         Args:
             api_key: API key for the AI service
-            service: Which service to use ("gemini", "openai", "stability")
+            service: Which service to use ("gemini", "openai", "stability", or "stub" for local testing)
+            use_cache: Re-use photos generated for the same normalised prompt
         """
         # Choose API key based on selected service; allow explicit api_key to override
         if api_key:
@@ -33,6 +135,7 @@ class AIPhotoGenerator:
             else:
                 self.api_key = None
         self.service = service
+        self.use_cache = use_cache
         self.last_error: Optional[str] = None
 
     def generate_patient_photo(self, patient_data: Dict) -> Optional[bytes]:
@@ -55,22 +158,35 @@ class AIPhotoGenerator:
         # Build detailed prompt from patient data
         prompt = self._build_prompt(patient_data)
 
+        cache_key = photo_cache_key(self.service, prompt) if self.use_cache else None
+        if cache_key:
+            photo = _cached_photo(cache_key)
+            if photo is not None:
+                print(f"📸 Re-using cached patient photo ({cache_key[:12]})")
+                return photo
+
         print(f"🎨 Generating patient photo...")
         print(f"📝 Prompt: {prompt[:200]}...")
 
         # Generate image using selected service
         if self.service == "gemini" and self.api_key:
-            return self._generate_with_gemini(prompt)
+            photo = self._generate_with_gemini(prompt)
         elif self.service == "openai" and self.api_key:
-            return self._generate_with_openai(prompt)
+            photo = self._generate_with_openai(prompt)
         elif self.service == "stability" and self.api_key:
-            return self._generate_with_stability(prompt)
+            photo = self._generate_with_stability(prompt)
+        elif self.service == "stub":
+            photo = self._generate_with_stub(prompt)
         else:
             msg = "No API key configured, using fallback avatar"
             print(f"⚠️ {msg}")
             self.last_error = msg
             return None
 
+        if photo and cache_key:
+            _store_photo(cache_key, photo)
+        return photo
+
     def _build_prompt(self, patient_data: Dict) -> str:
         """Build detailed prompt from patient data"""
         # Defensive fallback: always create prompt_parts as a last resort
@@ -437,7 +553,11 @@ class AIPhotoGenerator:
     def _generate_with_gemini(self, prompt: str) -> Optional[bytes]:
         """Generate image using Google Gemini/Imagen via Google AI Studio.
 
-        Supports multiple client import paths and response shapes.
+        Supports multiple client import paths and response shapes. The order
+        in which models are tried is kept for the process lifetime (see
+        _gemini_model_state): models that are not found are dropped, the one
+        that works moves to the front, and the model list is only fetched
+        when none of the known models work.
         """
         client = None
         genai_mod = None
@@ -478,107 +598,28 @@ class AIPhotoGenerator:
                 )
 
             print(f"🎨 Starting image generation")
-            # Try supported models in order, stop on first that works
-            # Prefer latest public model codes; fall back to older ones if enabled
-            candidate_models = [
-                # Imagen 4 family (2025) - Generally Available
-                "imagen-4.0-generate-001",
-                "imagen-4.0-ultra-generate-001",
-                "imagen-4.0-fast-generate-001",
-                # NOTE: Most Imagen 3 models are deprecated. Only Imagen 4 is actively supported.
-                # The auto-discovery fallback will handle finding available Imagen 3 models if needed.
-            ]
-
-            response = None
-            last_exc: Optional[Exception] = None
-            for model_id in candidate_models:
-                try:
-                    if cfg is not None:
-                        response = client.models.generate_images(
-                            model=model_id,
-                            prompt=prompt,
-                            config=cfg
-                        )
-                    else:
-                        response = client.models.generate_images(
-                            model=model_id,
-                            prompt=prompt
-                        )
-                    print(f"✅ Successfully using model: {model_id}")
-                    break
-                except Exception as e:
-                    last_exc = e
-                    # Try next model on NOT_FOUND or unsupported errors
-                    error_str = str(e)
-                    if "404" in error_str or "NOT_FOUND" in error_str:
-                        print(f"⚠️  Model {model_id} not found (404), trying next...")
-                    else:
-                        print(f"⚠️  Model {model_id} failed with error: {str(e)[:200]}")
-                    continue
+            state = _gemini_model_state(self.api_key)
+            with _gemini_lock:
+                models = list(state["order"])
+            response, last_exc = self._try_gemini_models(client, models, prompt, cfg, state)
 
-            if response is None:
-                # As a last resort, discover available models dynamically
+            if response is None and not state["discovered"]:
+                # As a last resort, discover available models dynamically (once per process)
                 print("🔍 No pre-configured models worked. Discovering available models...")
                 try:
-                    models = client.models.list()
-                    model_list = list(models)  # Convert to list for easier iteration
-                    # Debug: print capabilities for first few imagen models
-                    imagen_preview = [m for m in model_list if "imagen" in getattr(m, "name", "").lower()][:3]
-                    for m in imagen_preview:
-                        caps = getattr(m, "supported_generation_methods", []) or getattr(m, "supportedMethods", [])
-                        print(f"🔍 Model {getattr(m, 'name', 'unknown')}: methods={caps}")
-                    
-                    # Prefer imagen-4, then imagen-3 families that support generate_images
-                    def supports_image_gen(m):
-                        caps = getattr(m, "supported_generation_methods", []) or getattr(m, "supportedMethods", [])
-                        return any("generate_images" in str(c).lower() for c in caps)
-
-                    image_models = [m for m in model_list if supports_image_gen(m)]
-                    # Sort preference: imagen-4 first, then imagen-3, else anything with generate_images
-                    def score(m):
-                        name = getattr(m, "name", "") or ""
-                        if "imagen-4" in name:
-                            return 0
-                        if "imagen-3" in name:
-                            return 1
-                        return 2
-                    image_models.sort(key=score)
-
-                    if image_models:
-                        chosen = image_models[0].name
-                        print(f"📸 Auto-discovered working model: {chosen}")
-                        if cfg is not None:
-                            response = client.models.generate_images(model=chosen, prompt=prompt, config=cfg)
-                        else:
-                            response = client.models.generate_images(model=chosen, prompt=prompt)
-                    else:
-                        # If no models passed the filter, try imagen models anyway by name
-                        print("⚠️  No models matched generate_images capability filter. Trying imagen models by name...")
-                        imagen_models = [m for m in model_list if "imagen" in getattr(m, "name", "").lower()]
-                        if imagen_models:
-                            imagen_models.sort(key=lambda m: (
-                                0 if "imagen-4" in getattr(m, "name", "") else 1,
-                                0 if "generate" in getattr(m, "name", "") else 1
-                            ))
-                            chosen = imagen_models[0].name
-                            print(f"📸 Trying imagen model by name: {chosen}")
-                            try:
-                                if cfg is not None:
-                                    response = client.models.generate_images(model=chosen, prompt=prompt, config=cfg)
-                                else:
-                                    response = client.models.generate_images(model=chosen, prompt=prompt)
-                            except Exception as e:
-                                print(f"❌ Auto-discovery failed: {e}")
-                                self.last_error = f"Tried auto-discovered model {chosen} but it failed: {e}"
-                        else:
-                            all_model_names = [getattr(m, "name", "unknown") for m in model_list]
-                            self.last_error = f"No image-capable models available for this API key/project. Available models: {all_model_names}. Last error: {last_exc}"
-                            print(f"❌ {self.last_error}")
-                            return None
+                    discovered = self._discover_gemini_models(client, last_exc)
                 except Exception as e:
                     self.last_error = f"Model discovery failed and candidates unavailable. Last error: {last_exc}; discovery error: {e}"
                     print(f"❌ {self.last_error}")
                     return None
+                with _gemini_lock:
+                    state["discovered"] = True
+                    state["order"] += [m for m in discovered if m not in state["order"]]
+                if not discovered:
+                    return None
+                response, discovery_exc = self._try_gemini_models(
+                    client, [m for m in discovered if m not in models], prompt, cfg, state)
+                last_exc = discovery_exc or last_exc
 
             # Check if we got a response before trying to extract bytes
             if response is None:
@@ -631,6 +672,101 @@ class AIPhotoGenerator:
             print(f"❌ {self.last_error}")
             return None
 
+    def _try_gemini_models(self, client, models: List[str], prompt: str, cfg, state: Dict):
+        """
+        Try models in order and stop on the first that works
+
+        Models reported as not found are dropped from the process-wide order;
+        the working model is moved to its front.
+
+        Returns:
+            Tuple of (response or None, last exception or None)
+        """
+        last_exc: Optional[Exception] = None
+        for model_id in models:
+            try:
+                if cfg is not None:
+                    response = client.models.generate_images(
+                        model=model_id,
+                        prompt=prompt,
+                        config=cfg
+                    )
+                else:
+                    response = client.models.generate_images(
+                        model=model_id,
+                        prompt=prompt
+                    )
+                print(f"✅ Successfully using model: {model_id}")
+                with _gemini_lock:
+                    if model_id in state["order"]:
+                        state["order"].remove(model_id)
+                    state["order"].insert(0, model_id)
+                return response, None
+            except Exception as e:
+                last_exc = e
+                # Try next model on NOT_FOUND or unsupported errors
+                error_str = str(e)
+                if "404" in error_str or "NOT_FOUND" in error_str:
+                    print(f"⚠️  Model {model_id} not found (404), trying next...")
+                    with _gemini_lock:
+                        if model_id in state["order"]:
+                            state["order"].remove(model_id)
+                else:
+                    print(f"⚠️  Model {model_id} failed with error: {str(e)[:200]}")
+                continue
+        return None, last_exc
+
+    def _discover_gemini_models(self, client, last_exc: Optional[Exception]) -> List[str]:
+        """
+        List the models available to this API key, best image models first
+
+        Returns:
+            Model names (empty if none can generate images; last_error is set)
+        """
+        models = client.models.list()
+        model_list = list(models)  # Convert to list for easier iteration
+        # Debug: print capabilities for first few imagen models
+        imagen_preview = [m for m in model_list if "imagen" in getattr(m, "name", "").lower()][:3]
+        for m in imagen_preview:
+            caps = getattr(m, "supported_generation_methods", []) or getattr(m, "supportedMethods", [])
+            print(f"🔍 Model {getattr(m, 'name', 'unknown')}: methods={caps}")
+
+        # Prefer imagen-4, then imagen-3 families that support generate_images
+        def supports_image_gen(m):
+            caps = getattr(m, "supported_generation_methods", []) or getattr(m, "supportedMethods", [])
+            return any("generate_images" in str(c).lower() for c in caps)
+
+        image_models = [m for m in model_list if supports_image_gen(m)]
+        # Sort preference: imagen-4 first, then imagen-3, else anything with generate_images
+        def score(m):
+            name = getattr(m, "name", "") or ""
+            if "imagen-4" in name:
+                return 0
+            if "imagen-3" in name:
+                return 1
+            return 2
+        image_models.sort(key=score)
+
+        if image_models:
+            print(f"📸 Auto-discovered working model: {image_models[0].name}")
+            return [m.name for m in image_models]
+
+        # If no models passed the filter, try imagen models anyway by name
+        print("⚠️  No models matched generate_images capability filter. Trying imagen models by name...")
+        imagen_models = [m for m in model_list if "imagen" in getattr(m, "name", "").lower()]
+        if imagen_models:
+            imagen_models.sort(key=lambda m: (
+                0 if "imagen-4" in getattr(m, "name", "") else 1,
+                0 if "generate" in getattr(m, "name", "") else 1
+            ))
+            print(f"📸 Trying imagen model by name: {imagen_models[0].name}")
+            return [m.name for m in imagen_models]
+
+        all_model_names = [getattr(m, "name", "unknown") for m in model_list]
+        self.last_error = f"No image-capable models available for this API key/project. Available models: {all_model_names}. Last error: {last_exc}"
+        print(f"❌ {self.last_error}")
+        return []
+
     def _generate_with_stability(self, prompt: str) -> Optional[bytes]:
         """Generate image using Stability AI"""
         try:
@@ -681,6 +817,74 @@ class AIPhotoGenerator:
             self.last_error = err
             return None
 
+    def _generate_with_stub(self, prompt: str) -> Optional[bytes]:
+        """Generate a deterministic placeholder portrait locally (for testing, no API calls)"""
+        if not _pil_available:
+            self.last_error = "Pillow not installed; the stub photo backend needs it"
+            print(f"❌ {self.last_error}")
+            return None
+
+        digest = hashlib.sha256(normalise_prompt(prompt).encode("utf-8")).digest()
+        background = tuple(96 + b // 2 for b in digest[:3])
+        skin = tuple(120 + b // 3 for b in digest[3:6])
+
+        img = Image.new("RGB", (256, 256), background)
+        draw = ImageDraw.Draw(img)
+        draw.ellipse((78, 40, 178, 160), fill=skin)  # head
+        draw.rectangle((58, 170, 198, 256), fill=skin)  # shoulders
+
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        print("✅ Photo generated with the local stub backend")
+        return buffer.getvalue()
+
+
+def _gemini_model_state(api_key: str) -> Dict:
+    """Process-wide Gemini model order for an API key: {"order": [...], "discovered": bool}"""
+    key = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    with _gemini_lock:
+        if key not in _gemini_models:
+            _gemini_models[key] = {"order": list(GEMINI_CANDIDATE_MODELS), "discovered": False}
+        return _gemini_models[key]
+
+
+def get_photo_executor() -> ThreadPoolExecutor:
+    """Get the process-wide pool that generates photos in the background"""
+    global _photo_executor
+    if _photo_executor is None:
+        with _photo_executor_lock:
+            if _photo_executor is None:
+                _photo_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="photo")
+    return _photo_executor
+
+
+def submit_patient_photo(patient_data: Dict, api_key: str = None, service: str = "gemini") -> Future:
+    """
+    Generate a patient photo in the background
+
+    The prompt inputs (demographics and clinical information) are copied, so
+    the caller may keep editing the profile while the photo is generated.
+
+    Args:
+        patient_data: Patient profile
+        api_key: API key for the AI service (default: from the environment)
+        service: "gemini", "openai", "stability" or "stub"
+
+    Returns:
+        Future resolving to (image bytes or None, error message or None)
+    """
+    snapshot = copy.deepcopy({
+        'demographics': patient_data.get('demographics'),
+        'clinical_information': patient_data.get('clinical_information'),
+    })
+    generator = AIPhotoGenerator(api_key=api_key, service=service)
+
+    def run():
+        photo = generator.generate_patient_photo(snapshot)
+        return photo, generator.last_error
+
+    return get_photo_executor().submit(run)
+
 
 # Example usage
 if __name__ == "__main__":
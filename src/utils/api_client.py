@@ -1,12 +1,22 @@
 """Base API client with rate limiting and caching"""
 import requests
+import urllib3
 import time
 import json
 import hashlib
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, BinaryIO, Callable, Dict, Optional
 from datetime import datetime, timedelta
 
+from utils.json_writer import load_json, write_json
+
+# ijson (optional) parses streamed bodies in get_projected; its errors are not ValueErrors
+try:
+    import ijson
+    _STREAM_JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    _STREAM_JSON_ERRORS = (ValueError,)
+
 # Simple retry decorator (avoids external dependency issues)
 def retry(tries=3, delay=2, backoff=2):
     """
@@ -101,8 +111,7 @@ class APIClient:
             return None
         
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cached = json.load(f)
+            cached = load_json(cache_path)
             
             # Check if cache is expired
             cached_time = datetime.fromisoformat(cached['timestamp'])
@@ -127,8 +136,8 @@ class APIClient:
             'data': data
         }
         
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=2)
+        # Compact encoding - cache files are read back, never by hand
+        write_json(cache_path, cache_data)
     
     @retry(tries=3, delay=2, backoff=2)
     def get(self, endpoint: str, params: Optional[Dict] = None, 
@@ -195,3 +204,73 @@ class APIClient:
             print(f"  [JSON ERROR] {endpoint}: Invalid JSON response")
             return None
 
+    @retry(tries=3, delay=2, backoff=2)
+    def get_projected(self, endpoint: str, project: Callable[[BinaryIO], Any], projection: str,
+                      params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                      use_cache: bool = True, cache_ttl_days: int = 30) -> Optional[Any]:
+        """
+        GET a large JSON document, keeping (and caching) only a projection of it
+
+        The response body is streamed to ``project``, so the full document is
+        never held in memory or written to the cache - only what ``project``
+        returns is.
+
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            project: Callable reading the binary response stream and returning the projection
+            projection: Name of the projection (part of the cache key, so a
+                projection is never confused with the full document or another projection)
+            params: Query parameters
+            headers: HTTP headers
+            use_cache: Whether to use cache
+            cache_ttl_days: Cache TTL in days
+
+        Returns:
+            Projected data or None on failure
+        """
+        url = f"{self.base_url}/{endpoint}" if not endpoint.startswith('http') else endpoint
+
+        if use_cache:
+            cache_key = self._get_cache_key(url, {"params": params or {}, "projection": projection})
+            cached_data = self._load_from_cache(cache_key, cache_ttl_days)
+            if cached_data is not None:
+                if self._verbose_cache:
+                    print(f"  [CACHE HIT] {endpoint} ({projection})")
+                return cached_data
+
+        self._rate_limit_wait()
+
+        try:
+            with self.session.get(url, params=params, headers=headers, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Let urllib3 undo gzip/deflate transfer encoding while streaming
+                response.raw.decode_content = True
+                data = project(response.raw)
+
+            if use_cache:
+                self._save_to_cache(cache_key, data)
+                self._memory_cache[cache_key] = (datetime.now(), data)
+
+            return data
+
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 429:
+                print(f"  [RATE LIMIT] {endpoint}: Too many requests, waiting...")
+                time.sleep(5)
+                raise
+            elif e.response.status_code == 404:
+                return None
+            else:
+                print(f"  [API ERROR] {endpoint}: {e}")
+                return None
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            # The body is read from the raw urllib3 stream, so a dropped or timed
+            # out connection surfaces as urllib3's ProtocolError/ReadTimeoutError
+            print(f"  [API ERROR] {endpoint}: {e}")
+            return None
+        except _STREAM_JSON_ERRORS:
+            # Invalid or truncated body (json/orjson decode errors, ijson's
+            # IncompleteJSONError) - nothing is cached and callers fall back
+            print(f"  [JSON ERROR] {endpoint}: Invalid JSON response")
+            return None
+
@@ -0,0 +1,233 @@
+"""
+Clinical Knowledge Table
+Versioned, offline condition -> drug knowledge for patient generation
+
+The table (clinical_knowledge.json next to this module) maps SNOMED CT
+condition codes, their aliases and search terms to the drugs indicated for
+them, with DrugBank, ChEMBL, RxNorm and SNOMED CT identifiers and typical
+doses. DynamicClinicalGenerator consults it before any live API, and its
+offline fallback and the synthetic cohort generator draw from nothing else,
+so generating the clinical part of a profile needs no network access for the
+conditions it covers. The live APIs are only used to refresh the table:
+
+    python src/utils/clinical_knowledge.py --refresh
+"""
+import argparse
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+KNOWLEDGE_PATH = Path(__file__).parent / "clinical_knowledge.json"
+
+
+class ClinicalKnowledgeTable:
+    """Load-once condition -> drug lookup tables"""
+
+    def __init__(self, path: Union[str, Path] = KNOWLEDGE_PATH):
+        """
+        Load and index the knowledge table
+
+        Args:
+            path: JSON knowledge file
+        """
+        self.path = Path(path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+
+        self.version = self.data.get("version", "unversioned")
+        self.conditions: Dict[str, Dict] = self.data["conditions"]
+        self.drugs: Dict[str, Dict] = self.data["drugs"]
+
+        # Any known code (canonical or alias) -> canonical code
+        self._codes = {}
+        # Lower-cased search term -> canonical code
+        self._terms = {}
+        for code, entry in self.conditions.items():
+            self._codes[code] = code
+            for alias in entry.get("aliases", []):
+                self._codes[alias] = code
+            for term in entry.get("search_terms", []):
+                self._terms[term.lower()] = code
+        # Ordered (keyword, code) pairs for matching free-text condition labels
+        self._keywords = tuple((keyword.lower(), code) for keyword, code in self.data.get("keywords", []))
+
+    def resolve_code(self, snomed_code: Optional[str], condition_label: str = "") -> Optional[str]:
+        """
+        Find the table's condition for a SNOMED code or, failing that, a label
+
+        Args:
+            snomed_code: SNOMED CT code (canonical or alias), may be None
+            condition_label: Human-readable condition name
+
+        Returns:
+            Canonical condition code or None
+        """
+        code = self._codes.get(str(snomed_code)) if snomed_code else None
+        if code:
+            return code
+
+        label = (condition_label or "").lower()
+        if label in self._terms:
+            return self._terms[label]
+        for keyword, code in self._keywords:
+            if keyword in label:
+                return code
+        return None
+
+    def condition_for_term(self, search_term: str) -> Optional[Dict]:
+        """
+        Look up a condition search term
+
+        Args:
+            search_term: Search term (e.g. "diabetes type 2")
+
+        Returns:
+            New condition dictionary shaped like a SNOMED search result, or None
+        """
+        code = self._terms.get((search_term or "").lower())
+        if not code:
+            return None
+        entry = self.conditions[code]
+        return {
+            "@id": f"http://snomed.info/id/{code}",
+            "@type": "sdisco:Condition",
+            "snomed:code": code,
+            "rdfs:label": entry["label"],
+            "skos:prefLabel": entry.get("pref_label", entry["label"]),
+            "skos:definition": "",
+            "search_term": search_term
+        }
+
+    def drugs_for_condition(self, snomed_code: Optional[str], condition_label: str = "") -> List[Dict]:
+        """
+        Drugs indicated for a condition
+
+        Args:
+            snomed_code: SNOMED CT code (canonical or alias), may be None
+            condition_label: Human-readable condition name (used when the code is unknown)
+
+        Returns:
+            Drug entries from the table (shared - do not modify)
+        """
+        code = self.resolve_code(snomed_code, condition_label)
+        if not code:
+            return []
+        return [self.drugs[key] for key in self.conditions[code].get("drugs", []) if key in self.drugs]
+
+    def save(self, path: Union[str, Path] = None) -> Path:
+        """
+        Write the table (to a temporary file first, then renamed into place)
+
+        Args:
+            path: Output path (default: the file it was loaded from)
+
+        Returns:
+            Output path
+        """
+        path = Path(path or self.path)
+        tmp_path = path.with_name(path.name + ".partial")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        tmp_path.replace(path)
+        return path
+
+
+_knowledge = None
+_knowledge_lock = threading.Lock()
+
+
+def get_clinical_knowledge() -> ClinicalKnowledgeTable:
+    """Get the process-wide knowledge table (loaded on first use)"""
+    global _knowledge
+    if _knowledge is None:
+        with _knowledge_lock:
+            if _knowledge is None:
+                _knowledge = ClinicalKnowledgeTable()
+    return _knowledge
+
+
+def refresh_clinical_knowledge(generator=None, path: Union[str, Path] = KNOWLEDGE_PATH) -> Dict:
+    """
+    Refresh the drug identifiers in the table from the live APIs
+
+    RxNorm CUIs, SNOMED CT drug codes and ChEMBL IDs are looked up for every
+    drug. Identifiers are only replaced when a lookup succeeds, so a refresh
+    with some services unreachable never loses data. The version is set to the
+    refresh date.
+
+    Args:
+        generator: DynamicClinicalGenerator to query with (default: a new one
+            that bypasses the knowledge table)
+        path: Knowledge file to refresh
+
+    Returns:
+        Summary with the new version and the number of updated fields
+    """
+    global _knowledge
+    if generator is None:
+        from utils.dynamic_clinical_generator import DynamicClinicalGenerator
+        generator = DynamicClinicalGenerator(use_knowledge_table=False)
+
+    table = ClinicalKnowledgeTable(path)
+    names = [drug["name"] for drug in table.drugs.values()]
+    print(f"🔄 Refreshing {len(names)} drugs in clinical knowledge v{table.version}...")
+
+    compounds = generator.chembl_client.search_compounds_by_names(names)
+    updated = 0
+    for drug in table.drugs.values():
+        found = {}
+        rxnorm = generator._get_rxnorm_for_drug(drug["name"])
+        if rxnorm and rxnorm.get("rxnorm_cui"):
+            found["rxnorm_cui"] = str(rxnorm["rxnorm_cui"])
+        snomed_code = generator._get_snomed_code_for_drug(drug["name"])
+        if snomed_code:
+            found["snomed_code"] = str(snomed_code)
+        chembl_id = (compounds.get(drug["name"]) or {}).get("molecule_chembl_id")
+        if chembl_id:
+            found["chembl_id"] = chembl_id
+
+        for field, value in found.items():
+            if drug.get(field) != value:
+                drug[field] = value
+                updated += 1
+        print(f"  {'✅' if found else '⚠️ '} {drug['name']}: {', '.join(sorted(found)) or 'no live data'}")
+
+    now = datetime.now()
+    table.data["version"] = now.strftime("%Y.%m.%d")
+    table.data["refreshed"] = now.isoformat(timespec="seconds")
+    table.save()
+
+    # Later lookups in this process see the refreshed table
+    with _knowledge_lock:
+        _knowledge = None
+
+    print(f"✅ Clinical knowledge v{table.data['version']}: {updated} fields updated")
+    return {"version": table.data["version"], "updated_fields": updated, "drugs": len(names)}
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Inspect or refresh the offline clinical knowledge table")
+    parser.add_argument("--refresh", action="store_true", help="Refresh drug identifiers from the live APIs")
+    parser.add_argument("--path", default=str(KNOWLEDGE_PATH), help="Knowledge file")
+    args = parser.parse_args()
+
+    if args.refresh:
+        refresh_clinical_knowledge(path=args.path)
+        return
+
+    table = ClinicalKnowledgeTable(args.path)
+    print(f"Clinical knowledge v{table.version} (refreshed: {table.data.get('refreshed') or 'never'})")
+    print(f"  Conditions: {len(table.conditions)}  Drugs: {len(table.drugs)}")
+    for code, entry in table.conditions.items():
+        print(f"  {code:>10}  {entry['label']}: {', '.join(entry.get('drugs', [])) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,35 @@
 """Configuration management for PGx-KG"""
+import threading
 import yaml
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any
 
+# Sentinel for "looked up, nothing found" in the resolved-value cache
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert parsed YAML into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
 
 class Config:
-    """Loads and manages configuration from config.yaml"""
+    """Loads and manages configuration from config.yaml
+    
+    The parsed configuration is read-only, and every dot-notation lookup
+    (including the secrets fallback) is resolved once and cached, so a
+    single instance can be shared by all phases and threads. Use
+    get_config() to obtain the process-wide instance.
+    """
+    
+    # secrets.toml documents keyed by path - parsed at most once per process
+    _secrets_toml_cache: Dict[str, Dict] = {}
     
     def __init__(self, config_path: str = "config.yaml"):
         """
@@ -15,9 +39,11 @@ class Config:
             config_path: Path to config.yaml file
         """
         self.config_path = self._resolve_config_path(config_path)
-        self.config = self._load_config()
+        self.config = _freeze(self._load_config() or {})
+        self._resolved: Dict[str, Any] = {}
     
-    def _resolve_config_path(self, config_path: str) -> Path:
+    @staticmethod
+    def _resolve_config_path(config_path: str) -> Path:
         """
         Resolve config.yaml path - try multiple locations
         
@@ -75,11 +101,19 @@ class Config:
         Returns:
             Configuration value or default
         """
-        keys = key.split('.')
+        value = self._resolved.get(key)
+        if value is None:
+            value = self._resolve(key)
+            self._resolved[key] = value
+        
+        return value if value is not _MISSING else default
+    
+    def _resolve(self, key: str) -> Any:
+        """Look up a dot-notation key in the config, falling back to secrets"""
         value = self.config
         
-        for k in keys:
-            if isinstance(value, dict) and k in value:
+        for k in key.split('.'):
+            if isinstance(value, Mapping) and k in value:
                 value = value[k]
             else:
                 value = None
@@ -89,7 +123,7 @@ class Config:
         if not value or value == "":
             value = self._get_from_secrets(key)
         
-        return value if value else default
+        return value if value else _MISSING
     
     def _get_from_secrets(self, key: str) -> Any:
         """
@@ -141,8 +175,12 @@ class Config:
                 import toml
                 secrets_path = self._find_secrets_toml()
                 if secrets_path and secrets_path.exists():
-                    with open(secrets_path, 'r') as f:
-                        secrets = toml.load(f)
+                    cache_key = str(secrets_path)
+                    secrets = self._secrets_toml_cache.get(cache_key)
+                    if secrets is None:
+                        with open(secrets_path, 'r') as f:
+                            secrets = toml.load(f)
+                        self._secrets_toml_cache[cache_key] = secrets
                     
                     # Try nested access
                     keys = key.split('.')
@@ -217,6 +255,21 @@ class Config:
         """Get maximum variants per gene"""
         return self.get('output.max_variants_per_gene', 50)
     
+    @property
+    def features(self) -> Mapping:
+        """Get feature flags (read-only)"""
+        return self.get('features', MappingProxyType({}))
+    
+    def feature_enabled(self, name: str, default: bool = True) -> bool:
+        """
+        Check a feature flag from the ``features`` section
+        
+        Args:
+            name: Flag name (e.g., 'enable_chembl')
+            default: Value used when the flag is not configured
+        """
+        return bool(self.features.get(name, default))
+    
     @property
     def database_enabled(self) -> bool:
         """Check if database loading is enabled"""
@@ -228,43 +281,34 @@ class Config:
         return self.get('database.non_blocking', True)
 
 
-# Singleton instance
-_config_instance = None
+# Shared instances keyed by resolved config path
+_config_instances: Dict[str, Config] = {}
+_config_lock = threading.Lock()
 
 
 def get_config(config_path: str = None) -> Config:
     """
-    Get singleton Config instance
+    Get the shared Config instance for a config file
+    
+    config.yaml (and secrets.toml) are parsed once per process; every
+    later call with the same file returns the same instance.
     
     Args:
-        config_path: Optional path to config file
+        config_path: Optional path to config file (defaults to config.yaml)
         
     Returns:
         Config instance
     """
-    global _config_instance
-    if _config_instance is None:
-        if config_path is None:
-            # Try to find config.yaml in common locations
-            # Start from utils/config.py: src/pharmgx-clinical-dashboard/src/utils/config.py
-            # Go up 5 levels to reach project root: utils -> src -> pharmgx-clinical-dashboard -> src -> root
-            base_dir = Path(__file__).parent.parent.parent.parent.parent
-            config_path = base_dir / "config.yaml"
-            if not config_path.exists():
-                # Try src/pharmgx-clinical-dashboard (old location)
-                config_path = base_dir / "src" / "pharmgx-clinical-dashboard" / "config.yaml"
-            if not config_path.exists():
-                # Try current working directory
-                import os
-                config_path = Path(os.getcwd()) / "config.yaml"
-        try:
-            _config_instance = Config(str(config_path)) if config_path else Config()
-        except FileNotFoundError:
-            # Fallback: try relative path from current directory
-            import os
-            fallback_path = Path(os.getcwd()) / "config.yaml"
-            if fallback_path.exists():
-                _config_instance = Config(str(fallback_path))
-            else:
-                raise FileNotFoundError(f"Could not find config.yaml. Tried: {config_path}, {fallback_path}")
-    return _config_instance
\ No newline at end of file
+    resolved_path = Config._resolve_config_path(str(config_path or "config.yaml"))
+    if not resolved_path.exists():
+        raise FileNotFoundError(f"Could not find config.yaml. Tried: {config_path or 'config.yaml'}")
+    key = str(resolved_path.resolve())
+    
+    instance = _config_instances.get(key)
+    if instance is None:
+        with _config_lock:
+            instance = _config_instances.get(key)
+            if instance is None:
+                instance = Config(key)
+                _config_instances[key] = instance
+    return instance
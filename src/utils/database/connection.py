@@ -15,18 +15,28 @@ try:
 except ImportError:
     _toml_available = False
 
-# Try to import the Cloud SQL Connector (but don't instantiate yet)
-try:
-    from google.cloud.sql.connector import Connector
-    _connector_available = True
-except ImportError:
-    _connector_available = False
-    print("Warning: google-cloud-sql-connector not found. Cloud SQL connections will not work.")
+# The Cloud SQL Connector pulls in the google-auth stack, so it is imported
+# lazily the first time a Cloud SQL connection is requested (None = not tried yet)
+_connector_available = None
 
 # Global connector instance (created lazily only when needed)
 _connector = None
 
 
+def _import_connector():
+    """Import the Cloud SQL Connector class on first use"""
+    global _connector_available
+    try:
+        from google.cloud.sql.connector import Connector
+        _connector_available = True
+        return Connector
+    except ImportError:
+        if _connector_available is None:
+            print("Warning: google-cloud-sql-connector not found. Cloud SQL connections will not work.")
+        _connector_available = False
+        return None
+
+
 def _load_secrets_toml() -> Dict:
     """Load secrets.toml file manually (for use outside Streamlit context)"""
     if not _toml_available:
@@ -58,7 +68,8 @@ def _load_secrets_toml() -> Dict:
 def _get_connector():
     """Get or create the Cloud SQL Connector (lazy initialization)"""
     global _connector
-    if _connector is None and _connector_available:
+    Connector = _import_connector() if _connector is None and _connector_available is not False else None
+    if _connector is None and Connector is not None:
         try:
             # Add timeout to prevent hanging on metadata service calls
             import threading
@@ -34,10 +34,10 @@ class DatabaseLoader:
     - summaries.py: Clinical and processing summaries
     """
     
-    def __init__(self, config_path: str = "config.yaml"):
-        """Initialize the loader with configuration"""
+    def __init__(self, config_path: str = "config.yaml", config=None):
+        """Initialize the loader with configuration (shared Config instance if given)"""
         from utils.config import get_config
-        self.config = get_config(config_path)
+        self.config = config if config is not None else get_config(config_path)
         
         # Connection manager
         self.db_connection = DatabaseConnection(self.config)
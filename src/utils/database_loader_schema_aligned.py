@@ -43,10 +43,10 @@ class SchemaAlignedDatabaseLoader:
     Every INSERT statement has been verified against the actual schema.
     """
     
-    def __init__(self, config_path: str = "config.yaml"):
-        """Initialize the loader with configuration"""
+    def __init__(self, config_path: str = "config.yaml", config=None):
+        """Initialize the loader with configuration (shared Config instance if given)"""
         from utils.config import get_config
-        self.config = get_config(config_path)
+        self.config = config if config is not None else get_config(config_path)
         self.db_enabled = self.config.database_enabled
         self.non_blocking = self.config.database_non_blocking
         self.connection_type = "cloud_sql"
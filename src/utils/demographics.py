@@ -0,0 +1,110 @@
+"""
+Compiled demographic tables for synthetic patient generation
+
+Regional name pools, birth countries, cities, languages and the other lookup
+tables live in demographics_data.json (next to this module). They are loaded
+once per process and compiled into tuples of interned strings per region and
+sex, with precomputed cumulative ethnicity weights, so drawing a patient is a
+handful of indexed lookups.
+
+Names are always drawn from a single region: a Nigerian Igbo first name is
+only ever paired with a Nigerian Igbo surname.
+"""
+import json
+import random
+import sys
+import threading
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+DATA_PATH = Path(__file__).parent / "demographics_data.json"
+SEXES = ("Male", "Female")
+
+
+def _interned(values) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values)
+
+
+class DemographicsTables:
+    """Load-once demographic lookup tables"""
+
+    def __init__(self, data_path: Union[str, Path] = DATA_PATH):
+        """
+        Load and compile the demographic tables
+
+        Args:
+            data_path: JSON data file
+        """
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.version = data.get("version", 1)
+        self.ethnicities = _interned(data["ethnicity_weights"])
+        self.ethnicity_cum_weights = tuple(accumulate(data["ethnicity_weights"].values()))
+
+        # Ethnicity -> tuple of regions; region -> {sex: (first names, last names)}.
+        # Ethnicities without regional pools become a single region of their own.
+        self.regions: Dict[str, tuple] = {}
+        for ethnicity, entry in data["names"].items():
+            regions = entry.get("regions") or {ethnicity: entry}
+            self.regions[sys.intern(ethnicity)] = tuple(
+                {sex: (_interned(region[sex]["first"]), _interned(region[sex]["last"])) for sex in SEXES}
+                for region in regions.values()
+            )
+        self.fallback_region = self.regions.get("Mixed") or ({"Male": (("John",), ("Doe",)),
+                                                              "Female": (("Jane",), ("Doe",))},)
+
+        self.birth_countries = {k: _interned(v) for k, v in data["birth_countries"].items()}
+        self.cities = {k: _interned(v) for k, v in data["cities"].items()}
+        self.migration_destinations = _interned(data["migration_destinations"])
+        self.languages = {k: sys.intern(v) for k, v in data["languages"].items()}
+        self.emergency_relations = {k: _interned(v) for k, v in data["emergency_relations"].items()}
+        self.street_names = _interned(data["street_names"])
+        self.street_types = _interned(data["street_types"])
+        self.insurance_providers = _interned(data["insurance_providers"])
+        self.insurance_prefixes = _interned(data["insurance_prefixes"])
+        self.pcp_names = _interned(data["pcp_names"])
+
+    def choose_ethnicity(self, rng=random) -> str:
+        """Draw an ethnicity using the population-based weights"""
+        return rng.choices(self.ethnicities, cum_weights=self.ethnicity_cum_weights, k=1)[0]
+
+    def choose_names(self, ethnicity: str, sex: str, rng=random) -> Tuple[str, str, Tuple[str, ...]]:
+        """
+        Draw a regionally matched first and last name
+
+        Args:
+            ethnicity: Ethnicity key
+            sex: "Male" or "Female" (anything else uses the male pools)
+            rng: Random source (module or random.Random instance)
+
+        Returns:
+            Tuple of (first name, last name, first-name pool of the region for middle names)
+        """
+        region = rng.choice(self.regions.get(ethnicity) or self.fallback_region)
+        first_names, last_names = region[sex if sex in region else "Male"]
+        return rng.choice(first_names), rng.choice(last_names), first_names
+
+    def choose_birth_country(self, ethnicity: str, rng=random) -> str:
+        return rng.choice(self.birth_countries.get(ethnicity, ("USA",)))
+
+    def choose_city(self, country: str, rng=random) -> str:
+        return rng.choice(self.cities.get(country, (country,)))
+
+    def language_for(self, country: str) -> str:
+        return self.languages.get(country, "English")
+
+
+_tables = None
+_tables_lock = threading.Lock()
+
+
+def get_demographics_tables() -> DemographicsTables:
+    """Get the process-wide demographic tables (loaded on first use)"""
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = DemographicsTables()
+    return _tables
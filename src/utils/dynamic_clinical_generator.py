@@ -10,19 +10,37 @@ import random
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from utils.api_client import APIClient
+from utils.clinical_knowledge import get_clinical_knowledge
+
+
+# Age-band condition draws as (knowledge table search term, probability), used by
+# the static fallback and offline generators
+STATIC_CONDITION_RATES = (
+    (60, (("hypertension", 0.85), ("high cholesterol", 0.70), ("diabetes type 2", 0.60),
+          ("osteoarthritis", 0.50), ("GERD", 0.40))),
+    (40, (("hypertension", 0.70), ("high cholesterol", 0.65), ("diabetes type 2", 0.45),
+          ("GERD", 0.50), ("depression", 0.35))),
+    (0, (("asthma", 0.50), ("anxiety", 0.45), ("allergies", 0.55), ("depression", 0.40))),
+)
+# Drawn until a profile has at least 3 conditions
+STATIC_CONDITION_POOL = ("high cholesterol", "GERD", "allergies", "hypertension", "anxiety")
 
 
 class DynamicClinicalGenerator:
     """Dynamically generates conditions and medications from APIs"""
     
-    def __init__(self, bioportal_api_key: str = None):
+    def __init__(self, bioportal_api_key: str = None, use_knowledge_table: bool = True):
         """
         Initialize dynamic clinical generator
         
         Args:
             bioportal_api_key: BioPortal API key for SNOMED CT queries
+            use_knowledge_table: Answer condition and drug lookups from the offline
+                knowledge table first (see utils.clinical_knowledge); live APIs are
+                then only used for conditions the table does not cover
         """
         self.bioportal_api_key = bioportal_api_key
+        self.knowledge = get_clinical_knowledge() if use_knowledge_table else None
         self.bioportal_base = "https://data.bioontology.org"
         PharmGKBClient = __import__('phase2_clinical.pharmgkb_client', fromlist=['PharmGKBClient']).PharmGKBClient
         ChEMBLClient = __import__('phase3_context.chembl_client', fromlist=['ChEMBLClient']).ChEMBLClient
@@ -189,6 +207,12 @@ class DynamicClinicalGenerator:
         Returns:
             Condition dictionary with SNOMED CT code, or None
         """
+        # Tier 1: offline knowledge table
+        if self.knowledge is not None:
+            condition = self.knowledge.condition_for_term(search_term)
+            if condition:
+                return condition
+
         if not self.bioportal_api_key:
             # Fallback: Use Clinical Tables API (free, no key needed)
             return self._search_clinical_tables(search_term)
@@ -295,7 +319,8 @@ class DynamicClinicalGenerator:
     
     def get_drugs_for_condition(self, snomed_code: str, condition_label: str) -> List[Dict]:
         """
-        Dynamically query drug APIs for medications treating a condition
+        Get medications treating a condition: from the offline knowledge table
+        when it covers the condition, otherwise by querying drug APIs
         
         Args:
             snomed_code: SNOMED CT code for the condition
@@ -304,13 +329,14 @@ class DynamicClinicalGenerator:
         Returns:
             List of medication dictionaries
         """
-        medications = []
-        
-        # Strategy 1: Use known condition-drug mappings FIRST (most reliable)
-        # This ensures we always have evidence-based medications for common conditions
-        print(f"    🔍 Getting evidence-based drugs for: {condition_label}")
+        # Strategy 1: Known condition-drug mappings from the knowledge table (most reliable)
         known_drugs = self._get_known_drugs_for_condition(snomed_code, condition_label)
-        medications.extend(known_drugs)
+        if known_drugs and self.knowledge is not None:
+            # Covered by the offline table - no live queries needed
+            print(f"    📚 Knowledge table v{self.knowledge.version}: {len(known_drugs)} drugs for {condition_label}")
+            return self._select_medications(known_drugs, condition_label, snomed_code)
+
+        medications = list(known_drugs)
         
         # Strategy 2: Query ChEMBL for drugs by indication (supplementary)
         print(f"    🔍 Searching ChEMBL for drugs treating: {condition_label}")
@@ -333,30 +359,6 @@ class DynamicClinicalGenerator:
             if med_id and med_id not in seen_ids:
                 seen_ids.add(med_id)
                 unique_meds.append(med)
-        
-        # Select medications based on condition complexity
-        # Some conditions may need 1 drug, others may need 2-3 (e.g., combination therapy)
-        num_drugs_needed = self._determine_drug_count_needed(condition_label, snomed_code)
-        
-        if len(unique_meds) >= num_drugs_needed:
-            # Priority: Evidence-based > ChEMBL > RxNorm (evidence-based is most reliable)
-            source_priority = ["evidence_based", "chembl", "rxnorm"]
-            
-            selected = []
-            for source in source_priority:
-                source_meds = [m for m in unique_meds if m.get("source") == source and m not in selected]
-                if source_meds and len(selected) < num_drugs_needed:
-                    needed = num_drugs_needed - len(selected)
-                    selected.extend(random.sample(source_meds, min(needed, len(source_meds))))
-            
-            # Fill remaining slots from any source
-            if len(selected) < num_drugs_needed:
-                remaining = [m for m in unique_meds if m not in selected]
-                if remaining:
-                    needed = num_drugs_needed - len(selected)
-                    selected.extend(random.sample(remaining, min(needed, len(remaining))))
-            
-            return selected[:num_drugs_needed]
 
         # FALLBACK: If no medications found (all APIs failed), use static mapping
         if not unique_meds:
@@ -367,7 +369,45 @@ class DynamicClinicalGenerator:
             }])
             return static_meds
 
-        return unique_meds
+        return self._select_medications(unique_meds, condition_label, snomed_code)
+
+    def _select_medications(self, medications: List[Dict], condition_label: str, snomed_code: str) -> List[Dict]:
+        """
+        Pick the typical number of drugs for a condition from candidate medications
+
+        Some conditions need 1 drug, others 2-3 (combination therapy).
+        Evidence-based candidates are preferred over ChEMBL and RxNorm ones.
+
+        Args:
+            medications: Unique candidate medications
+            condition_label: Human-readable condition name
+            snomed_code: SNOMED CT code for the condition
+
+        Returns:
+            Selected medications (all candidates if there are fewer than needed)
+        """
+        num_drugs_needed = self._determine_drug_count_needed(condition_label, snomed_code)
+        if len(medications) < num_drugs_needed:
+            return medications
+
+        # Priority: Evidence-based > ChEMBL > RxNorm (evidence-based is most reliable)
+        source_priority = ["evidence_based", "chembl", "rxnorm"]
+        
+        selected = []
+        for source in source_priority:
+            source_meds = [m for m in medications if m.get("source") == source and m not in selected]
+            if source_meds and len(selected) < num_drugs_needed:
+                needed = num_drugs_needed - len(selected)
+                selected.extend(random.sample(source_meds, min(needed, len(source_meds))))
+        
+        # Fill remaining slots from any source
+        if len(selected) < num_drugs_needed:
+            remaining = [m for m in medications if m not in selected]
+            if remaining:
+                needed = num_drugs_needed - len(selected)
+                selected.extend(random.sample(remaining, min(needed, len(remaining))))
+        
+        return selected[:num_drugs_needed]
     
     def _determine_drug_count_needed(self, condition_label: str, snomed_code: str) -> int:
         """
@@ -741,187 +781,11 @@ class DynamicClinicalGenerator:
     
     def _get_known_drugs_for_condition(self, snomed_code: str, condition_label: str) -> List[Dict]:
         """
-        Get known drugs for condition with RxNorm lookup for standardization
-        Uses evidence-based drug-condition mappings
+        Get known drugs for a condition from the offline knowledge table
+        Identifiers (DrugBank, ChEMBL, RxNorm, SNOMED CT) and typical doses come
+        from the table, so no live lookups are made
         """
-        # Comprehensive drug-condition mapping with RxNorm/DrugBank IDs
-        # Comprehensive drug-condition mapping - used as fallback when API search fails
-        # Maps SNOMED codes to evidence-based medications
-        condition_drug_map = {
-            # Support multiple SNOMED codes for same condition type
-            "44054006": [  # Diabetes type 2
-                {"drugbank_id": "DB00619", "name": "Metformin", "doses": [500, 850, 1000], "unit": "mg", "frequency": "Twice daily"},
-                {"drugbank_id": "DB00030", "name": "Insulin glargine", "doses": [10, 20, 30], "unit": "units", "frequency": "Once daily"}
-            ],
-            "73211009": [  # Diabetes mellitus (general)
-                {"drugbank_id": "DB00619", "name": "Metformin", "doses": [500, 850, 1000], "unit": "mg", "frequency": "Twice daily"}
-            ],
-            "254837009": [  # Hypertension
-                {"drugbank_id": "DB01175", "name": "Lisinopril", "doses": [5, 10, 20], "unit": "mg", "frequency": "Once daily"},
-                {"drugbank_id": "DB00472", "name": "Amlodipine", "doses": [5, 10], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "38341003": [  # Hypertensive disorder
-                {"drugbank_id": "DB01175", "name": "Lisinopril", "doses": [5, 10, 20], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "372244006": [  # Asthma
-                {"drugbank_id": "DB14761", "name": "Albuterol", "doses": [90, 180], "unit": "mcg", "frequency": "As needed"},
-                {"drugbank_id": "DB01264", "name": "Fluticasone", "doses": [110, 220], "unit": "mcg", "frequency": "Twice daily"}
-            ],
-            "363418016": [  # Depression
-                {"drugbank_id": "DB00264", "name": "Sertraline", "doses": [50, 100, 200], "unit": "mg", "frequency": "Once daily"},
-                {"drugbank_id": "DB00261", "name": "Escitalopram", "doses": [10, 20], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "35489007": [  # Depressive disorder
-                {"drugbank_id": "DB00264", "name": "Sertraline", "doses": [50, 100, 200], "unit": "mg", "frequency": "Once daily"},
-                {"drugbank_id": "DB00261", "name": "Escitalopram", "doses": [10, 20], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "363478007": [  # Anxiety disorder
-                {"drugbank_id": "DB00856", "name": "Alprazolam", "doses": [0.25, 0.5, 1], "unit": "mg", "frequency": "Three times daily"},
-                {"drugbank_id": "DB00264", "name": "Sertraline", "doses": [50, 100], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "197480006": [  # Anxiety disorder (alternative code)
-                {"drugbank_id": "DB00856", "name": "Alprazolam", "doses": [0.25, 0.5, 1], "unit": "mg", "frequency": "Three times daily"},
-                {"drugbank_id": "DB00264", "name": "Sertraline", "doses": [50, 100], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "266430006": [  # GERD
-                {"drugbank_id": "DB00738", "name": "Omeprazole", "doses": [20, 40], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "161891005": [  # Osteoarthritis
-                {"drugbank_id": "DB01229", "name": "Celecoxib", "doses": [100, 200], "unit": "mg", "frequency": "Twice daily"}
-            ],
-            "4855003": [  # Hypothyroidism
-                {"drugbank_id": "DB00651", "name": "Levothyroxine", "doses": [25, 50, 75, 100], "unit": "mcg", "frequency": "Once daily"}
-            ],
-            "26889001": [  # COPD
-                {"drugbank_id": "DB14761", "name": "Albuterol", "doses": [90, 180], "unit": "mcg", "frequency": "As needed"},
-                {"drugbank_id": "DB01264", "name": "Fluticasone", "doses": [110, 220], "unit": "mcg", "frequency": "Twice daily"}
-            ],
-            "10692761000119107": [  # Asthma-COPD overlap
-                {"drugbank_id": "DB14761", "name": "Albuterol", "doses": [90, 180], "unit": "mcg", "frequency": "As needed"},
-                {"drugbank_id": "DB01264", "name": "Fluticasone", "doses": [110, 220], "unit": "mcg", "frequency": "Twice daily"}
-            ],
-            "370992007": [  # Dyslipidemia
-                {"drugbank_id": "DB00641", "name": "Atorvastatin", "doses": [10, 20, 40, 80], "unit": "mg", "frequency": "Once daily"},
-                {"drugbank_id": "DB01076", "name": "Simvastatin", "doses": [10, 20, 40], "unit": "mg", "frequency": "Once daily"}
-            ],
-            "10742861000119102": [  # Dyslipidemia (alternative code)
-                {"drugbank_id": "DB00641", "name": "Atorvastatin", "doses": [10, 20, 40, 80], "unit": "mg", "frequency": "Once daily"},
-                {"drugbank_id": "DB01076", "name": "Simvastatin", "doses": [10, 20, 40], "unit": "mg", "frequency": "Once daily"}
-            ]
-        }
-        
-        # Try to find drugs by SNOMED code first
-        drug_infos = []
-        if snomed_code in condition_drug_map:
-            drug_infos = condition_drug_map[snomed_code]
-        else:
-            # Try by condition label keywords (improved matching)
-            condition_lower = condition_label.lower()
-            
-            # Map keywords to SNOMED codes with drugs
-            keyword_mappings = {
-                "anxiety": "197480006",
-                "depress": "35489007",
-                "asthma": "372244006",
-                "copd": "26889001",
-                "pulmonary": "26889001",
-                "chronic obstructive": "26889001",
-                "dyslipidemia": "370992007",
-                "lipid": "370992007",
-                "hyperlipidemia": "370992007",
-                "hypertension": "38341003",
-                "diabetes": "44054006",
-                "gerd": "266430006",
-                "reflux": "266430006",
-                "arthritis": "161891005",
-                "osteoarthritis": "161891005",
-                "hypothyroidism": "4855003"
-            }
-            
-            for keyword, code in keyword_mappings.items():
-                if keyword in condition_lower and code in condition_drug_map:
-                    drug_infos = condition_drug_map[code]
-                    break
-        
-        if not drug_infos:
-            return []  # No fallback drugs found
-        current_date = datetime.now()
-        
-        medications = []
-        for drug_info in drug_infos:
-            # Select random dose
-            dose_value = random.choice(drug_info["doses"])
-            
-            # Generate start date
-            days_ago = random.randint(30, 730)
-            start_date = (current_date - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-            
-            # Try to get RxNorm CUI for the drug
-            rxnorm_info = self._get_rxnorm_for_drug(drug_info["name"])
-            
-            medication = {
-                "@id": f"https://go.drugbank.com/drugs/{drug_info['drugbank_id']}",
-                "@type": "sdisco:Medication",
-                "drugbank:id": drug_info["drugbank_id"],
-                "rdfs:label": drug_info["name"],
-                "schema:name": drug_info["name"],
-                "schema:dosageForm": "tablet" if drug_info["unit"] in ["mg", "mcg"] else "injection" if drug_info["unit"] == "units" else "inhaler",
-                "schema:doseValue": dose_value,
-                "schema:doseUnit": drug_info["unit"],
-                "schema:frequency": drug_info["frequency"],
-                "start_date": start_date,
-                "purpose": condition_label,
-                "source": "evidence_based"
-            }
-            
-            # ALWAYS add treats_condition with SNOMED code - try to find it if missing
-            condition_snomed_code = snomed_code if snomed_code and str(snomed_code).strip() and str(snomed_code) != "None" else None
-            if not condition_snomed_code:
-                # Try to find SNOMED code for condition if not provided
-                condition_result = self._search_snomed_condition(condition_label)
-                if condition_result and condition_result.get("snomed:code"):
-                    condition_snomed_code = condition_result["snomed:code"]
-            
-            # CRITICAL: Only add treats_condition if we have a VALID non-null code (never null)
-            if condition_snomed_code and str(condition_snomed_code).strip() and str(condition_snomed_code) != "None":
-                medication["treats_condition"] = {
-                    "snomed:code": condition_snomed_code,
-                    "rdfs:label": condition_label,
-                    "@id": f"http://snomed.info/id/{condition_snomed_code}"
-                }
-            # If we have an existing treats_condition with null, remove it
-            elif "treats_condition" in medication:
-                existing_tc = medication.get("treats_condition", {})
-                if not existing_tc.get("snomed:code") or str(existing_tc.get("snomed:code")) == "None":
-                    del medication["treats_condition"]
-            
-            if rxnorm_info:
-                medication["rxnorm"] = rxnorm_info
-            
-            # ALWAYS add SNOMED CT code for evidence-based drug - try multiple attempts
-            drug_snomed_code = self._get_snomed_code_for_drug(drug_info["name"])
-            if not drug_snomed_code:
-                # Try lowercase variant
-                drug_snomed_code = self._get_snomed_code_for_drug(drug_info["name"].lower())
-            if not drug_snomed_code:
-                # Try with common variations
-                drug_name_variants = [
-                    drug_info["name"],
-                    drug_info["name"].title(),
-                    drug_info["name"].upper()
-                ]
-                for variant in drug_name_variants:
-                    drug_snomed_code = self._get_snomed_code_for_drug(variant)
-                    if drug_snomed_code:
-                        break
-            
-            if drug_snomed_code:
-                medication["snomed:code"] = drug_snomed_code
-                medication["snomed:uri"] = f"http://snomed.info/id/{drug_snomed_code}"
-            
-            medications.append(medication)
-        
-        return medications
+        return knowledge_medications(snomed_code, condition_label, knowledge=self.knowledge)
     
     def _get_rxnorm_for_drug(self, drug_name: str) -> Optional[Dict]:
         """Get RxNorm CUI for a drug"""
@@ -1128,147 +992,9 @@ class DynamicClinicalGenerator:
         Static fallback: Generate realistic conditions based on age and lifestyle
         Used when API calls fail to ensure profiles always have some clinical data
         """
-        # Common conditions with SNOMED codes (real codes for common conditions)
-        static_conditions = {
-            "hypertension": {
-                "@id": "http://snomed.info/id/38341003",
-                "@type": "sdisco:Condition",
-                "snomed:code": "38341003",
-                "rdfs:label": "Essential hypertension",
-                "skos:prefLabel": "Essential hypertension",
-                "search_term": "hypertension"
-            },
-            "diabetes_type2": {
-                "@id": "http://snomed.info/id/44054006",
-                "@type": "sdisco:Condition",
-                "snomed:code": "44054006",
-                "rdfs:label": "Diabetes mellitus type 2",
-                "skos:prefLabel": "Diabetes mellitus type 2",
-                "search_term": "diabetes type 2"
-            },
-            "hyperlipidemia": {
-                "@id": "http://snomed.info/id/55822004",
-                "@type": "sdisco:Condition",
-                "snomed:code": "55822004",
-                "rdfs:label": "Hyperlipidemia",
-                "skos:prefLabel": "Hyperlipidemia",
-                "search_term": "high cholesterol"
-            },
-            "osteoarthritis": {
-                "@id": "http://snomed.info/id/396275006",
-                "@type": "sdisco:Condition",
-                "snomed:code": "396275006",
-                "rdfs:label": "Osteoarthritis",
-                "skos:prefLabel": "Osteoarthritis",
-                "search_term": "osteoarthritis"
-            },
-            "gerd": {
-                "@id": "http://snomed.info/id/235595009",
-                "@type": "sdisco:Condition",
-                "snomed:code": "235595009",
-                "rdfs:label": "Gastroesophageal reflux disease",
-                "skos:prefLabel": "GERD",
-                "search_term": "GERD"
-            },
-            "asthma": {
-                "@id": "http://snomed.info/id/195967001",
-                "@type": "sdisco:Condition",
-                "snomed:code": "195967001",
-                "rdfs:label": "Asthma",
-                "skos:prefLabel": "Asthma",
-                "search_term": "asthma"
-            },
-            "depression": {
-                "@id": "http://snomed.info/id/35489007",
-                "@type": "sdisco:Condition",
-                "snomed:code": "35489007",
-                "rdfs:label": "Depressive disorder",
-                "skos:prefLabel": "Depression",
-                "search_term": "depression"
-            },
-            "anxiety": {
-                "@id": "http://snomed.info/id/48694002",
-                "@type": "sdisco:Condition",
-                "snomed:code": "48694002",
-                "rdfs:label": "Anxiety disorder",
-                "skos:prefLabel": "Anxiety",
-                "search_term": "anxiety"
-            },
-            "copd": {
-                "@id": "http://snomed.info/id/13645005",
-                "@type": "sdisco:Condition",
-                "snomed:code": "13645005",
-                "rdfs:label": "Chronic obstructive pulmonary disease",
-                "skos:prefLabel": "COPD",
-                "search_term": "COPD"
-            },
-            "allergic_rhinitis": {
-                "@id": "http://snomed.info/id/61582004",
-                "@type": "sdisco:Condition",
-                "snomed:code": "61582004",
-                "rdfs:label": "Allergic rhinitis",
-                "skos:prefLabel": "Allergic rhinitis",
-                "search_term": "allergies"
-            }
-        }
-
-        conditions = []
-
-        # Age-based selection with MUCH HIGHER probabilities for comprehensive profiles
-        if age >= 60:
-            # Older adults - typically have 3-4 chronic conditions
-            if random.random() < 0.85:  # 85% chance
-                conditions.append(static_conditions["hypertension"])
-            if random.random() < 0.70:  # 70% chance
-                conditions.append(static_conditions["hyperlipidemia"])
-            if random.random() < 0.60:  # 60% chance
-                conditions.append(static_conditions["diabetes_type2"])
-            if random.random() < 0.50:  # 50% chance
-                conditions.append(static_conditions["osteoarthritis"])
-            if random.random() < 0.40:  # 40% chance
-                conditions.append(static_conditions["gerd"])
-        elif age >= 40:
-            # Middle-aged - typically have 2-3 conditions
-            if random.random() < 0.70:  # 70% chance
-                conditions.append(static_conditions["hypertension"])
-            if random.random() < 0.65:  # 65% chance
-                conditions.append(static_conditions["hyperlipidemia"])
-            if random.random() < 0.45:  # 45% chance
-                conditions.append(static_conditions["diabetes_type2"])
-            if random.random() < 0.50:  # 50% chance
-                conditions.append(static_conditions["gerd"])
-            if random.random() < 0.35:  # 35% chance
-                conditions.append(static_conditions["depression"])
-        else:
-            # Younger adults - typically have 2-3 conditions
-            if random.random() < 0.50:  # 50% chance
-                conditions.append(static_conditions["asthma"])
-            if random.random() < 0.45:  # 45% chance
-                conditions.append(static_conditions["anxiety"])
-            if random.random() < 0.55:  # 55% chance
-                conditions.append(static_conditions["allergic_rhinitis"])
-            if random.random() < 0.40:  # 40% chance
-                conditions.append(static_conditions["depression"])
-
-        # Lifestyle-based additions
-        is_smoker = any(f.get('factor_type') == 'smoking' and f.get('status') == 'current'
-                       for f in lifestyle_factors if isinstance(f, dict))
-        if is_smoker and random.random() < 0.60:  # 60% for smokers
-            conditions.append(static_conditions["copd"])
-
-        # GUARANTEE at least 3 conditions for comprehensive profiles
-        if len(conditions) < 3:
-            # Add common conditions until we have at least 3
-            pool_keys = ["hyperlipidemia", "gerd", "allergic_rhinitis", "hypertension", "anxiety"]
-            random.shuffle(pool_keys)
-            for cond_key in pool_keys:
-                if static_conditions[cond_key] not in conditions:
-                    conditions.append(static_conditions[cond_key])
-                    if len(conditions) >= 3:
-                        break
-
+        conditions = draw_static_conditions(age, lifestyle_factors)
         print(f"    📋 Static fallback generated {len(conditions)} conditions")
-        return conditions[:5]  # Limit to 5 max
+        return conditions
 
     def _get_static_medications_for_conditions(self, conditions: List[Dict]) -> List[Dict]:
         """
@@ -1276,180 +1002,150 @@ class DynamicClinicalGenerator:
         Used when API calls fail to ensure profiles always have medication data
         Now includes MULTIPLE medications per condition for realistic combination therapy
         """
-        # Comprehensive medication map with MULTIPLE drugs per condition (real DrugBank IDs)
-        medication_map = {
-            "38341003": [  # Hypertension - typically needs 2-3 drugs
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00945",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00945",
-                    "rdfs:label": "Aspirin",
-                    "indication": "Cardiovascular protection",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00492",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00492",
-                    "rdfs:label": "Fosinopril",
-                    "indication": "Hypertension (ACE inhibitor)",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00999",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00999",
-                    "rdfs:label": "Hydrochlorothiazide",
-                    "indication": "Hypertension (diuretic)",
-                    "source": "evidence_based"
-                }
-            ],
-            "44054006": [  # Diabetes type 2 - often needs 2 drugs
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00331",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00331",
-                    "rdfs:label": "Metformin",
-                    "indication": "Type 2 diabetes mellitus (first-line)",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00046",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00046",
-                    "rdfs:label": "Insulin lispro",
-                    "indication": "Type 2 diabetes mellitus (supplemental)",
-                    "source": "evidence_based"
-                }
-            ],
-            "55822004": [  # Hyperlipidemia
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB01076",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB01076",
-                    "rdfs:label": "Atorvastatin",
-                    "indication": "Hyperlipidemia (statin)",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00973",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00973",
-                    "rdfs:label": "Ezetimibe",
-                    "indication": "Hyperlipidemia (cholesterol absorption inhibitor)",
-                    "source": "evidence_based"
-                }
-            ],
-            "396275006": [  # Osteoarthritis - may need 2 drugs
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00328",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00328",
-                    "rdfs:label": "Indomethacin",
-                    "indication": "Pain and inflammation (NSAID)",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00316",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00316",
-                    "rdfs:label": "Acetaminophen",
-                    "indication": "Pain relief",
-                    "source": "evidence_based"
-                }
-            ],
-            "235595009": [  # GERD
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00338",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00338",
-                    "rdfs:label": "Omeprazole",
-                    "indication": "Gastroesophageal reflux disease (PPI)",
-                    "source": "evidence_based"
-                }
-            ],
-            "195967001": [  # Asthma - typically needs 2 drugs (controller + rescue)
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB01001",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB01001",
-                    "rdfs:label": "Salbutamol",
-                    "indication": "Asthma (rescue inhaler)",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00588",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00588",
-                    "rdfs:label": "Fluticasone",
-                    "indication": "Asthma (controller inhaler)",
-                    "source": "evidence_based"
-                }
-            ],
-            "35489007": [  # Depression
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00472",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00472",
-                    "rdfs:label": "Fluoxetine",
-                    "indication": "Depression (SSRI)",
-                    "source": "evidence_based"
-                }
-            ],
-            "48694002": [  # Anxiety
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00404",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00404",
-                    "rdfs:label": "Alprazolam",
-                    "indication": "Anxiety disorder (benzodiazepine)",
-                    "source": "evidence_based"
-                }
-            ],
-            "13645005": [  # COPD - typically needs 2-3 drugs
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00697",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00697",
-                    "rdfs:label": "Tiotropium",
-                    "indication": "COPD (long-acting bronchodilator)",
-                    "source": "evidence_based"
-                },
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB01001",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB01001",
-                    "rdfs:label": "Salbutamol",
-                    "indication": "COPD (rescue bronchodilator)",
-                    "source": "evidence_based"
-                }
-            ],
-            "61582004": [  # Allergic rhinitis
-                {
-                    "@id": "http://go.drugbank.com/drugs/DB00341",
-                    "@type": "sdisco:Drug",
-                    "drugbank:id": "DB00341",
-                    "rdfs:label": "Cetirizine",
-                    "indication": "Allergic rhinitis (antihistamine)",
-                    "source": "evidence_based"
-                }
-            ]
+        medications = static_medications_for_conditions(conditions)
+        for med in medications:
+            print(f"      💊 Added medication: {med.get('rdfs:label')}")
+
+        print(f"    📋 Static fallback generated {len(medications)} medications for {len(conditions)} conditions")
+        return medications
+
+
+def knowledge_medications(snomed_code: Optional[str], condition_label: str, rng=random,
+                          now: datetime = None, knowledge=None) -> List[Dict]:
+    """
+    Medications for a condition from the clinical knowledge table
+
+    Args:
+        snomed_code: SNOMED CT code of the condition (canonical or alias), may be None
+        condition_label: Human-readable condition name
+        rng: Random source for doses and start dates
+        now: Reference time for start dates (default: current time)
+        knowledge: Knowledge table (default: the process-wide one)
+
+    Returns:
+        Medication dictionaries (empty if the table does not cover the condition)
+    """
+    knowledge = knowledge or get_clinical_knowledge()
+    drug_infos = knowledge.drugs_for_condition(snomed_code, condition_label)
+    if not drug_infos:
+        return []  # Condition not covered by the table
+    current_date = now or datetime.now()
+
+    # treats_condition needs a VALID non-null code (never null): the given one, else the table's
+    condition_snomed_code = snomed_code if snomed_code and str(snomed_code).strip() and str(snomed_code) != "None" else None
+    if not condition_snomed_code:
+        condition_snomed_code = knowledge.resolve_code(None, condition_label)
+
+    medications = []
+    for drug_info in drug_infos:
+        # Select random dose
+        dose_value = rng.choice(drug_info["doses"])
+
+        # Generate start date
+        days_ago = rng.randint(30, 730)
+        start_date = (current_date - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+        medication = {
+            "@id": f"https://go.drugbank.com/drugs/{drug_info['drugbank_id']}",
+            "@type": "sdisco:Medication",
+            "drugbank:id": drug_info["drugbank_id"],
+            "rdfs:label": drug_info["name"],
+            "schema:name": drug_info["name"],
+            "schema:dosageForm": drug_info["dosage_form"],
+            "schema:doseValue": dose_value,
+            "schema:doseUnit": drug_info["unit"],
+            "schema:frequency": drug_info["frequency"],
+            "start_date": start_date,
+            "purpose": condition_label,
+            "source": "evidence_based"
         }
 
-        medications = []
-        seen_drugbank_ids = set()
-
-        # Get ALL medications for each condition (not just first one)
-        for condition in conditions:
-            snomed_code = condition.get("snomed:code")
-            if snomed_code in medication_map:
-                for med in medication_map[snomed_code]:
-                    drugbank_id = med.get("drugbank:id")
-                    if drugbank_id not in seen_drugbank_ids:
-                        medications.append(med)
-                        seen_drugbank_ids.add(drugbank_id)
-                        print(f"      💊 Added medication: {med.get('rdfs:label')}")
+        if condition_snomed_code:
+            medication["treats_condition"] = {
+                "snomed:code": condition_snomed_code,
+                "rdfs:label": condition_label,
+                "@id": f"http://snomed.info/id/{condition_snomed_code}"
+            }
 
-        print(f"    📋 Static fallback generated {len(medications)} medications for {len(conditions)} conditions")
-        return medications[:10]  # Increased limit to 10 medications
+        if drug_info.get("chembl_id"):
+            medication["chembl_id"] = drug_info["chembl_id"]
+
+        if drug_info.get("rxnorm_cui"):
+            medication["rxnorm"] = {
+                "rxnorm_cui": drug_info["rxnorm_cui"],
+                "uri": f"https://identifiers.org/rxnorm:{drug_info['rxnorm_cui']}"
+            }
+
+        if drug_info.get("snomed_code"):
+            medication["snomed:code"] = drug_info["snomed_code"]
+            medication["snomed:uri"] = f"http://snomed.info/id/{drug_info['snomed_code']}"
+
+        medications.append(medication)
+
+    return medications
+
+
+def draw_static_conditions(age: int, lifestyle_factors: List[Dict], rng=random) -> List[Dict]:
+    """
+    Draw realistic conditions for an age and lifestyle from the knowledge table
+
+    Needs no network access; used as the fallback when API calls fail and by
+    offline generators that pass a seeded random source.
+
+    Args:
+        age: Patient age
+        lifestyle_factors: Lifestyle factor dictionaries
+        rng: Random source (the random module or a random.Random instance)
+
+    Returns:
+        Up to 5 condition dictionaries
+    """
+    # Age-based selection with MUCH HIGHER probabilities for comprehensive profiles
+    rates = next(rates for min_age, rates in STATIC_CONDITION_RATES if age >= min_age)
+    terms = [term for term, probability in rates if rng.random() < probability]
+
+    # Lifestyle-based additions
+    is_smoker = any(f.get('factor_type') == 'smoking' and f.get('status') == 'current'
+                   for f in lifestyle_factors if isinstance(f, dict))
+    if is_smoker and rng.random() < 0.60:  # 60% for smokers
+        terms.append("COPD")
+
+    # GUARANTEE at least 3 conditions for comprehensive profiles
+    if len(terms) < 3:
+        # Add common conditions until we have at least 3
+        pool = list(STATIC_CONDITION_POOL)
+        rng.shuffle(pool)
+        for term in pool:
+            if term not in terms:
+                terms.append(term)
+                if len(terms) >= 3:
+                    break
+
+    knowledge = get_clinical_knowledge()
+    return [knowledge.condition_for_term(term) for term in terms[:5]]  # Limit to 5 max
+
+
+def static_medications_for_conditions(conditions: List[Dict], rng=random, now: datetime = None) -> List[Dict]:
+    """
+    Look up the knowledge table's combination therapy for conditions
+
+    Args:
+        conditions: Condition dictionaries with snomed:code and rdfs:label
+        rng: Random source for doses and start dates
+        now: Reference time for start dates (default: current time)
+
+    Returns:
+        Up to 10 unique medication dictionaries
+    """
+    medications = []
+    seen_drugs = set()
+
+    # Get ALL medications for each condition (not just first one)
+    for condition in conditions:
+        for med in knowledge_medications(condition.get("snomed:code"), condition.get("rdfs:label", ""), rng, now):
+            drug_key = med["drugbank:id"] or med["rdfs:label"]
+            if drug_key not in seen_drugs:
+                medications.append(med)
+                seen_drugs.add(drug_key)
 
+    return medications[:10]  # Increased limit to 10 medications
@@ -5,7 +5,10 @@ Provides a simple dataclass for pipeline events and helper functions to
 emit events into a thread-safe Queue. Designed to be lightweight and to
 avoid introducing heavy dependencies.
 """
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
 
 
 class PipelineEvent:
@@ -47,3 +50,83 @@ def emit(event_queue, stage: str, substage: str, message: str,
         pass
 
 
+class ProgressChannel:
+    """
+    Queue-compatible progress channel between a pipeline run and the UI.
+
+    Producers call ``put`` exactly like ``Queue.put`` (it never blocks), so the
+    channel can be handed to ``pipeline.session(event_queue=...)``. Pending
+    events are coalesced: consecutive updates of the same stage collapse into
+    the latest one, while the first event of every stage (a stage transition)
+    is always kept. The latest event per stage and a bounded buffer of recent
+    events are kept for display and diagnostics.
+
+    The consumer blocks in ``drain`` until something changes, the run is
+    closed, or the timeout expires - no polling loop is needed.
+    """
+
+    def __init__(self, max_events: int = 256):
+        self._cond = threading.Condition()
+        self._pending: List[list] = []  # [event, is_transition], not yet drained
+        self._latest: Dict[str, PipelineEvent] = {}  # Stage -> latest event (insertion = start order)
+        self.max_events = max_events
+        self.recent = deque(maxlen=max_events)
+        self.total_events = 0
+        self.closed = False
+
+    def put(self, event, block: bool = True, timeout: Optional[float] = None) -> None:
+        """Record an event (Queue.put-compatible, never blocks)."""
+        with self._cond:
+            stage = getattr(event, "stage", "unknown")
+            is_transition = stage not in self._latest
+            last = self._pending[-1] if self._pending else None
+            if not is_transition and last is not None and not last[1] and last[0].stage == stage:
+                last[0] = event
+            else:
+                self._pending.append([event, is_transition])
+                if len(self._pending) > self.max_events:
+                    # Keep the buffer bounded by dropping the oldest non-transition update
+                    for i, (_, transition) in enumerate(self._pending):
+                        if not transition:
+                            del self._pending[i]
+                            break
+            self._latest[stage] = event
+            self.recent.append(event)
+            self.total_events += 1
+            self._cond.notify_all()
+
+    def put_nowait(self, event) -> None:
+        self.put(event, block=False)
+
+    def close(self) -> None:
+        """Mark the run as finished and wake the consumer."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> List[PipelineEvent]:
+        """
+        Wait for progress and return the coalesced events since the last call.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits until an update or close)
+
+        Returns:
+            Events in arrival order (empty if the timeout expired first)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not (self._pending or self.closed):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            updates = [event for event, _ in self._pending]
+            self._pending = []
+            return updates
+
+    def snapshot(self) -> Dict[str, PipelineEvent]:
+        """Latest event per stage, in the order stages started."""
+        with self._cond:
+            return dict(self._latest)
@@ -0,0 +1,180 @@
+"""
+Gene Result Store
+Content-addressed cache of patient-independent per-gene pipeline results
+
+Phases 1-5 for a gene depend only on the gene, the upstream data sources and
+the pipeline's feature flags - never on the patient. The store keeps the
+per-gene outcome (phase result, extracted variants, drugs and diseases) under
+a key derived from exactly those inputs, so a re-run for the same panel only
+recomputes the patient-dependent stages.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump when the layout of stored entries (or the phase outputs they summarise) changes
+STORE_SCHEMA_VERSION = "3"
+
+# Versions of the upstream sources behind phases 1-3. Override individual entries
+# with ``cache.source_versions`` in config.yaml to invalidate cached gene results
+# after a source release.
+DEFAULT_SOURCE_VERSIONS = {
+    "uniprot_variation": "1",
+    "clinvar": "1",
+    "pharmgkb": "1",
+    "chembl": "1",
+    "openfda": "1",
+    "europepmc": "1",
+    "bioportal": "1",
+}
+
+
+class GeneResultStore:
+    """Stores per-gene results on disk keyed by a hash of their inputs"""
+
+    def __init__(self, store_dir: str = "data/gene_store", ttl_days: int = 30):
+        """
+        Initialize gene result store
+
+        Args:
+            store_dir: Directory holding one sub-directory per gene
+            ttl_days: Entries older than this are treated as missing
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(gene_symbol: str, source_versions: Dict[str, str], config_flags: Dict[str, Any]) -> str:
+        """
+        Derive the content address for a gene's results
+
+        Args:
+            gene_symbol: Gene symbol
+            source_versions: Upstream source versions
+            config_flags: Config values that change phase 1-5 output
+
+        Returns:
+            Hex digest identifying the inputs
+        """
+        payload = {
+            "schema": STORE_SCHEMA_VERSION,
+            "gene": gene_symbol.upper(),
+            "sources": source_versions,
+            "flags": config_flags,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, gene_symbol: str, key: str) -> Path:
+        """Get the file path for a stored entry"""
+        return self.store_dir / gene_symbol.upper() / f"{key}.json"
+
+    def load(self, gene_symbol: str, key: str) -> Optional[Dict]:
+        """
+        Load a stored gene entry if present, fresh and complete
+
+        An entry is only reused when the phase output files it points to
+        still exist, since the comprehensive outputs link to them.
+
+        Args:
+            gene_symbol: Gene symbol
+            key: Cache key from cache_key()
+
+        Returns:
+            Entry dictionary or None
+        """
+        path = self._entry_path(gene_symbol, key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            created = datetime.fromisoformat(entry["created"])
+        except (OSError, json.JSONDecodeError, KeyError, ValueError):
+            return None
+
+        if datetime.now() - created > timedelta(days=self.ttl_days):
+            return None
+
+        outputs = (entry.get("gene_result") or {}).get("outputs") or {}
+        if any(p and not Path(p).exists() for p in outputs.values()):
+            return None
+
+        return entry
+
+    def latest(self, gene_symbol: str) -> Optional[Dict]:
+        """
+        Load the most recently written entry for a gene, whatever its key
+
+        Unlike load(), neither the TTL nor the phase output files are checked:
+        this is for offline consumers (such as the synthetic cohort generator)
+        that only need the stored variants, drugs and diseases.
+
+        Args:
+            gene_symbol: Gene symbol
+
+        Returns:
+            Entry dictionary or None if the gene has no readable entries
+        """
+        gene_dir = self.store_dir / gene_symbol.upper()
+        if not gene_dir.is_dir():
+            return None
+
+        paths = sorted(gene_dir.glob("*.json"), key=lambda p: (p.stat().st_mtime_ns, p.name), reverse=True)
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+        return None
+
+    def save(self, gene_symbol: str, key: str, gene_result: Dict, variants: list,
+             drugs: set, diseases: set) -> Path:
+        """
+        Store a gene's patient-independent results
+
+        Args:
+            gene_symbol: Gene symbol
+            key: Cache key from cache_key()
+            gene_result: Result dictionary from PGxPipeline.run()
+            variants: Variants extracted for the gene
+            drugs: Drug names linked to the gene
+            diseases: Disease names linked to the gene
+
+        Returns:
+            Path of the stored entry
+        """
+        path = self._entry_path(gene_symbol, key)
+        entry = {
+            "gene": gene_symbol,
+            "key": key,
+            "created": datetime.now().isoformat(),
+            "gene_result": gene_result,
+            "variants": variants,
+            "drugs": sorted(drugs, key=str),
+            "diseases": sorted(diseases, key=str),
+        }
+
+        # Write to a temp file and rename so concurrent readers never see partial entries
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        return path
@@ -0,0 +1,509 @@
+"""
+Job Queue
+Persistent pipeline job queue served by a pool of worker processes
+
+Jobs (a gene panel plus an optional patient profile) are stored in SQLite,
+so queued and finished runs survive page reloads and restarts. Each worker
+process hosts one warm PGxPipeline and claims the highest-priority queued
+job; progress is written back to the store and streamed to subscribers as
+PipelineEvents. Cancelling a running job sets the pipeline session's
+cancel_event, which stops the run at the next phase or gene boundary.
+"""
+import json
+import multiprocessing
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    genes TEXT NOT NULL,
+    patient_profile TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    worker_id TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority DESC, created_at);
+"""
+
+
+class JobStore:
+    """SQLite-backed job table shared by the scheduler and its workers"""
+
+    def __init__(self, db_path: str = "data/jobs.sqlite"):
+        """
+        Initialize job store
+
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (one per call - safe across threads and processes)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """Decode a jobs row"""
+        job = dict(row)
+        job["genes"] = json.loads(job["genes"])
+        job["patient_profile"] = json.loads(job["patient_profile"]) if job["patient_profile"] else None
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def submit(self, genes: List[str], patient_profile: Optional[Dict] = None,
+               priority: int = 0, job_id: Optional[str] = None) -> str:
+        """
+        Queue a pipeline run
+
+        Args:
+            genes: Gene symbols to analyse
+            patient_profile: Optional patient profile
+            priority: Higher runs first; equal priorities run in submission order
+            job_id: Optional explicit identifier
+
+        Returns:
+            Job identifier
+        """
+        job_id = job_id or uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, priority, genes, patient_profile, created_at, message) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, 'Queued')",
+                (job_id, int(priority), json.dumps(list(genes)),
+                 json.dumps(patient_profile, default=str) if patient_profile else None,
+                 datetime.now().isoformat())
+            )
+        return job_id
+
+    def claim_next(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the next queued job
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            Job dictionary or None when the queue is empty
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' "
+                "ORDER BY priority DESC, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, started_at = ?, message = 'Starting' "
+                "WHERE job_id = ?",
+                (worker_id, datetime.now().isoformat(), row["job_id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        job = self._row_to_job(row)
+        job["status"] = "running"
+        job["worker_id"] = worker_id
+        return job
+
+    def update_progress(self, job_id: str, progress: Optional[float], message: Optional[str]):
+        """Record the latest progress of a running job"""
+        with self._connect() as conn:
+            if progress is None:
+                conn.execute("UPDATE jobs SET message = ? WHERE job_id = ?", (message, job_id))
+            else:
+                conn.execute("UPDATE jobs SET progress = ?, message = ? WHERE job_id = ?",
+                             (float(progress), message, job_id))
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """
+        Mark a job finished
+
+        Args:
+            job_id: Job identifier
+            status: One of FINISHED_STATUSES
+            result: Pipeline result (succeeded jobs)
+            error: Error message (failed jobs)
+        """
+        if status not in FINISHED_STATUSES:
+            raise ValueError(f"Not a finished status: {status}")
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, "
+                "progress = CASE WHEN ? = 'succeeded' THEN 1.0 ELSE progress END, message = ? "
+                "WHERE job_id = ?",
+                (status, datetime.now().isoformat(),
+                 json.dumps(result, default=str) if result is not None else None,
+                 error, status, status.capitalize(), job_id)
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job: queued jobs are cancelled immediately, running jobs are
+        flagged for their worker to stop
+
+        Returns:
+            True if the job was queued or running
+        """
+        with self._connect() as conn:
+            queued = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ?, "
+                "message = 'Cancelled' WHERE job_id = ? AND status = 'queued'",
+                (datetime.now().isoformat(), job_id)
+            ).rowcount
+            running = conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, message = 'Cancelling' "
+                "WHERE job_id = ? AND status = 'running'",
+                (job_id,)
+            ).rowcount
+        return bool(queued or running)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        """True once cancel() has been called for the job"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by identifier"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        List recent jobs without their results
+
+        Args:
+            status: Optional status filter
+            limit: Maximum number of jobs
+
+        Returns:
+            Job dictionaries, newest first
+        """
+        columns = ("job_id, status, priority, genes, NULL AS patient_profile, created_at, started_at, "
+                   "finished_at, worker_id, progress, message, cancel_requested, NULL AS result, error")
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def requeue_orphans(self) -> int:
+        """
+        Put jobs left 'running' by a stopped scheduler back in the queue
+        (or mark them cancelled if cancellation was requested)
+
+        Returns:
+            Number of jobs recovered
+        """
+        with self._connect() as conn:
+            cancelled = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, message = 'Cancelled' "
+                "WHERE status = 'running' AND cancel_requested = 1",
+                (datetime.now().isoformat(),)
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = 'queued', worker_id = NULL, started_at = NULL, progress = 0, "
+                "message = 'Requeued after restart' WHERE status = 'running'"
+            ).rowcount
+        return cancelled + requeued
+
+
+def _run_job(pipeline, store: JobStore, job: Dict[str, Any], event_queue, EventBus):
+    """Run one claimed job on a warm pipeline"""
+    job_id = job["job_id"]
+    cancel_event = threading.Event()
+    done = threading.Event()
+
+    def on_event(event):
+        progress = getattr(event, "progress", None)
+        message = getattr(event, "message", None)
+        try:
+            store.update_progress(job_id, progress, message)
+        except Exception:
+            pass
+        try:
+            event_queue.put_nowait((job_id, event))
+        except Exception:
+            pass
+
+    def watch_cancel():
+        while not done.wait(1.0):
+            if store.cancel_requested(job_id):
+                cancel_event.set()
+                return
+
+    event_bus = EventBus()
+    event_bus.subscribe(on_event)
+    watcher = threading.Thread(target=watch_cancel, daemon=True)
+    watcher.start()
+
+    try:
+        # Workers run jobs side by side, so every job gets its own data/ and
+        # output/ tree (its data/ is removed when the session ends)
+        workspace = pipeline.new_workspace(isolated=True)
+        with pipeline.session(event_bus=event_bus, cancel_event=cancel_event, workspace=workspace) as run:
+            result = run.run_multi_gene(job["genes"], patient_profile=job["patient_profile"])
+        if cancel_event.is_set() or result.get("cancelled"):
+            store.finish(job_id, "cancelled")
+        elif result.get("success"):
+            store.finish(job_id, "succeeded", result=result)
+        else:
+            store.finish(job_id, "failed", error=result.get("error", "Pipeline failed"))
+    except Exception as e:
+        store.finish(job_id, "failed", error=f"{e}\n{traceback.format_exc()}")
+    finally:
+        done.set()
+        try:
+            event_queue.put_nowait((job_id, None))  # end-of-job marker
+        except Exception:
+            pass
+
+
+def _worker_main(db_path: str, config_path: str, worker_id: str, event_queue, stop_event,
+                 poll_interval: float, src_dir: str):
+    """Worker process: host one warm pipeline and run jobs until stopped"""
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from main import EventBus, get_warm_pipeline
+
+    store = JobStore(db_path)
+    pipeline = get_warm_pipeline(config_path)
+    pipeline.warm_up()
+    print(f"[JOBS] Worker {worker_id} ready (pid {os.getpid()})")
+
+    while not stop_event.is_set():
+        job = store.claim_next(worker_id)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        print(f"[JOBS] Worker {worker_id} running job {job['job_id']}: {', '.join(job['genes'])}")
+        _run_job(pipeline, store, job, event_queue, EventBus)
+
+
+class JobScheduler:
+    """Local job scheduler: persistent queue plus a pool of pipeline worker processes"""
+
+    def __init__(self, config_path: str = "config.yaml", db_path: Optional[str] = None,
+                 workers: Optional[int] = None, poll_interval: Optional[float] = None):
+        """
+        Initialize job scheduler (call start() to launch workers)
+
+        Args:
+            config_path: Pipeline config used by every worker
+            db_path: Job database (defaults to jobs.db_path in config)
+            workers: Worker process count (defaults to jobs.workers, else CPU-based)
+            poll_interval: Seconds an idle worker waits before polling again
+        """
+        from utils.config import get_config
+
+        settings = get_config(config_path).config.get("jobs", {})
+        self.config_path = str(Path(config_path).resolve()) if Path(config_path).exists() else config_path
+        self.store = JobStore(db_path or settings.get("db_path", "data/jobs.sqlite"))
+        self.workers = max(1, int(workers or settings.get("workers") or min(os.cpu_count() or 2, 4)))
+        self.poll_interval = float(poll_interval or settings.get("poll_interval", 1.0))
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._processes: List[multiprocessing.Process] = []
+        self._stop_event = None
+        self._events = None
+        self._dispatcher = None
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._subscribers_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """True while worker processes are alive"""
+        return any(p.is_alive() for p in self._processes)
+
+    def start(self):
+        """Recover orphaned jobs and launch the worker pool"""
+        if self.running:
+            return self
+        recovered = self.store.requeue_orphans()
+        if recovered:
+            print(f"[JOBS] Recovered {recovered} job(s) left running by a previous scheduler")
+
+        self._stop_event = self._ctx.Event()
+        self._events = self._ctx.Queue()
+        src_dir = str(Path(__file__).resolve().parent.parent)
+        self._processes = []
+        for i in range(self.workers):
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(str(self.store.db_path), self.config_path, f"worker-{i + 1}", self._events,
+                      self._stop_event, self.poll_interval, src_dir),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        self._dispatcher = threading.Thread(target=self._dispatch_events, daemon=True)
+        self._dispatcher.start()
+        print(f"[JOBS] Started {self.workers} worker process(es)")
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Stop workers after their current job (terminating any still busy after timeout)"""
+        if self._stop_event is None:
+            return
+        self._stop_event.set()
+        deadline = time.time() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        # Jobs interrupted by terminate() are requeued on the next start()
+
+    def _dispatch_events(self):
+        """Fan worker events out to per-job subscriber queues"""
+        while self._stop_event is not None and not (self._stop_event.is_set() and not self.running):
+            try:
+                job_id, event = self._events.get(timeout=0.5)
+            except (queue.Empty, EOFError, OSError):
+                continue
+            with self._subscribers_lock:
+                targets = list(self._subscribers.get(job_id, []))
+            for target in targets:
+                target.put(event)
+
+    def submit(self, genes: List[str], patient_profile: Optional[Dict] = None, priority: int = 0) -> str:
+        """Queue a run (see JobStore.submit)"""
+        return self.store.submit(genes, patient_profile=patient_profile, priority=priority)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job"""
+        return self.store.cancel(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job"""
+        return self.store.get(job_id)
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Recent jobs (see JobStore.list_jobs)"""
+        return self.store.list_jobs(status=status, limit=limit)
+
+    def subscribe(self, job_id: str) -> queue.Queue:
+        """
+        Receive a job's PipelineEvents
+
+        Returns:
+            Queue yielding events, then None when the job finishes
+        """
+        target = queue.Queue()
+        with self._subscribers_lock:
+            self._subscribers.setdefault(job_id, []).append(target)
+        return target
+
+    def unsubscribe(self, job_id: str, target: queue.Queue):
+        """Stop receiving a job's events"""
+        with self._subscribers_lock:
+            targets = self._subscribers.get(job_id, [])
+            if target in targets:
+                targets.remove(target)
+            if not targets:
+                self._subscribers.pop(job_id, None)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, cancel_event=None,
+             event_queue=None) -> Optional[Dict[str, Any]]:
+        """
+        Block until a job finishes, optionally relaying its events
+
+        Args:
+            job_id: Job identifier
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            cancel_event: Optional threading.Event; when set the job is cancelled
+            event_queue: Optional queue receiving the job's PipelineEvents
+
+        Returns:
+            Final job dictionary (None if the job does not exist)
+        """
+        events = self.subscribe(job_id)
+        deadline = None if timeout is None else time.time() + timeout
+        cancel_sent = False
+        try:
+            while True:
+                job = self.store.get(job_id)
+                if job is None or job["status"] in FINISHED_STATUSES:
+                    return job
+                if cancel_event is not None and cancel_event.is_set() and not cancel_sent:
+                    self.cancel(job_id)
+                    cancel_sent = True
+                if deadline is not None and time.time() >= deadline:
+                    return job
+                try:
+                    event = events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if event is not None and event_queue is not None:
+                    event_queue.put(event)
+        finally:
+            self.unsubscribe(job_id, events)
+
+
+_schedulers: Dict[str, JobScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_job_scheduler(config_path: str = "config.yaml") -> JobScheduler:
+    """
+    Get the started job scheduler for a config file, creating it on first use
+
+    Args:
+        config_path: Path to config.yaml
+
+    Returns:
+        Running JobScheduler shared by the calling process
+    """
+    key = str(Path(config_path).resolve())
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = JobScheduler(config_path)
+            _schedulers[key] = scheduler
+        if not scheduler.running:
+            scheduler.start()
+        return scheduler
@@ -0,0 +1,182 @@
+"""
+JSON Writer
+Compact, optionally orjson-backed JSON serialisation with streamed arrays
+
+Phase outputs and comprehensive exports can hold hundreds of variants with
+literature and drug annotations. Instead of building one pretty-printed
+string in memory, objects are written compactly and their large arrays
+(``variants``, ``@graph``) are encoded one item at a time from an iterable,
+so peak memory does not grow with panel size.
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Mapping, Optional, Union
+
+# orjson is optional - several times faster than the standard library encoder
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    orjson = None
+    _orjson_available = False
+
+# Write buffer for output files (amortises many small item writes)
+_BUFFER_SIZE = 1024 * 1024
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON
+
+    Args:
+        obj: JSON-serialisable object
+
+    Returns:
+        Encoded bytes
+    """
+    if _orjson_available:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers beyond 64 bits - fall back to the standard encoder
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON bytes or text (orjson when available)"""
+    if _orjson_available:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Read and decode a JSON file"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+@contextmanager
+def _replacing(path: Path) -> Iterator[BinaryIO]:
+    """
+    Open a uniquely named temporary file next to ``path`` and rename it into
+    place when the block succeeds (it is removed otherwise)
+
+    Every writer gets its own temporary file, so concurrent writers of the
+    same path never interleave: the last rename wins with a complete file.
+    """
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".partial",
+                                      delete=False, buffering=_BUFFER_SIZE)
+    try:
+        with tmp:
+            yield tmp
+        os.replace(tmp.name, path)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        raise
+
+
+def write_json(path: Union[str, Path], obj: Any) -> Path:
+    """
+    Write an object as compact JSON (via a temporary file, renamed into place)
+
+    Args:
+        path: Output file path
+        obj: JSON-serialisable object
+
+    Returns:
+        Output path
+    """
+    path = Path(path)
+    with _replacing(path) as f:
+        f.write(dumps(obj))
+    return path
+
+
+def write_json_streaming(path: Union[str, Path], obj: Mapping[str, Any],
+                         streamed: Optional[Dict[str, Iterable[Any]]] = None) -> Path:
+    """
+    Write a JSON object whose large arrays are produced item by item
+
+    Keys in ``streamed`` are written as arrays from their iterables (which may
+    be generators) in place of the same key in ``obj``; streamed keys that are
+    not in ``obj`` are appended at the end. The file is written under a
+    temporary name and renamed on success, so a generator that fails part
+    way never leaves a truncated document behind.
+
+    Args:
+        path: Output file path
+        obj: Top-level object (values for streamed keys are ignored)
+        streamed: Mapping of key -> iterable of array items
+
+    Returns:
+        Output path
+    """
+    path = Path(path)
+    with _replacing(path) as f:
+        _write_object(f, obj, streamed or {})
+    return path
+
+
+def write_jsonl(path: Union[str, Path], items: Iterable[Any]) -> int:
+    """
+    Write items as JSON Lines (one compact object per line)
+
+    Items are encoded one at a time, so the iterable may be a generator of
+    any length. Like write_json_streaming, the file is written under a
+    temporary name and renamed on success.
+
+    Args:
+        path: Output file path
+        items: Iterable of JSON-serialisable items
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    with _replacing(Path(path)) as f:
+        for item in items:
+            f.write(dumps(item))
+            f.write(b'\n')
+            count += 1
+    return count
+
+
+def _write_object(f: BinaryIO, obj: Mapping[str, Any], streamed: Dict[str, Iterable[Any]]):
+    """Encode ``obj`` to ``f`` with the arrays in ``streamed`` written item by item"""
+    f.write(b'{')
+    first = True
+
+    def write_key(key: str):
+        nonlocal first
+        if not first:
+            f.write(b',')
+        first = False
+        f.write(dumps(key))
+        f.write(b':')
+
+    def write_array(items: Iterable[Any]):
+        f.write(b'[')
+        for i, item in enumerate(items):
+            if i:
+                f.write(b',')
+            f.write(dumps(item))
+        f.write(b']')
+
+    for key, value in obj.items():
+        write_key(key)
+        if key in streamed:
+            write_array(streamed[key])
+        else:
+            f.write(dumps(value))
+
+    for key, items in streamed.items():
+        if key not in obj:
+            write_key(key)
+            write_array(items)
+
+    f.write(b'}')
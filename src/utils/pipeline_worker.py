@@ -11,14 +11,14 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 
 try:
-    from ..main import PGxPipeline
+    from ..main import get_warm_pipeline
     from .event_bus import PipelineEvent, EventBus
     from .profile_normalizer import normalize_dashboard_profile_to_jsonld
 except Exception:
     import sys
     base = Path(__file__).resolve().parent.parent
     sys.path.insert(0, str(base))
-    from main import PGxPipeline  # type: ignore
+    from main import get_warm_pipeline  # type: ignore
     from utils.event_bus import PipelineEvent, EventBus  # type: ignore
     from utils.profile_normalizer import normalize_dashboard_profile_to_jsonld  # type: ignore
 
@@ -72,8 +72,11 @@ class PipelineWorker(threading.Thread):
             self.is_complete = True
 
     def _run_real(self):
-        pipeline = PGxPipeline(config_path=self.config_path, event_bus=self.event_bus)
-        out = pipeline.run_multi_gene(gene_symbols=self.genes, patient_profile=self.profile)
+        pipeline = get_warm_pipeline(self.config_path)
+        # Own session and isolated workspace - other runs on this warm pipeline may overlap
+        workspace = pipeline.new_workspace(isolated=True)
+        with pipeline.session(event_bus=self.event_bus, workspace=workspace) as run:
+            out = run.run_multi_gene(gene_symbols=self.genes, patient_profile=self.profile)
         if not out.get("success"):
             raise RuntimeError(out.get("error", "Pipeline failed"))
         self.result = {
@@ -83,7 +86,8 @@ class PipelineWorker(threading.Thread):
             "total_variants": out.get("total_variants", 0),
             "affected_drugs": out.get("affected_drugs", 0),
             "comprehensive_profile": out.get("comprehensive_profile"),
-            "comprehensive_outputs": out.get("outputs", {})
+            "comprehensive_outputs": out.get("outputs", {}),
+            "timing": out.get("timing", {})
         }
 
     def _run_demo(self):
@@ -0,0 +1,131 @@
+"""
+Run Workspace
+Directory layout for one pipeline run's intermediate files and outputs
+
+Every phase reads and writes ``data/phase1..3`` and ``output/json|rdf|reports``
+relative to a root. The default workspace uses the current directory (the
+historical fixed paths); ``RunWorkspace.create()`` gives a run its own root
+under ``runs/<run_id>/`` so concurrent runs of the same gene never overwrite
+each other's files.
+"""
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+
+class RunWorkspace:
+    """Resolves phase input/output paths beneath a run root"""
+
+    def __init__(self, root: Union[str, Path] = ".", run_id: Optional[str] = None):
+        """
+        Initialize run workspace
+
+        Args:
+            root: Directory holding the run's data/ and output/ trees
+            run_id: Identifier of the run (None for the shared default workspace)
+        """
+        self.root = Path(root)
+        self.run_id = run_id
+
+    @classmethod
+    def create(cls, runs_dir: Union[str, Path] = "runs", run_id: Optional[str] = None) -> "RunWorkspace":
+        """
+        Create an isolated workspace for a new run
+
+        Args:
+            runs_dir: Parent directory of all run workspaces
+            run_id: Run identifier (generated when omitted)
+
+        Returns:
+            RunWorkspace rooted at runs_dir/run_id
+        """
+        if not run_id:
+            run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        workspace = cls(Path(runs_dir) / run_id, run_id=run_id)
+        workspace.root.mkdir(parents=True, exist_ok=True)
+        return workspace
+
+    @property
+    def is_isolated(self) -> bool:
+        """True for a per-run workspace, False for the shared default"""
+        return self.run_id is not None
+
+    def _dir(self, *parts: str) -> Path:
+        """Get a directory under the root, creating it if needed"""
+        path = self.root.joinpath(*parts)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    # Phase directories
+    @property
+    def phase1_dir(self) -> Path:
+        return self._dir("data", "phase1")
+
+    @property
+    def phase2_dir(self) -> Path:
+        return self._dir("data", "phase2")
+
+    @property
+    def phase3_dir(self) -> Path:
+        return self._dir("data", "phase3")
+
+    @property
+    def json_dir(self) -> Path:
+        return self._dir("output", "json")
+
+    @property
+    def rdf_dir(self) -> Path:
+        return self._dir("output", "rdf")
+
+    @property
+    def reports_dir(self) -> Path:
+        return self._dir("output", "reports")
+
+    @property
+    def comprehensive_dir(self) -> Path:
+        return self._dir("output", "comprehensive")
+
+    # Per-gene files
+    def variants_file(self, gene_symbol: str) -> Path:
+        return self.phase1_dir / f"{gene_symbol}_variants.json"
+
+    def virtual_patient_file(self, gene_symbol: str) -> Path:
+        return self.phase1_dir / f"{gene_symbol}_virtual_patient.json"
+
+    def clinical_file(self, gene_symbol: str) -> Path:
+        return self.phase2_dir / f"{gene_symbol}_clinical.json"
+
+    def enriched_file(self, gene_symbol: str) -> Path:
+        return self.phase3_dir / f"{gene_symbol}_enriched.json"
+
+    def jsonld_file(self, gene_symbol: str) -> Path:
+        return self.json_dir / f"{gene_symbol}_knowledge_graph.jsonld"
+
+    def rdf_file(self, gene_symbol: str) -> Path:
+        return self.rdf_dir / f"{gene_symbol}_knowledge_graph.ttl"
+
+    def report_file(self, gene_symbol: str) -> Path:
+        return self.reports_dir / f"{gene_symbol}_report.html"
+
+    def cleanup(self, keep_outputs: bool = False):
+        """
+        Delete an isolated workspace (the shared default is never removed)
+
+        Args:
+            keep_outputs: Only remove the intermediate data/ tree and keep
+                output/ (whose files run results point at)
+        """
+        if not self.is_isolated:
+            return
+        target = self.root / "data" if keep_outputs else self.root
+        if target.exists():
+            shutil.rmtree(target, ignore_errors=True)
+
+    def __repr__(self) -> str:
+        return f"RunWorkspace(root={str(self.root)!r}, run_id={self.run_id!r})"
+
+
+# Shared workspace using the historical fixed paths
+DEFAULT_WORKSPACE = RunWorkspace()
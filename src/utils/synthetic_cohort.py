@@ -0,0 +1,215 @@
+"""
+Synthetic Cohort Generator
+Seeded, offline cohorts of comprehensive patient profiles for load and scale testing
+
+Each profile has the shape of the pipeline's comprehensive output: drawn
+demographics, lifestyle factors and organ function (utils.synthetic_patient),
+conditions and medications from the clinical knowledge table, and a random
+subset of the variants cached for each gene in the GeneResultStore. Nothing
+is fetched from the network, and all dates are relative to a fixed reference
+date, so the same seed, gene panel and gene store give a byte-identical
+cohort. The JSONL output can be passed to ``main.py --cohort`` or fed to the
+database loader and linking benchmarks.
+
+Usage:
+    python src/utils/synthetic_cohort.py --genes CYP2D6 CYP2C19 --count 1000 --seed 7 --output cohort.jsonl
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.dynamic_clinical_generator import draw_static_conditions, static_medications_for_conditions
+from utils.gene_result_store import GeneResultStore
+from utils.json_writer import write_json, write_jsonl
+from utils.synthetic_patient import draw_patient_profile
+
+# Fixed so that output does not depend on the day the cohort was generated
+DEFAULT_REFERENCE_DATE = datetime(2025, 1, 1)
+DATA_SOURCE = "Synthetic cohort (cached gene results)"
+
+
+class SyntheticCohortGenerator:
+    """Generates reproducible synthetic comprehensive profiles offline"""
+
+    def __init__(self, gene_symbols: List[str], seed: int = 0, store_dir: str = "data/gene_store",
+                 reference_date: datetime = DEFAULT_REFERENCE_DATE,
+                 variants_per_gene: Tuple[int, int] = (1, 5)):
+        """
+        Load the cached variant pools for the gene panel
+
+        Args:
+            gene_symbols: Gene panel (genes without cached results are skipped)
+            seed: Random seed (same seed, same cohort)
+            store_dir: GeneResultStore directory
+            reference_date: Date ages, diagnoses and test dates are relative to
+            variants_per_gene: Inclusive (min, max) variants drawn per gene and patient
+
+        Raises:
+            ValueError: If none of the genes has cached results
+        """
+        self.seed = seed
+        self.reference_date = reference_date
+        self.variants_per_gene = variants_per_gene
+
+        # Gene -> (variants, drugs, diseases) from the newest stored entry
+        self.gene_pools: Dict[str, tuple] = {}
+        store = GeneResultStore(store_dir)
+        for gene in gene_symbols:
+            entry = store.latest(gene)
+            if not entry or not entry.get("variants"):
+                print(f"⚠️  No cached variants for {gene} in {store_dir}, skipping")
+                continue
+            self.gene_pools[gene] = (entry["variants"], entry.get("drugs", []), entry.get("diseases", []))
+
+        if not self.gene_pools:
+            raise ValueError(f"No cached gene results for {', '.join(gene_symbols)} in {store_dir}; "
+                             "run the pipeline for these genes first")
+        self.genes = list(self.gene_pools)
+
+    def profiles(self, count: int) -> Iterator[Dict]:
+        """
+        Generate comprehensive patient profiles
+
+        Args:
+            count: Number of profiles
+
+        Yields:
+            Profile dictionaries (variant entries are shared with the pools, so
+            serialise rather than mutate them)
+        """
+        rng = random.Random(self.seed)
+        for index in range(count):
+            yield self._build_profile(rng, index)
+
+    def _build_profile(self, rng: random.Random, index: int) -> Dict:
+        """Draw one comprehensive profile"""
+        mrn = f"SYN-{self.seed}-{index:07d}"
+        # No SNOMED lookup for the exercise factor: it is a live BioPortal search, and
+        # cohorts are generated offline (the factor keeps its label without a code)
+        patient = draw_patient_profile(rng, mrn=mrn, now=self.reference_date, snomed_lookup=None)
+        clinical_info = patient["clinical_information"]
+        demographics = clinical_info["demographics"]
+
+        # Conditions and medications, as _generate_clinical_information adds them
+        conditions = draw_static_conditions(demographics["age"], clinical_info["lifestyle_factors"], rng)
+        for condition in conditions:
+            years_ago = rng.randint(1, 10)
+            condition["diagnosis_date"] = (self.reference_date - timedelta(days=years_ago * 365)).strftime("%Y-%m-%d")
+            condition["status"] = rng.choice(["active", "controlled", "remission"])
+        clinical_info["current_conditions"] = conditions
+        clinical_info["current_medications"] = static_medications_for_conditions(conditions, rng, self.reference_date)
+
+        # Variant subset per gene (in pool order); drugs and diseases follow the genes carried
+        low, high = self.variants_per_gene
+        variants = []
+        drugs = set()
+        diseases = set()
+        for gene in self.genes:
+            pool, gene_drugs, gene_diseases = self.gene_pools[gene]
+            k = rng.randint(min(low, len(pool)), min(high, len(pool)))
+            if not k:
+                continue
+            variants.extend(pool[i] for i in sorted(rng.sample(range(len(pool)), k)))
+            drugs.update(gene_drugs)
+            diseases.update(gene_diseases)
+
+        return self._comprehensive_profile(mrn, clinical_info, variants, drugs, diseases)
+
+    def _comprehensive_profile(self, mrn: str, clinical_info: Dict, variants: list,
+                               drugs: set, diseases: set) -> Dict:
+        """Wrap drawn clinical data and variants in the comprehensive profile layout"""
+        from main import PROFILE_CONTEXT, PGxPipeline
+
+        demographics = clinical_info["demographics"]
+        literature_summary = PGxPipeline._generate_literature_summary(variants)
+        return {
+            "@context": PROFILE_CONTEXT,
+            "@id": f"http://ugent.be/person/{mrn}",
+            "@type": ["foaf:Person", "schema:Person", "schema:Patient"],
+            "identifier": mrn,
+            "other_identifiers": None,
+            "patient_id": mrn,
+            "dashboard_source": False,
+            "name": f"{demographics['foaf:firstName']} {demographics['foaf:familyName']} - Pharmacogenomics Profile",
+            "description": f"Multi-gene pharmacogenomics profile covering {len(self.genes)} genes with {len(variants)} variants",
+            "dateCreated": self.reference_date.isoformat(),
+            "clinical_information": clinical_info,
+            "literature_summary": literature_summary,
+            "pharmacogenomics_profile": {
+                "genes_analyzed": self.genes,
+                "total_variants": len(variants),
+                "variants_by_gene": {gene: sum(1 for v in variants if v.get("gene") == gene) for gene in self.genes},
+                "affected_drugs": sorted(drugs, key=str),
+                "associated_diseases": sorted(diseases, key=str),
+                "clinical_summary": PGxPipeline._generate_clinical_summary(variants),
+                "literature_summary": literature_summary
+            },
+            "variants": variants,
+            "dataSource": DATA_SOURCE
+        }
+
+    def write(self, output_path: str, count: int) -> Dict:
+        """
+        Write a cohort as JSONL plus a manifest next to it
+
+        Args:
+            output_path: JSONL output file
+            count: Number of profiles
+
+        Returns:
+            Manifest dictionary (also written to <output>.manifest.json)
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        written = write_jsonl(output_path, self.profiles(count))
+        seconds = time.perf_counter() - started
+
+        manifest = {
+            "output": str(output_path),
+            "profiles": written,
+            "seed": self.seed,
+            "genes": self.genes,
+            "variants_per_gene": list(self.variants_per_gene),
+            "reference_date": self.reference_date.isoformat(),
+            "pool_sizes": {gene: len(pool[0]) for gene, pool in self.gene_pools.items()},
+            "seconds": round(seconds, 3),
+            "bytes": output_path.stat().st_size,
+        }
+        write_json(output_path.with_name(output_path.name + ".manifest.json"), manifest)
+        return manifest
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic PGx cohort as JSONL")
+    parser.add_argument("--genes", nargs="+", required=True, help="Gene panel (needs cached gene results)")
+    parser.add_argument("--count", type=int, default=1000, help="Number of profiles (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--output", default="output/synthetic_cohort.jsonl", help="JSONL output file")
+    parser.add_argument("--store-dir", default="data/gene_store", help="Gene result store directory")
+    parser.add_argument("--min-variants", type=int, default=1, help="Minimum variants per gene and patient")
+    parser.add_argument("--max-variants", type=int, default=5, help="Maximum variants per gene and patient")
+    args = parser.parse_args()
+
+    try:
+        generator = SyntheticCohortGenerator(args.genes, seed=args.seed, store_dir=args.store_dir,
+                                             variants_per_gene=(args.min_variants, args.max_variants))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    manifest = generator.write(args.output, args.count)
+    print(f"✅ Wrote {manifest['profiles']} profiles to {manifest['output']} "
+          f"in {manifest['seconds']:.1f}s ({manifest['bytes'] / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""
+Synthetic patient profiles
+
+Draws the random (dashboard-shaped) patient profiles used for testing:
+demographics from the compiled tables in utils.demographics, lifestyle
+factors and organ function results. Everything is drawn from the given random
+source relative to a reference time, so a seeded random.Random plus a fixed
+reference time reproduces a profile exactly. Nothing here touches the network
+unless the caller passes a SNOMED lookup for the exercise factor (the
+dashboard does; offline generators don't). Conditions and medications are
+added by the callers.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from utils.demographics import get_demographics_tables
+
+# Optional SNOMED lookup for lifestyle terms: search term -> concept dict or None
+SnomedLookup = Optional[Callable[[str], Optional[Dict]]]
+
+
+def draw_patient_profile(rng=random, mrn: str = None, now: datetime = None,
+                         snomed_lookup: SnomedLookup = None) -> Dict:
+    """
+    Draw one random patient profile (without photo, conditions or medications)
+
+    Args:
+        rng: Random source (the random module or a random.Random instance)
+        mrn: Medical record number (default: timestamp-based)
+        now: Reference time for ages and dates (default: current time)
+        snomed_lookup: Optional SNOMED lookup for the exercise lifestyle factor; the
+            only thing that may touch the network, so offline callers leave it None
+
+    Returns:
+        Patient profile with clinical_information and a flat demographics shortcut
+    """
+    now = now or datetime.now()
+
+    tables = get_demographics_tables()
+
+    # Select ethnicity based on weighted probabilities (not uniform!)
+    ethnicity_key = tables.choose_ethnicity(rng)
+    ethnicity = [ethnicity_key]
+
+    # Randomly select biological sex and gender (can be different for some profiles)
+    biological_sex = rng.choice(["Male", "Female"])
+
+    # 95% of the time gender matches biological sex
+    if rng.random() < 0.95:
+        gender = biological_sex
+    else:
+        gender = rng.choice(["Male", "Female", "Other", "Prefer not to say"])
+
+    # Names are drawn by biological sex (to match photo appearance) from ONE region,
+    # so first, middle and last names are culturally consistent
+    first_name, last_name, middle_name_pool = tables.choose_names(ethnicity_key, biological_sex, rng)
+
+    # Generate middle name (optional, 70% chance) from SAME region
+    middle_name = ""
+    if rng.random() < 0.7:
+        middle_name = rng.choice(middle_name_pool)
+
+    # Random demographics
+    age = rng.randint(25, 75)
+    date_of_birth = now - timedelta(days=365*age)
+
+    # Random MRN
+    mrn = mrn or f"MRN-{now.strftime('%Y%m%d%H%M%S')}"
+
+    # Random measurements based on biological sex (for realistic proportions)
+    if biological_sex == "Male":
+        height_cm = rng.uniform(165, 190)
+        weight_kg = rng.uniform(65, 95)
+    else:
+        height_cm = rng.uniform(155, 175)
+        weight_kg = rng.uniform(50, 80)
+
+    bmi = weight_kg / ((height_cm / 100) ** 2)
+    gender_uri = f"http://schema.org/{gender}"
+
+    # Use MRN directly as ID
+    patient_id = mrn
+
+    # Birth country and city based on ethnicity
+    birth_country = tables.choose_birth_country(ethnicity_key, rng)
+    birth_city = tables.choose_city(birth_country, rng)
+
+    # Current location (60% chance same as birth, 40% migrated)
+    if rng.random() < 0.6:
+        current_country = birth_country
+        current_city = birth_city
+    else:
+        # Migrated - common destinations
+        current_country = rng.choice(tables.migration_destinations)
+        current_city = tables.choose_city(current_country, rng)
+
+    # Generate contact information
+    phone = f"+{rng.randint(1, 99)}-{rng.randint(100, 999)}-{rng.randint(1000000, 9999999)}"
+    email = f"{first_name.lower()}.{last_name.lower().replace(' ', '')}@example.com"
+
+    # Emergency contact
+    emergency_relation = rng.choice(tables.emergency_relations.get(biological_sex, ("spouse",)))
+    emergency_contact = f"{first_name}'s {emergency_relation}"
+    emergency_phone = f"+{rng.randint(1, 99)}-{rng.randint(100, 999)}-{rng.randint(1000000, 9999999)}"
+
+    # Address and postal code
+    address = f"{rng.randint(1, 9999)} {rng.choice(tables.street_names)} {rng.choice(tables.street_types)}"
+    postal_code = f"{rng.randint(1000, 9999)}"
+
+    # Language based on birth country
+    language = tables.language_for(birth_country)
+    interpreter_needed = language not in ["English", "Dutch", "French", "German"] and rng.random() < 0.3
+
+    # Insurance information (70% have insurance)
+    if rng.random() < 0.7:
+        insurance_provider = rng.choice(tables.insurance_providers)
+        insurance_policy = f"{rng.choice(tables.insurance_prefixes)}-{rng.randint(100000, 999999)}"
+    else:
+        insurance_provider = ""
+        insurance_policy = ""
+
+    # Primary care physician
+    pcp_name = rng.choice(tables.pcp_names)
+    pcp_contact = f"+{rng.randint(1, 99)}-{rng.randint(100, 999)}-{rng.randint(1000000, 9999999)}"
+
+    patient_profile = {
+        "patient_id": patient_id,
+        "identifier": mrn,
+        "mrn": mrn,
+        "dashboard_source": True,
+        "created_at": now.isoformat(),
+        "photo": None,
+        "photo_format": "none",
+
+        "clinical_information": {
+            "demographics": {
+                "@id": "http://ugent.be/person/demographics",
+                "foaf:firstName": first_name,
+                "foaf:familyName": last_name,
+                "schema:givenName": first_name,
+                "schema:familyName": last_name,
+                "schema:additionalName": middle_name,
+                "preferredName": first_name,
+                "schema:birthDate": date_of_birth.isoformat(),
+                "age": age,
+                "schema:gender": gender_uri,
+                "biological_sex": biological_sex,
+                "ethnicity": ethnicity,
+                "schema:birthPlace": {
+                    "gn:name": birth_city,
+                    "country": birth_country
+                },
+                "schema:weight": {
+                    "@type": "schema:QuantitativeValue",
+                    "schema:value": round(weight_kg, 1),
+                    "schema:unitCode": "kg",
+                    "schema:unitText": "kilograms"
+                },
+                "schema:height": {
+                    "@type": "schema:QuantitativeValue",
+                    "schema:value": round(height_cm, 1),
+                    "schema:unitCode": "cm",
+                    "schema:unitText": "centimeters"
+                },
+                "bmi": round(bmi, 1),
+                "mrn": mrn,
+                "current_location": {
+                    "address": address,
+                    "city": current_city,
+                    "country": current_country,
+                    "postal_code": postal_code
+                },
+                "contact": {
+                    "phone": phone,
+                    "email": email,
+                    "emergency_contact": emergency_contact,
+                    "emergency_phone": emergency_phone
+                },
+                "language": language,
+                "interpreter_needed": interpreter_needed,
+                "insurance": {
+                    "provider": insurance_provider,
+                    "policy_number": insurance_policy
+                },
+                "pcp": {
+                    "name": pcp_name,
+                    "contact": pcp_contact
+                },
+                "note": "Auto-generated patient profile for testing"
+            },
+            "current_conditions": [],
+            "current_medications": [],
+            "organ_function": {},
+            "lifestyle_factors": {}
+        }
+    }
+
+    # Lifestyle factors and organ function
+    patient_profile["clinical_information"]["lifestyle_factors"] = draw_lifestyle_factors(rng, now, snomed_lookup)
+    patient_profile["clinical_information"]["organ_function"] = draw_organ_function(rng, now)
+
+    # Add top-level demographics shortcut (for compatibility with other components)
+    patient_profile['demographics'] = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'middle_name': middle_name,
+        'preferred_name': first_name,
+        'mrn': mrn,
+        'age': age,
+        'gender': gender,
+        'biological_sex': biological_sex,
+        'date_of_birth': date_of_birth.isoformat(),
+        'ethnicity': ethnicity,
+        'birth_city': birth_city,
+        'birth_country': birth_country,
+        'current_city': current_city,
+        'current_country': current_country,
+        'address': address,
+        'postal_code': postal_code,
+        'phone': phone,
+        'email': email,
+        'emergency_contact': emergency_contact,
+        'emergency_phone': emergency_phone,
+        'language': language,
+        'interpreter_needed': interpreter_needed,
+        'insurance_provider': insurance_provider,
+        'insurance_policy': insurance_policy,
+        'pcp_name': pcp_name,
+        'pcp_contact': pcp_contact,
+        'height': height_cm,
+        'weight': weight_kg,
+        'bmi': round(bmi, 1)
+    }
+
+    return patient_profile
+
+
+def draw_lifestyle_factors(rng=random, now: datetime = None, snomed_lookup: SnomedLookup = None) -> List[Dict]:
+    """
+    Draw lifestyle factors with SNOMED CT codes
+
+    Args:
+        rng: Random source
+        now: Reference time for dates (default: current time)
+        snomed_lookup: Optional SNOMED lookup for the exercise factor's code
+
+    Returns:
+        List of lifestyle factor dictionaries
+    """
+    now = now or datetime.now()
+
+    factors = []
+
+    # Smoking status
+    smoking_choice = rng.choice([
+        {
+            "@id": "http://snomed.info/id/228150001",
+            "@type": "sdisco:LifestyleFactor",
+            "snomed:code": "228150001",
+            "rdfs:label": "Non-smoker",
+            "skos:prefLabel": "Non-smoker",
+            "factor_type": "smoking",
+            "status": "never",
+            "note": "No CYP1A2 induction from smoking"
+        },
+        {
+            "@id": "http://snomed.info/id/8392000",
+            "@type": "sdisco:LifestyleFactor",
+            "snomed:code": "8392000",
+            "rdfs:label": "Former smoker",
+            "skos:prefLabel": "Former smoker",
+            "factor_type": "smoking",
+            "status": "former",
+            "quit_date": (now - timedelta(days=rng.randint(365, 3650))).strftime("%Y-%m-%d"),
+            "note": "CYP1A2 induction reverses after quitting"
+        },
+        {
+            "@id": "http://snomed.info/id/77176002",
+            "@type": "sdisco:LifestyleFactor",
+            "snomed:code": "77176002",
+            "rdfs:label": "Smoker",
+            "skos:prefLabel": "Smoker",
+            "factor_type": "smoking",
+            "status": "current",
+            "frequency": f"{rng.randint(5, 30)} cigarettes/day",
+            "note": "CYP1A2 induction from smoking"
+        }
+    ])
+    factors.append(smoking_choice)
+
+    # Alcohol consumption
+    alcohol_choice = rng.choice([
+        {
+            "@id": "http://snomed.info/id/228273003",
+            "@type": "sdisco:LifestyleFactor",
+            "snomed:code": "228273003",
+            "rdfs:label": "Drinks alcohol",
+            "skos:prefLabel": "Moderate alcohol consumption",
+            "factor_type": "alcohol",
+            "frequency": f"{rng.randint(1, 14)} drinks/week",
+            "note": "May affect CYP2E1 and liver function"
+        },
+        {
+            "@id": "http://snomed.info/id/228276006",
+            "@type": "sdisco:LifestyleFactor",
+            "snomed:code": "228276006",
+            "rdfs:label": "Does not drink alcohol",
+            "skos:prefLabel": "Non-drinker",
+            "factor_type": "alcohol",
+            "note": "No alcohol-related drug interactions"
+        }
+    ])
+    factors.append(alcohol_choice)
+
+    # Exercise frequency - dynamically look up SNOMED codes
+    exercise_options = [
+        {
+            "@type": "sdisco:LifestyleFactor",
+            "factor_type": "exercise",
+            "rdfs:label": "Regular exercise",
+            "skos:prefLabel": "Regular exercise",
+            "frequency": f"{rng.randint(2, 7)} times/week",
+            "note": "May improve drug metabolism",
+            "search_term": "regular exercise"
+        },
+        {
+            "@type": "sdisco:LifestyleFactor",
+            "factor_type": "exercise",
+            "rdfs:label": "Sedentary lifestyle",
+            "skos:prefLabel": "Sedentary lifestyle",
+            "frequency": "Minimal physical activity",
+            "note": "May affect drug distribution",
+            "search_term": "sedentary lifestyle"
+        }
+    ]
+    exercise_choice = rng.choice(exercise_options)
+
+    # Dynamically look up SNOMED code for the selected exercise factor
+    search_term = exercise_choice.pop("search_term", exercise_choice.get("rdfs:label", ""))
+    snomed_result = snomed_lookup(search_term) if snomed_lookup else None
+
+    if snomed_result and snomed_result.get("snomed:code"):
+        exercise_choice["snomed:code"] = snomed_result["snomed:code"]
+        exercise_choice["@id"] = snomed_result.get("@id", f"http://snomed.info/id/{snomed_result['snomed:code']}")
+        # Update label if SNOMED has a better one
+        if snomed_result.get("rdfs:label"):
+            exercise_choice["rdfs:label"] = snomed_result["rdfs:label"]
+            exercise_choice["skos:prefLabel"] = snomed_result["rdfs:label"]
+
+    factors.append(exercise_choice)
+
+    # Grapefruit consumption (important for CYP3A4)
+    if rng.random() < 0.3:  # 30% chance of grapefruit consumption
+        factors.append({
+            "@type": "sdisco:LifestyleFactor",
+            "factor_type": "diet",
+            "rdfs:label": "Regular grapefruit consumption",
+            "frequency": "Daily",
+            "note": "IMPORTANT: Inhibits CYP3A4 - affects many drugs"
+        })
+
+    return factors
+
+
+def draw_organ_function(rng=random, now: datetime = None) -> Dict:
+    """
+    Draw kidney and liver function test results with SNOMED CT codes
+
+    Args:
+        rng: Random source
+        now: Reference time for the test date (default: current time)
+
+    Returns:
+        Organ function dictionary
+    """
+    now = now or datetime.now()
+
+    test_date = (now - timedelta(days=rng.randint(1, 90))).strftime("%Y-%m-%d")
+
+    # Kidney function - normal range: 90-120 mL/min/1.73m²
+    # Occasionally abnormal (15% chance of mild reduction)
+    if rng.random() < 0.15:
+        creatinine_clearance = round(rng.uniform(60, 89), 1)
+        status_kidney = "mild_reduction"
+    else:
+        creatinine_clearance = round(rng.uniform(90, 120), 1)
+        status_kidney = "normal"
+
+    serum_creatinine = round(rng.uniform(0.6, 1.1), 2)
+
+    # Liver function - normal ALT: 7-56 U/L, AST: 10-40 U/L
+    # Occasionally elevated (10% chance)
+    if rng.random() < 0.10:
+        alt_value = round(rng.uniform(57, 100), 0)
+        ast_value = round(rng.uniform(41, 80), 0)
+        status_liver = "elevated"
+    else:
+        alt_value = round(rng.uniform(10, 50), 0)
+        ast_value = round(rng.uniform(15, 38), 0)
+        status_liver = "normal"
+
+    bilirubin_total = round(rng.uniform(0.3, 1.0), 2)
+
+    return {
+        "kidney_function": {
+            "creatinine_clearance": {
+                "@id": "http://snomed.info/id/102001005",
+                "snomed:code": "102001005",
+                "rdfs:label": "Creatinine clearance test",
+                "value": creatinine_clearance,
+                "unit": "mL/min/1.73m²",
+                "date": test_date,
+                "normal_range": "90-120 mL/min/1.73m²",
+                "status": status_kidney
+            },
+            "serum_creatinine": {
+                "@id": "http://snomed.info/id/365757006",
+                "snomed:code": "365757006",
+                "rdfs:label": "Serum creatinine measurement",
+                "value": serum_creatinine,
+                "unit": "mg/dL",
+                "date": test_date,
+                "normal_range": "0.6-1.1 mg/dL",
+                "status": "normal" if serum_creatinine <= 1.1 else "elevated"
+            }
+        },
+        "liver_function": {
+            "alt": {
+                "@id": "http://snomed.info/id/102711005",
+                "snomed:code": "102711005",
+                "rdfs:label": "Alanine aminotransferase measurement",
+                "value": alt_value,
+                "unit": "U/L",
+                "date": test_date,
+                "normal_range": "7-56 U/L",
+                "status": status_liver
+            },
+            "ast": {
+                "@id": "http://snomed.info/id/102712005",
+                "snomed:code": "102712005",
+                "rdfs:label": "Aspartate aminotransferase measurement",
+                "value": ast_value,
+                "unit": "U/L",
+                "date": test_date,
+                "normal_range": "10-40 U/L",
+                "status": status_liver
+            },
+            "bilirubin_total": {
+                "@id": "http://snomed.info/id/365787000",
+                "snomed:code": "365787000",
+                "rdfs:label": "Serum bilirubin level",
+                "value": bilirubin_total,
+                "unit": "mg/dL",
+                "date": test_date,
+                "normal_range": "0.1-1.2 mg/dL",
+                "status": "normal" if bilirubin_total <= 1.2 else "elevated"
+            }
+        },
+        "note": "Critical for drug dosing - particularly important for drugs cleared by kidney/liver"
+    }
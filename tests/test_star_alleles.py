@@ -0,0 +1,58 @@
+"""Diplotype -> phenotype calls from the CPIC tables in phase2_clinical"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from phase2_clinical.star_alleles import AlleleTable  # noqa: E402
+
+DIPLOTYPES = [
+    ("CYP2C9", "*1", "*1", "Normal Metabolizer"),
+    ("CYP2C9", "*1", "*2", "Intermediate Metabolizer"),
+    ("CYP2C9", "*2", "*2", "Intermediate Metabolizer"),
+    ("CYP2C9", "*2", "*3", "Poor Metabolizer"),
+    ("CYP2C9", "*3", "*3", "Poor Metabolizer"),
+    ("CYP2D6", "*1", "*1", "Normal Metabolizer"),
+    ("CYP2D6", "*1", "*10", "Normal Metabolizer"),
+    ("CYP2D6", "*1", "*4", "Intermediate Metabolizer"),
+    ("CYP2D6", "*4", "*10", "Intermediate Metabolizer"),
+    ("CYP2D6", "*4", "*41", "Intermediate Metabolizer"),
+    ("CYP2D6", "*10", "*10", "Intermediate Metabolizer"),
+    ("CYP2D6", "*4", "*4", "Poor Metabolizer"),
+    ("CYP2C19", "*1", "*17", "Rapid Metabolizer"),
+    ("CYP2C19", "*2", "*2", "Poor Metabolizer"),
+]
+
+
+@pytest.fixture(scope="module")
+def table():
+    return AlleleTable()
+
+
+@pytest.mark.parametrize("gene, allele_1, allele_2, phenotype", DIPLOTYPES)
+def test_call(table, gene, allele_1, allele_2, phenotype):
+    assert table.call(gene, allele_1, allele_2)["phenotype"] == phenotype
+    assert table.call(gene, allele_2, allele_1)["phenotype"] == phenotype
+
+
+def test_activity_score(table):
+    assert table.activity_score("CYP2D6", "*1", "*10") == 1.25
+    assert table.activity_score("CYP2C9", "*2", "*2") == 1.0
+    assert table.activity_score("CYP2C19", "*1", "*17") is None
+
+
+def test_call_cohort_matches_call(table):
+    cohort = {}
+    for i, (gene, allele_1, allele_2, _) in enumerate(DIPLOTYPES):
+        variants = [
+            {"rsid": None, "pharmgkb": {"annotations": [{"allelePhenotypes": [{"phenotype": f"{gene}{a}"}]}]}}
+            for a in (allele_1, allele_2)
+        ]
+        cohort.setdefault(f"patient_{i}", {})[gene] = variants
+    calls = table.call_cohort(cohort)
+    for i, (gene, allele_1, allele_2, phenotype) in enumerate(DIPLOTYPES):
+        call = calls[f"patient_{i}"][gene]
+        assert call["star_alleles"] == [allele_1, allele_2]
+        assert call["phenotype"] == phenotype